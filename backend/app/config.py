@@ -0,0 +1,179 @@
+# backend/app/config.py
+"""
+Central place for environment-driven settings shared by the services.
+Every value can be overridden through the environment (or backend/.env).
+"""
+
+import os
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Local state (caches, queues, stores) lives here unless overridden
+DATA_DIR = os.getenv("LUMASCAN_DATA_DIR", os.path.join(BACKEND_DIR, ".lumascan"))
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+# ── LLM response cache ───────────────────────────────────────────────────────
+LLM_CACHE_ENABLED = env_bool("LLM_CACHE_ENABLED", True)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL = env_int("LLM_CACHE_TTL", 7 * 24 * 3600)          # seconds
+LLM_CACHE_MEMORY_ENTRIES = env_int("LLM_CACHE_MEMORY_ENTRIES", 1024)
+LLM_CACHE_DISK_ENTRIES = env_int("LLM_CACHE_DISK_ENTRIES", 50000)
+
+# ── Concurrency ──────────────────────────────────────────────────────────────
+LLM_MAX_CONCURRENCY = env_int("LLM_MAX_CONCURRENCY", 4)     # in-flight Groq calls per process
+LLM_ASYNC_MAX_CONCURRENCY = env_int("LLM_ASYNC_MAX_CONCURRENCY", 100)  # per event loop (llm_client.achat)
+PIPELINE_MAX_WORKERS = env_int("PIPELINE_MAX_WORKERS", 4)   # threads per fan-out
+
+# ── Groq client: connection pool, deadlines, retries, rate limit, breaker ────
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "")                # e.g. benchmarks/fake_groq.py
+LLM_POOL_CONNECTIONS = env_int("LLM_POOL_CONNECTIONS", 20)
+LLM_POOL_KEEPALIVE = env_int("LLM_POOL_KEEPALIVE", 10)          # idle connections kept open
+LLM_KEEPALIVE_EXPIRY = env_float("LLM_KEEPALIVE_EXPIRY", 30.0)  # seconds
+LLM_CONNECT_TIMEOUT = env_float("LLM_CONNECT_TIMEOUT", 5.0)
+LLM_TIMEOUT = env_float("LLM_TIMEOUT", 30.0)                    # per attempt (default policy)
+LLM_MAX_RETRIES = env_int("LLM_MAX_RETRIES", 2)                 # on timeouts, 408/409/429/5xx
+LLM_BACKOFF_BASE = env_float("LLM_BACKOFF_BASE", 0.5)           # full-jitter exponential backoff
+LLM_BACKOFF_MAX = env_float("LLM_BACKOFF_MAX", 8.0)
+# Per-call-site overrides as JSON, e.g. {"skills": {"timeout": 10, "max_retries": 1}}
+# Sites: default, skills, structure, analysis, tailor
+LLM_POLICIES = os.getenv("LLM_POLICIES", "")
+LLM_REQUEST_BUDGET = env_float("LLM_REQUEST_BUDGET", 60.0)      # seconds per HTTP request; 0 = none
+# Client-side quota (Groq free tier for llama-3.3-70b-versatile); 0 disables
+LLM_RATE_RPM = env_int("LLM_RATE_RPM", 30)
+LLM_RATE_TPM = env_int("LLM_RATE_TPM", 12000)
+LLM_BREAKER_FAILURES = env_int("LLM_BREAKER_FAILURES", 5)       # consecutive; 0 disables
+LLM_BREAKER_RESET = env_float("LLM_BREAKER_RESET", 30.0)        # seconds open before a probe
+
+# ── Tracing / metrics ────────────────────────────────────────────────────────
+SERVER_TIMING = env_bool("SERVER_TIMING", False)   # per-stage Server-Timing response header
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")   # Prometheus text; empty disables
+
+# ── Extracted skill lists, keyed by document fingerprint ─────────────────────
+SKILL_STORE_PATH = os.getenv("SKILL_STORE_PATH", os.path.join(DATA_DIR, "skills.sqlite3"))
+
+# ── Prompt budgeting (app.services.prompt_budget) ────────────────────────────
+# Document tokens per prompt; off = the old head truncation at 4 chars/token
+PROMPT_BUDGETING = env_bool("PROMPT_BUDGETING", True)
+PROMPT_TOKENS_ANALYSIS_RESUME = env_int("PROMPT_TOKENS_ANALYSIS_RESUME", 875)
+PROMPT_TOKENS_ANALYSIS_JOB = env_int("PROMPT_TOKENS_ANALYSIS_JOB", 500)
+PROMPT_TOKENS_STRUCTURE = env_int("PROMPT_TOKENS_STRUCTURE", 1000)
+PROMPT_TOKENS_TAILOR_JOB = env_int("PROMPT_TOKENS_TAILOR_JOB", 750)
+
+# ── Chunked (map-reduce) analysis of documents over their prompt budget ─────
+# Chunks are analysed concurrently and merged; off = budgeted single prompt.
+# Each chunk is one more LLM call (per job on /match/batch), so it is opt-in
+# and only documents over their budget are split.
+CHUNKED_ANALYSIS = env_bool("CHUNKED_ANALYSIS", False)
+CHUNK_OVERLAP_TOKENS = env_int("CHUNK_OVERLAP_TOKENS", 60)   # repeated from a split section
+ANALYSIS_MAX_CHUNKS = env_int("ANALYSIS_MAX_CHUNKS", 2)      # analysis calls per match (resume x job)
+STRUCTURE_MAX_CHUNKS = env_int("STRUCTURE_MAX_CHUNKS", 4)    # structure calls per upload
+
+# ── Skill extraction ─────────────────────────────────────────────────────────
+# "llm": Groq only; "local": taxonomy matcher only; "tiered": taxonomy first,
+# LLM added when local recall looks low (too few skills / unknown tech terms).
+# local/tiered return canonical taxonomy names while /upload stores raw LLM
+# skills for resume_id, so keep "llm" unless both sides go through the matcher.
+SKILL_EXTRACTOR = os.getenv("SKILL_EXTRACTOR", "llm")
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json"),
+)
+SKILL_TIERED_MIN_SKILLS = env_int("SKILL_TIERED_MIN_SKILLS", 5)
+SKILL_TIERED_MIN_COVERAGE = env_float("SKILL_TIERED_MIN_COVERAGE", 0.8)
+
+# ── Batch matching ───────────────────────────────────────────────────────────
+BATCH_MAX_JOBS = env_int("BATCH_MAX_JOBS", 300)
+BATCH_MAX_CONCURRENCY = env_int("BATCH_MAX_CONCURRENCY", 8)  # jobs analysed at once
+
+# ── Shared TF-IDF model (fit with `python -m app.services.tfidf_model fit`) ──
+TFIDF_MODEL_PATH = os.getenv("TFIDF_MODEL_PATH", os.path.join(DATA_DIR, "tfidf_vectorizer.joblib"))
+TFIDF_VECTOR_CACHE_SIZE = env_int("TFIDF_VECTOR_CACHE_SIZE", 4096)
+
+# ── Local embeddings ─────────────────────────────────────────────────────────
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "hashing")   # or "sentence-transformers"
+EMBEDDINGS_MODEL = os.getenv("EMBEDDINGS_MODEL", "all-MiniLM-L6-v2")
+EMBEDDINGS_DIM = env_int("EMBEDDINGS_DIM", 256)
+EMBEDDINGS_SVD_PATH = os.getenv("EMBEDDINGS_SVD_PATH", os.path.join(DATA_DIR, "embeddings_svd.joblib"))
+EMBEDDINGS_CACHE_SIZE = env_int("EMBEDDINGS_CACHE_SIZE", 8192)
+
+# How SimilarityChecker scores skills: "llm" (extract_skills on both sides)
+# or "embedding" (local embedding cosine, no LLM calls)
+SIMILARITY_METHOD = os.getenv("SIMILARITY_METHOD", "llm")
+
+# ── Stored job index ─────────────────────────────────────────────────────────
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(DATA_DIR, "job_index"))
+JOB_INDEX_MAX_ANALYZE = env_int("JOB_INDEX_MAX_ANALYZE", 10)   # LLM analyses per search
+JOB_INDEX_MAX_IVF_LISTS = env_int("JOB_INDEX_MAX_IVF_LISTS", 4096)   # cap on /jobs/index/build n_lists
+
+# ── Background job queue ─────────────────────────────────────────────────────
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(DATA_DIR, "jobs_queue.sqlite3"))
+JOB_QUEUE_WORKERS = env_int("JOB_QUEUE_WORKERS", 2)              # worker threads per process
+JOB_QUEUE_POLL_INTERVAL = env_float("JOB_QUEUE_POLL_INTERVAL", 0.5)
+JOB_QUEUE_RETENTION = env_int("JOB_QUEUE_RETENTION", 24 * 3600)  # keep finished jobs (s)
+JOB_QUEUE_STALE_AFTER = env_int("JOB_QUEUE_STALE_AFTER", 600)    # requeue stuck 'running' jobs
+JOB_QUEUE_MAX_ATTEMPTS = env_int("JOB_QUEUE_MAX_ATTEMPTS", 3)     # claims before a stuck job fails
+JOB_QUEUE_CALLBACK_TIMEOUT = env_float("JOB_QUEUE_CALLBACK_TIMEOUT", 10)
+# callback_url must be https and resolve to public addresses. Hosts listed
+# here (comma-separated) are always allowed; with a list set, other hosts are
+# refused unless JOB_QUEUE_CALLBACK_PUBLIC stays on.
+JOB_QUEUE_CALLBACK_HOSTS = {h.strip().lower() for h in os.getenv("JOB_QUEUE_CALLBACK_HOSTS", "").split(",") if h.strip()}
+JOB_QUEUE_CALLBACK_PUBLIC = env_bool("JOB_QUEUE_CALLBACK_PUBLIC", True)
+
+# ── Generated PDF artifacts (format=url responses) ───────────────────────────
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(DATA_DIR, "artifacts"))
+ARTIFACT_MEMORY_BYTES = env_int("ARTIFACT_MEMORY_BYTES", 32 * 1024 * 1024)
+ARTIFACT_DISK_BYTES = env_int("ARTIFACT_DISK_BYTES", 512 * 1024 * 1024)
+
+# ── Rendered PDF cache ───────────────────────────────────────────────────────
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join(DATA_DIR, "render_cache"))
+RENDER_CACHE_MEMORY_BYTES = env_int("RENDER_CACHE_MEMORY_BYTES", 64 * 1024 * 1024)
+RENDER_CACHE_DISK_BYTES = env_int("RENDER_CACHE_DISK_BYTES", 1024 * 1024 * 1024)
+
+# ── PDF text extraction ──────────────────────────────────────────────────────
+PDF_MAX_BYTES = env_int("PDF_MAX_BYTES", 20 * 1024 * 1024)
+PDF_MAX_PAGES = env_int("PDF_MAX_PAGES", 50)
+PDF_SPOOL_BYTES = env_int("PDF_SPOOL_BYTES", 1024 * 1024)    # larger uploads go to a temp file
+PDF_PARALLEL_MIN_PAGES = env_int("PDF_PARALLEL_MIN_PAGES", 16)
+PDF_PARSE_WORKERS = env_int("PDF_PARSE_WORKERS", min(4, os.cpu_count() or 1))  # <= 1 disables
+PDF_PARSE_START_METHOD = os.getenv("PDF_PARSE_START_METHOD", "forkserver")  # or "spawn"; never fork
+
+# ── Per-user master resume data (replaces resume/resume_data.json) ──────────
+RESUME_STORE_PATH = os.getenv("RESUME_STORE_PATH", os.path.join(DATA_DIR, "resumes.sqlite3"))
+RESUME_CACHE_ENTRIES = env_int("RESUME_CACHE_ENTRIES", 256)     # parsed resumes kept in memory
+RESUME_HISTORY_LIMIT = env_int("RESUME_HISTORY_LIMIT", 50)      # versions kept per user; 0 = all
+# Imported as the default user's version 1 on first read, if present
+RESUME_LEGACY_FILE = os.getenv("RESUME_LEGACY_FILE",
+                               os.path.join(os.path.dirname(BACKEND_DIR), "resume", "resume_data.json"))
+RESUME_REQUIRE_IF_MATCH = env_bool("RESUME_REQUIRE_IF_MATCH", False)   # PUT without If-Match -> 428
+# Stored resume data is keyed by the `sub` of the caller's Supabase access
+# token (Authorization: Bearer), verified with the project's JWT secret.
+# Callers without a token all share the "default" user.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET", "")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+# ── Upload dedup (PDF hash / text fingerprint -> prior /upload results) ─────
+UPLOAD_STORE_PATH = os.getenv("UPLOAD_STORE_PATH", os.path.join(DATA_DIR, "uploads.sqlite3"))
+# "parallel": extract_skills + parse_resume_to_structure concurrently (two LLM calls)
+# "combined": parse_resume_to_structure only, skills taken from its "skills" section
+UPLOAD_EXTRACTION_MODE = os.getenv("UPLOAD_EXTRACTION_MODE", "parallel")
@@ -0,0 +1,129 @@
+"""
+Routes for the stored job index:
+  POST   /api/jobs              — add or replace postings
+  DELETE /api/jobs              — remove postings by id
+  POST   /api/jobs/index/build  — (re)build the approximate IVF index
+  GET    /api/jobs/index/stats  — index size and layout
+  POST   /api/jobs/search       — top-k postings for a resume, optional LLM analysis of the shortlist
+"""
+
+import time
+from flask import Blueprint, jsonify, request
+
+from app import config
+from app.services.job_index import get_job_index
+from app.services.llm_client import LLMError
+from app.services.match import compare_resume_to_jobs
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.route("/jobs", methods=["POST"])
+def add_jobs():
+    body = request.get_json(silent=True) or {}
+    jobs = body.get("jobs")
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({"error": "jobs must be a non-empty list"}), 400
+    try:
+        added = get_job_index().add(jobs)
+        return jsonify({"added": added, "total": len(get_job_index())})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@jobs_bp.route("/jobs", methods=["DELETE"])
+def delete_jobs():
+    body = request.get_json(silent=True) or {}
+    ids = body.get("ids")
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "ids must be a non-empty list"}), 400
+    removed = get_job_index().delete(ids)
+    return jsonify({"removed": removed, "total": len(get_job_index())})
+
+
+@jobs_bp.route("/jobs/index/build", methods=["POST"])
+def build_index():
+    body = request.get_json(silent=True) or {}
+    n_lists = None
+    if body.get("n_lists") is not None:
+        try:
+            n_lists = _int_field(body, "n_lists", None)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if not 1 <= n_lists <= config.JOB_INDEX_MAX_IVF_LISTS:
+            return jsonify({"error": f"n_lists must be between 1 and {config.JOB_INDEX_MAX_IVF_LISTS}"}), 400
+    try:
+        index = get_job_index()
+        if body.get("compact", True):
+            index.compact()
+        n_lists = index.build_ivf(n_lists)
+        return jsonify({"ivf_lists": n_lists, **index.stats()})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@jobs_bp.route("/jobs/index/stats", methods=["GET"])
+def index_stats():
+    return jsonify(get_job_index().stats())
+
+
+def _int_field(body: dict, name: str, default: int) -> int:
+    value = body.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+@jobs_bp.route("/jobs/search", methods=["POST"])
+def search_jobs():
+    """
+    Body: { resume_text, k?: 10, mode?: "exact" | "ivf", nprobe?: 8,
+            analyze_top?: 0, industry?, resume_id? }
+    Vector search shortlists k postings; only the best `analyze_top` of them
+    (capped at JOB_INDEX_MAX_ANALYZE) get the full LLM match analysis.
+    """
+    body = request.get_json(silent=True) or {}
+    resume = body.get("resume_text")
+    if not resume:
+        return jsonify({"error": "resume_text is required"}), 400
+
+    try:
+        k = _int_field(body, "k", 10)
+        analyze_top = _int_field(body, "analyze_top", 0)
+        nprobe = _int_field(body, "nprobe", 8)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    k = max(1, min(k, 1000))
+    mode = body.get("mode", "exact")
+    analyze_top = max(0, min(analyze_top, config.JOB_INDEX_MAX_ANALYZE, k))
+
+    try:
+        started = time.perf_counter()
+        hits = get_job_index().search(resume, k=k, mode=mode, nprobe=nprobe)
+        search_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        analysis_ms = 0.0
+        shortlist = hits[:analyze_top]
+        if shortlist:
+            started = time.perf_counter()
+            for i, result in compare_resume_to_jobs(
+                resume, [h["job_desc"] for h in shortlist], body.get("industry"),
+                resume_id=body.get("resume_id"),
+            ):
+                shortlist[i]["analysis"] = result
+            analysis_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        for hit in hits:
+            hit.pop("job_desc", None)
+        return jsonify({
+            "results": hits,
+            "mode": mode,
+            "timings_ms": {"search": search_ms, "analysis": analysis_ms},
+        })
+    except LLMError as e:
+        return jsonify({"error": str(e)}), e.status_code, e.headers
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,47 +1,177 @@
 """
 Routes for resume builder:
-  GET  /api/resume/data          — return stored resume_data.json
+  GET  /api/resume/data          — the caller's stored resume data (ETag, If-None-Match)
+  PUT  /api/resume/data          — save a new version (If-Match -> 412 on a stale ETag)
+  GET  /api/resume/data/history  — saved versions, newest first
+  GET  /api/resume/data/history/<v> — one saved version
   POST /api/resume/ats-check     — ATS analysis only
-  GET  /api/resume/download      — generate generic PDF from resume_data.json
+  GET  /api/resume/download      — generate generic PDF from the stored resume data
   POST /api/resume/generate      — full pipeline: match + tailor + PDF + ATS
+                                   (add "async": true to queue it and get a job id)
+  GET  /api/resume/jobs/<id>     — status / result of a queued generation
+  GET  /api/resume/jobs/<id>/pdf — PDF produced by a finished job
+  GET  /api/resume/jobs/metrics  — queue depth, wait and run times
+  GET  /api/resume/artifacts/<k> — PDF stored by a format=url response (ETag = k)
+
+/generate and /render pick their PDF transport with ?format= (or "format"
+in the body, or Accept: application/pdf):
+  b64 (default) — JSON with pdf_b64, as before
+  url           — JSON with pdf_url + pdf_etag; fetch the PDF separately
+  pdf           — the PDF itself as the body, key metadata in X- headers
+
+Stored resume data is per user. The user is the `sub` of the Supabase
+access token sent as "Authorization: Bearer <token>" (verified with
+SUPABASE_JWT_SECRET; a bad or unverifiable token is a 401). Requests
+without a token act as the shared "default" user, which inherits the old
+resume_data.json — there is no per-user isolation for them.
 """
 
-import os
 import json
 import base64
-from flask import Blueprint, jsonify, send_file, request
+from io import BytesIO
+from flask import Blueprint, Response, g, jsonify, send_file, request, url_for
 
 from app.services.ats_checker import check_ats
-from app.services.resume_pdf import build_pdf_from_file
 from app.services.resume_generator import run_pipeline
+from app.services.llm_client import LLMError
+from app.services.job_queue import get_job_queue, register_handler
+from app.services.artifacts import store_artifact, get_artifact
+from app.services.render_cache import render_key, render_pdf_cached
+from app.services.resume_store import DEFAULT_USER, VersionConflict, resume_store
+from app.utils.compression import GZIP_ETAG_SUFFIX, identity_etag
+from app.utils.jwt import JWTError, verify
+from app import config
 
 resume_bp = Blueprint("resume", __name__)
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../resume"))
-DATA_FILE = os.path.join(ROOT, "resume_data.json")
+
+def _generate_job(payload: dict):
+    """Queue handler: same pipeline as the synchronous route, PDF kept as the artifact."""
+    result = run_pipeline(payload["resume_text"], payload["job_desc"],
+                          payload.get("industry", ""), user_data=payload.get("user_data"),
+                          user_id=payload.get("user_id", DEFAULT_USER))
+    pdf_bytes = result.pop("pdf_bytes")
+    return result, pdf_bytes
+
+
+register_handler("resume.generate", _generate_job)
+
+
+@resume_bp.before_request
+def _authenticate():
+    """Resolve the caller's user id from its bearer token (401 if the token is bad)."""
+    auth = request.authorization
+    if auth is None or auth.type != "bearer" or not auth.token:
+        g.user_id = DEFAULT_USER
+        return None
+    try:
+        claims = verify(auth.token, config.SUPABASE_JWT_SECRET, audience=config.SUPABASE_JWT_AUDIENCE)
+    except JWTError as e:
+        response = jsonify({"error": f"unauthorized: {e}"})
+        response.headers["WWW-Authenticate"] = 'Bearer error="invalid_token"'
+        return response, 401
+    g.user_id = claims["sub"]
+    return None
+
+
+def _user_id() -> str:
+    return g.get("user_id", DEFAULT_USER)
+
+
+def _pdf_format(body: dict) -> str:
+    fmt = request.args.get("format") or body.get("format")
+    if fmt in ("b64", "url", "pdf"):
+        return fmt
+    if request.accept_mimetypes.best_match(["application/json", "application/pdf"]) == "application/pdf":
+        return "pdf"
+    return "b64"
+
+
+def _not_modified(etag: str):
+    """304 for a client that already holds this render (If-None-Match), else None."""
+    for tag in (etag, etag + GZIP_ETAG_SUFFIX):   # the client may hold the gzipped variant
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+            response.set_etag(tag)
+            return response
+    return None
+
+
+def _send_pdf(buf, filename: str, headers: dict = None, etag: str = None, **kwargs):
+    response = send_file(buf, mimetype="application/pdf", download_name=filename, **kwargs)
+    if etag:
+        response.set_etag(etag)
+    for key, value in (headers or {}).items():
+        response.headers[key] = value
+    return response
+
+
+def _pdf_fields(pdf_bytes: bytes, fmt: str) -> dict:
+    """JSON fields describing the PDF for the b64 and url formats."""
+    if fmt == "url":
+        key = store_artifact(pdf_bytes)
+        return {"pdf_url": url_for("resume.artifact", key=key), "pdf_etag": key}
+    return {"pdf_b64": base64.b64encode(pdf_bytes).decode("utf-8")}
+
+
+def _versioned(response, stored):
+    if not response.get_etag()[0]:   # a 304 already carries the variant the client holds
+        response.set_etag(stored.etag)
+    response.headers["X-Resume-Version"] = str(stored.version)
+    return response
 
 
 @resume_bp.route("/api/resume/data", methods=["GET"])
 def get_resume_data():
-    if not os.path.exists(DATA_FILE):
-        return jsonify({"error": "resume_data.json not found"}), 404
-    with open(DATA_FILE) as f:
-        data = json.load(f)
-    return jsonify(data)
+    """The caller's master resume data; If-None-Match with its ETag yields a 304."""
+    stored = resume_store.get(_user_id())
+    if stored is None:
+        return jsonify({"error": "resume data not found"}), 404
+    unchanged = _not_modified(stored.etag)
+    if unchanged is not None:
+        return _versioned(unchanged, stored)
+    return _versioned(jsonify(stored.data), stored)
 
 
 @resume_bp.route("/api/resume/data", methods=["PUT"])
 def save_resume_data():
-    """Persist edited master resume data back to resume_data.json."""
+    """
+    Save edited master resume data as a new version. Send the ETag from the
+    last GET as If-Match: if someone saved in between, nothing is written
+    and the response is 412 with the current ETag.
+    """
     data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "No data provided"}), 400
+    if_match = request.if_match
+    if not if_match and config.RESUME_REQUIRE_IF_MATCH:
+        return jsonify({"error": "If-Match header required"}), 428
+    expected = None
+    if if_match:
+        expected = "*" if if_match.star_tag else {identity_etag(tag) for tag in if_match.as_set()}
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
-        return jsonify({"ok": True})
+        stored = resume_store.save(_user_id(), data, if_match=expected)
+    except VersionConflict as e:
+        response = jsonify({"error": str(e), "current_etag": e.current_etag})
+        if e.current_etag:
+            response.set_etag(e.current_etag)
+        return response, 412
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    return _versioned(jsonify({"ok": True, "version": stored.version, "etag": stored.etag}), stored)
+
+
+@resume_bp.route("/api/resume/data/history", methods=["GET"])
+def resume_data_history():
+    return jsonify({"versions": resume_store.history(_user_id())})
+
+
+@resume_bp.route("/api/resume/data/history/<int:version>", methods=["GET"])
+def resume_data_version(version):
+    stored = resume_store.get_version(_user_id(), version)
+    if stored is None:
+        return jsonify({"error": "version not found"}), 404
+    return _versioned(jsonify(stored.data), stored)
 
 
 @resume_bp.route("/api/resume/ats-check", methods=["POST"])
@@ -62,11 +192,17 @@ def ats_check():
 
 @resume_bp.route("/api/resume/download", methods=["GET"])
 def download_resume():
-    """Generic PDF — not tailored to any job."""
+    """Generic PDF — not tailored to any job. Cached by content; supports If-None-Match."""
     try:
-        buf = build_pdf_from_file()
-        return send_file(buf, mimetype="application/pdf", as_attachment=True,
-                         download_name="Yusuf_Mohamed_Resume.pdf")
+        stored = resume_store.get(_user_id())
+        if stored is None:
+            raise FileNotFoundError("resume data not found")
+        data = stored.data
+        unchanged = _not_modified(render_key(data))
+        if unchanged is not None:
+            return unchanged
+        key, pdf = render_pdf_cached(data)
+        return _send_pdf(BytesIO(pdf), "Yusuf_Mohamed_Resume.pdf", etag=key, as_attachment=True)
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -81,7 +217,9 @@ def generate_tailored():
       2. LLM picks + reorders most relevant projects/skills
       3. Generates tailored PDF
       4. Runs ATS check
-    Returns JSON with pdf_b64, match_result, ats_result, selected_projects, summary.
+    Returns JSON with pdf_b64 (or pdf_url, see format), match_result,
+    ats_result, selected_projects, tailored_data and per-stage timings_ms.
+    With format=pdf the body is the PDF and scores travel in X- headers.
     """
     body = request.get_json(silent=True) or {}
     resume_text = body.get("resume_text", "")
@@ -94,19 +232,50 @@ def generate_tailored():
     if not job_desc:
         return jsonify({"error": "job_desc is required"}), 400
 
+    if body.get("async") or request.args.get("async") in ("1", "true"):
+        queue = get_job_queue()
+        try:
+            job_id = queue.submit(
+                "resume.generate",
+                {"resume_text": resume_text, "job_desc": job_desc,
+                 "industry": industry, "user_data": user_data, "user_id": _user_id()},
+                callback_url=body.get("callback_url"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        queue.start(config.JOB_QUEUE_WORKERS)
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": url_for("resume.job_status", job_id=job_id),
+        }), 202
+
     try:
-        result = run_pipeline(resume_text, job_desc, industry, user_data=user_data)
-        pdf_b64 = base64.b64encode(result["pdf_bytes"]).decode("utf-8")
+        result = run_pipeline(resume_text, job_desc, industry, user_data=user_data,
+                              user_id=_user_id())
+        fmt = _pdf_format(body)
+
+        if fmt == "pdf":
+            return _send_pdf(BytesIO(result["pdf_bytes"]), "Tailored_Resume.pdf", {
+                "X-Match-Score": str(result["match_result"].get("match_score", 0)),
+                "X-ATS-Score": str(result["ats_result"].get("ats_score", 0)),
+                "X-ATS-Grade": result["ats_result"].get("grade", ""),
+                "X-Selected-Projects": json.dumps(result["selected_projects"]),
+                "X-Timings-Ms": json.dumps(result["timings_ms"]),
+            })
 
         return jsonify({
-            "pdf_b64": pdf_b64,
+            **_pdf_fields(result["pdf_bytes"], fmt),
             "match_result": result["match_result"],
             "ats_result": result["ats_result"],
             "selected_projects": result["selected_projects"],
             "tailored_data": result["tailored_data"],
+            "timings_ms": result["timings_ms"],
         })
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
+    except LLMError as e:
+        return jsonify({"error": f"Pipeline failed: {str(e)}"}), e.status_code, e.headers
     except Exception as e:
         return jsonify({"error": f"Pipeline failed: {str(e)}"}), 500
 
@@ -115,8 +284,12 @@ def generate_tailored():
 def render_custom():
     """
     Re-render a PDF from arbitrary resume data (used by the editor).
-    Body: { data: <resume data object>, summary: <string> }
-    Returns: { pdf_b64: <base64 string> }
+    Body: { data: <resume data object>, summary: <string>, format?: b64|url|pdf }
+    Returns: { pdf_b64: <base64 string> } | { pdf_url, pdf_etag } | the PDF
+    Renders are cached by canonical data; the ETag header is the render key
+    plus the format (each format is a different body), and sending it back
+    as If-None-Match yields a 304 when nothing changed. The format can come
+    from Accept, so responses carry Vary: Accept.
     """
     body = request.get_json(silent=True) or {}
     data = body.get("data")
@@ -124,9 +297,61 @@ def render_custom():
         return jsonify({"error": "data is required"}), 400
 
     try:
-        from app.services.resume_pdf import generate_resume_pdf
-        buf = generate_resume_pdf(data)
-        pdf_b64 = base64.b64encode(buf.read()).decode("utf-8")
-        return jsonify({"pdf_b64": pdf_b64})
+        fmt = _pdf_format(body)
+        etag = f"{render_key(data)}-{fmt}"
+        response = _not_modified(etag)
+        if response is None:
+            _, pdf = render_pdf_cached(data)
+            if fmt == "pdf":
+                response = _send_pdf(BytesIO(pdf), "Resume.pdf", etag=etag)
+            else:
+                response = jsonify(_pdf_fields(pdf, fmt))
+                response.set_etag(etag)
+        response.vary.add("Accept")
+        return response
     except Exception as e:
         return jsonify({"error": f"Render failed: {str(e)}"}), 500
+
+
+@resume_bp.route("/api/resume/artifacts/<key>", methods=["GET"])
+def artifact(key):
+    """Content-addressed PDF; conditional GET with If-None-Match returns 304."""
+    data = get_artifact(key)
+    if data is None:
+        return jsonify({"error": "artifact not found"}), 404
+    return send_file(BytesIO(data), mimetype="application/pdf", download_name="Resume.pdf",
+                     etag=key, conditional=True, max_age=24 * 3600)
+
+
+@resume_bp.route("/api/resume/jobs/metrics", methods=["GET"])
+def job_metrics():
+    return jsonify(get_job_queue().metrics())
+
+
+@resume_bp.route("/api/resume/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    """
+    Poll a queued generation. Once done, `result` holds the same fields as the
+    synchronous response (minus the PDF), and the PDF is at `pdf_url`;
+    pass ?include_pdf=1 to get it inline as pdf_b64 instead.
+    """
+    include_pdf = request.args.get("include_pdf") in ("1", "true")
+    job = get_job_queue().get(job_id, with_artifact=include_pdf)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+
+    if job["status"] == "done":
+        job["pdf_url"] = url_for("resume.job_pdf", job_id=job_id)
+        if include_pdf and job.get("artifact"):
+            job["pdf_b64"] = base64.b64encode(job["artifact"]).decode("utf-8")
+    job.pop("artifact", None)
+    return jsonify(job)
+
+
+@resume_bp.route("/api/resume/jobs/<job_id>/pdf", methods=["GET"])
+def job_pdf(job_id):
+    job = get_job_queue().get(job_id, with_artifact=True)
+    if job is None or job["status"] != "done" or not job.get("artifact"):
+        return jsonify({"error": "PDF not available"}), 404
+    return send_file(BytesIO(job["artifact"]), mimetype="application/pdf",
+                     download_name="Tailored_Resume.pdf")
@@ -1,25 +1,138 @@
 # backend/app/routes/scan.py
-from flask import Blueprint, request, jsonify
-from app.services.match import compare_resume_and_job
+import json
+import time
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from app import config
+from app.services.llm_client import LLMError
+from app.services.match import compare_resume_and_job, compare_resume_to_jobs
+from app.services.similarity import SIMILARITY_METHODS
 
 scan_bp = Blueprint('scan', __name__)
 
+
+def _skill_list(data: dict, name: str):
+    """Optional precomputed skills: None or a list of strings (ValueError otherwise)."""
+    value = data.get(name)
+    if value is not None and not (isinstance(value, list) and all(isinstance(s, str) for s in value)):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
+
+
+def _similarity_method(data: dict):
+    """None (use SIMILARITY_METHOD) or one of SIMILARITY_METHODS (ValueError otherwise)."""
+    value = data.get('similarity_method')
+    if value is not None and value not in SIMILARITY_METHODS:
+        raise ValueError(f"similarity_method must be one of {', '.join(SIMILARITY_METHODS)}")
+    return value
+
 @scan_bp.route('/match', methods=['POST'])
 def match_job():
     data = request.json
     resume = data.get('resume_text')
     job = data.get('job_desc')
     industry = data.get('industry')
+    # Optional: skip re-extracting skills the client already has
+    resume_id = data.get('resume_id')
 
     if not resume or not job:
         return jsonify({"error": "Missing fields"}), 400
+    try:
+        resume_skills = _skill_list(data, 'resume_skills')
+        job_skills = _skill_list(data, 'job_skills')
+        similarity_method = _similarity_method(data)  # "llm" | "embedding"
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     try:
-        result = compare_resume_and_job(resume, job, industry)
+        result = compare_resume_and_job(
+            resume, job, industry,
+            resume_skills=resume_skills, job_skills=job_skills, resume_id=resume_id,
+            similarity_method=similarity_method,
+        )
         return jsonify({
             **result,
             "analysis_method": "combined (gemini + cosine similarity)",
             "version": "1.1"
         }), 200
+    except LLMError as e:
+        return jsonify({"error": str(e)}), e.status_code, e.headers
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@scan_bp.route('/match/batch', methods=['POST'])
+def match_batch():
+    """
+    One resume against many job descriptions, streamed as results complete.
+
+    Body: { resume_text, jobs: [str | {id, job_desc}], industry?, resume_id?, resume_skills?,
+            similarity_method? }
+    Response: NDJSON by default, or SSE when the client sends
+    Accept: text/event-stream. Events, in order:
+      start   — {count}
+      result  — {index, id, result}        (one per job, completion order)
+      summary — {ranking: [{index, id, match_score}], elapsed_ms}   (best first)
+    An LLM rate limit / outage / deadline ends the results early with an
+      error   — {error, status, retry_after}
+    """
+    data = request.get_json(silent=True) or {}
+    resume = data.get('resume_text')
+    jobs = data.get('jobs') or data.get('job_descs') or []
+    industry = data.get('industry')
+
+    if not resume or not jobs or not isinstance(jobs, list):
+        return jsonify({"error": "resume_text and a non-empty jobs list are required"}), 400
+    if len(jobs) > config.BATCH_MAX_JOBS:
+        return jsonify({"error": f"At most {config.BATCH_MAX_JOBS} jobs per batch"}), 400
+    try:
+        resume_skills = _skill_list(data, 'resume_skills')
+        similarity_method = _similarity_method(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ids, job_descs = [], []
+    for i, job in enumerate(jobs):
+        if isinstance(job, dict):
+            ids.append(job.get('id', i))
+            job_descs.append(job.get('job_desc') or job.get('text') or "")
+        else:
+            ids.append(i)
+            job_descs.append(str(job))
+
+    sse = 'text/event-stream' in request.headers.get('Accept', '')
+
+    def _event(kind, payload):
+        if sse:
+            return f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({"type": kind, **payload}) + "\n"
+
+    def _stream():
+        started = time.perf_counter()
+        yield _event("start", {"count": len(job_descs)})
+        scores = []
+        try:
+            for index, result in compare_resume_to_jobs(
+                resume, job_descs, industry,
+                resume_skills=resume_skills, resume_id=data.get('resume_id'),
+                similarity_method=similarity_method,
+            ):
+                scores.append((result.get("match_score", 0.0), index))
+                yield _event("result", {"index": index, "id": ids[index], "result": result})
+        except LLMError as e:
+            # Headers are already sent; carry the status and Retry-After in the event
+            yield _event("error", {"error": str(e), "status": e.status_code,
+                                   "retry_after": e.headers.get("Retry-After")})
+        except Exception as e:
+            yield _event("error", {"error": str(e)})
+        ranking = [
+            {"index": index, "id": ids[index], "match_score": score}
+            for score, index in sorted(scores, key=lambda s: (-s[0], s[1]))
+        ]
+        yield _event("summary", {
+            "ranking": ranking,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    return Response(stream_with_context(_stream()), mimetype=mimetype,
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1,24 +1,83 @@
+import time
+
 from flask import Blueprint, request, jsonify
-from app.services.parser import parse_pdf_text
+from app import config
+from app.services.parser import parse_pdf_text, PDFLimitError
 from app.services.gemini import extract_skills
-from app.services.resume_parser import parse_resume_to_structure
+from app.services.llm_client import LLMError
+from app.services.resume_parser import parse_resume_to_structure, skills_from_structure
+from app.services.skill_store import skill_store, fingerprint
+from app.services.upload_store import upload_store, pdf_digest, extraction_version
+from app.utils.concurrency import run_parallel
 
 upload_bp = Blueprint('upload', __name__)
 
+EXTRACTION_MODES = ("parallel", "combined")
+
+
+def _extract(text: str, mode: str):
+    """(skills, structured_data, timings_ms) for the chosen extraction mode."""
+    if mode == "combined":
+        start = time.perf_counter()
+        structured_data = parse_resume_to_structure(text)
+        timings = {"structure": round((time.perf_counter() - start) * 1000, 1)}
+        return skills_from_structure(structured_data), structured_data, timings
+    results, timings = run_parallel({
+        "skills": lambda: extract_skills(text),
+        "structure": lambda: parse_resume_to_structure(text),
+    })
+    return results["skills"], results["structure"], timings
+
+
 @upload_bp.route('/upload', methods=['POST'])
 def upload_resume():
     if 'resume' not in request.files:
         return jsonify({"error": "No resume uploaded"}), 400
 
+    mode = request.form.get("mode") or request.args.get("mode") or config.UPLOAD_EXTRACTION_MODE
+    if mode not in EXTRACTION_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(EXTRACTION_MODES)}"}), 400
+
     file = request.files['resume']
+    start = time.perf_counter()
+    timings = {}
     try:
-        text = parse_pdf_text(file)
-        skills = extract_skills(text)
-        structured_data = parse_resume_to_structure(text)
+        # Same bytes as an earlier upload -> reuse its text, skip PyMuPDF
+        pdf_hash = pdf_digest(file.stream)
+        text = upload_store.text_for_pdf(pdf_hash)
+        if text is None:
+            t0 = time.perf_counter()
+            text = parse_pdf_text(file)
+            timings["parse_pdf"] = round((time.perf_counter() - t0) * 1000, 1)
+        resume_id = fingerprint(text)
+
+        # Same text (and same prompts/model/mode) -> reuse the LLM results
+        version = f"{extraction_version()}-{mode}"
+        cached = upload_store.get(resume_id, version)
+        if cached:
+            skills, structured_data = cached["skills"], cached["structured_data"]
+            upload_store.put(resume_id, text, pdf_hash=pdf_hash)
+        else:
+            skills, structured_data, llm_timings = _extract(text, mode)
+            timings.update(llm_timings)
+            upload_store.put(resume_id, text, pdf_hash=pdf_hash, skills=skills,
+                             structured_data=structured_data, version=version)
+
+        # Remember the extraction so /match can reuse it via resume_id
+        skill_store.put(resume_id, skills)
+        timings["total"] = round((time.perf_counter() - start) * 1000, 1)
         return jsonify({
+            "resume_id": resume_id,
             "resume_text": text,
             "skills": skills,
             "structured_data": structured_data,
+            "cached": bool(cached),
+            "mode": mode,
+            "timings_ms": timings,
         }), 200
+    except PDFLimitError as e:
+        return jsonify({"error": str(e)}), 413
+    except LLMError as e:
+        return jsonify({"error": str(e)}), e.status_code, e.headers
     except Exception as e:
         return jsonify({"error": str(e)}), 500
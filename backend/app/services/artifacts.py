@@ -0,0 +1,36 @@
+"""
+Content-addressed store for generated PDFs.
+
+Routes that produce a PDF can hand back a short URL instead of inlining the
+bytes as base64: the PDF is stored under the SHA-256 of its content, which
+doubles as a strong ETag, so a client that already has it gets a 304.
+"""
+
+import hashlib
+import re
+
+from app import config
+from app.utils.blob_cache import BlobCache
+
+artifact_store = BlobCache(
+    directory=config.ARTIFACT_DIR or None,
+    max_memory_bytes=config.ARTIFACT_MEMORY_BYTES,
+    max_disk_bytes=config.ARTIFACT_DISK_BYTES,
+)
+
+
+def store_artifact(data: bytes) -> str:
+    """Store bytes and return their content hash (usable as id and ETag)."""
+    key = hashlib.sha256(data).hexdigest()
+    artifact_store.put(key, data)
+    return key
+
+
+_KEY = re.compile(r"[0-9a-f]{64}")
+
+
+def get_artifact(key: str):
+    """Stored bytes for a key from store_artifact, or None (also for anything that isn't one)."""
+    if not isinstance(key, str) or not _KEY.fullmatch(key):
+        return None
+    return artifact_store.get(key)
@@ -0,0 +1,381 @@
+"""
+Offline ATS audit of a whole candidate pool against one job description.
+
+Walks directories (or reads a manifest) of resume PDFs, extracts text with
+parse_pdf_text in a process pool, scores each resume with check_ats and
+streams one row per resume to CSV, JSONL or Parquet. Rows are written as
+they complete, so an interrupted run can be restarted with the same command
+and only the PDFs without a row (or with an error row) are processed.
+
+No LLM calls are made: the match score is TF-IDF similarity to the job
+description (the corpus model when one is fitted), and matched/missing
+skills come from an optional --skills list.
+
+From the backend directory:
+    python -m app.services.ats_audit resumes/ --job-desc-file job.txt \\
+        --skills "python, aws, docker" --out audit.csv
+
+Manifests are .txt (one path per line), .csv or .jsonl (a `path` column,
+optional `id`).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.services.ats_checker import check_ats
+from app.services.parser import _start_method, parse_pdf_text
+from app.services.tfidf_model import tfidf_model
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
+FIELDS = [
+    "id", "path", "job_hash", "status", "error", "ats_score", "grade", "match_score",
+    "contact_info", "section_headers", "keyword_match", "formatting",
+    "quantifiable_achievements", "word_count", "sections_found", "matched_skills",
+    "missing_skills", "format_issues", "recommendations",
+]
+LIST_FIELDS = {"sections_found", "matched_skills", "missing_skills", "format_issues", "recommendations"}
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+def iter_inputs(paths: List[str]) -> Iterator[Dict[str, str]]:
+    """Yield {id, path} for every PDF under the given directories / manifests / files."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        full = os.path.join(root, name)
+                        yield {"id": os.path.relpath(full, path), "path": full}
+        elif path.lower().endswith(".pdf"):
+            yield {"id": os.path.basename(path), "path": path}
+        else:
+            yield from _iter_manifest(path)
+
+
+def _iter_manifest(path: str) -> Iterator[Dict[str, str]]:
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        elif path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = ({"path": line.strip()} for line in f if line.strip() and not line.startswith("#"))
+        for row in rows:
+            pdf = os.path.join(base, row["path"])   # relative entries are relative to the manifest
+            yield {"id": str(row.get("id") or row["path"]), "path": pdf}
+
+
+def job_hash(job_desc: str) -> str:
+    return hashlib.sha256(job_desc.strip().encode("utf-8")).hexdigest()[:16]
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+def _match_score(resume_text: str, job_desc: str) -> float:
+    """TF-IDF cosine similarity on a 0-100 scale, as SimilarityChecker computes it."""
+    if not resume_text.strip() or not job_desc.strip():
+        return 0.0
+    score = tfidf_model.similarity(resume_text, job_desc) if tfidf_model.fitted else None
+    if score is None:
+        matrix = TfidfVectorizer().fit_transform([resume_text, job_desc])
+        score = float((matrix[0] @ matrix[1].T).toarray()[0][0])
+    return round(score * 100, 2)
+
+
+def _skill_present(skill: str, text_lower: str) -> bool:
+    return re.search(rf'(?<!\w){re.escape(skill.lower())}(?!\w)', text_lower) is not None
+
+
+def audit_one(item: Dict[str, str], job_desc: str, skills: List[str]) -> dict:
+    """Extract, score and flatten one resume. Runs in a worker process; never raises."""
+    row = {"id": item["id"], "path": item["path"], "job_hash": job_hash(job_desc)}
+    try:
+        # Files are already spread across processes — no page-level pool here
+        text = parse_pdf_text(item["path"], parallel=False)
+        if not text:
+            raise ValueError("No extractable text (scanned PDF?)")
+        text_lower = text.lower()
+        matched = [s for s in skills if _skill_present(s, text_lower)]
+        missing = [s for s in skills if s not in matched]
+        match_score = _match_score(text, job_desc)
+        result = check_ats(text, job_desc, matched, missing, match_score)
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+        return row
+
+    row.update(
+        status="ok", error="",
+        ats_score=result["ats_score"], grade=result["grade"], match_score=match_score,
+        **result["breakdown"],
+        word_count=result["word_count"],
+        sections_found=result["sections_found"], matched_skills=matched,
+        missing_skills=missing, format_issues=result["format_issues"],
+        recommendations=result["recommendations"],
+    )
+    return row
+
+
+# ── Outputs ───────────────────────────────────────────────────────────────────
+def _truncate_partial_line(path: str, block: int = 65536):
+    """Drop a half-written last line left by an interrupted run."""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Scan back block by block: the partial line can be longer than one block
+        end = size
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            cut = f.read(end - start).rfind(b"\n")
+            if cut != -1:
+                f.truncate(start + cut + 1)
+                return
+            end = start
+        f.truncate(0)   # the whole file is one unfinished line
+
+
+def _truncate_partial_record(path: str, block: int = 65536):
+    """
+    CSV flavour of _truncate_partial_line: a quoted field may hold newlines,
+    so a record only ends at a newline outside quotes. Quotes inside fields
+    are doubled, so "outside" means an even number of quotes so far.
+    """
+    with open(path, "rb+") as f:
+        offset, quoted, boundary = 0, False, 0
+        while True:
+            chunk = f.read(block)
+            if not chunk:
+                break
+            for match in re.finditer(b'["\n]', chunk):
+                if match.group() == b'"':
+                    quoted = not quoted
+                elif not quoted:
+                    boundary = offset + match.end()
+            offset += len(chunk)
+        if boundary != offset:
+            f.truncate(boundary)
+
+
+class _JsonlSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def existing(self) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        _truncate_partial_line(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def open(self, restart: bool):
+        self._f = open(self.path, "w" if restart else "a", encoding="utf-8")
+
+    def write(self, row: dict):
+        self._f.write(json.dumps(row) + "\n")
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+    def rewrite(self, rows: List[dict]):
+        """Replace the file with `rows` (atomically, so a crash keeps the old one)."""
+        final_path, self.path = self.path, self.path + ".tmp"
+        try:
+            self.open(restart=True)
+            try:
+                for row in rows:
+                    self.write(row)
+            finally:
+                self.close()
+        finally:
+            self.path = final_path
+        os.replace(final_path + ".tmp", final_path)
+
+
+class _CsvSink(_JsonlSink):
+    def existing(self) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        _truncate_partial_record(self.path)
+        with open(self.path, encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def open(self, restart: bool):
+        fresh = restart or not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._f = open(self.path, "w" if fresh else "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=FIELDS, extrasaction="ignore")
+        if fresh:
+            self._writer.writeheader()
+
+    def write(self, row: dict):
+        self._writer.writerow({k: "; ".join(v) if k in LIST_FIELDS and isinstance(v, list) else v
+                               for k, v in row.items()})
+        self._f.flush()
+
+
+class _ParquetSink(_JsonlSink):
+    """
+    Parquet files cannot be appended to, so rows stream into a JSONL spool
+    next to the output (which is what makes the run resumable) and the
+    Parquet file is written from it once every input is done.
+    """
+
+    def __init__(self, path: str):
+        if pq is None:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        super().__init__(path + ".partial.jsonl")
+        self.final_path = path
+
+    def finalize(self):
+        rows = self.existing()
+        columns = {
+            field: [("; ".join(r.get(field) or []) if field in LIST_FIELDS else r.get(field))
+                    for r in rows]
+            for field in FIELDS
+        }
+        pq.write_table(pa.table(columns), self.final_path)
+        os.remove(self.path)
+
+
+def _sink_for(path: str, fmt: Optional[str]):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    sinks = {"jsonl": _JsonlSink, "csv": _CsvSink, "parquet": _ParquetSink}
+    if fmt not in sinks:
+        raise ValueError(f"Unknown output format '{fmt}' (use csv, jsonl or parquet)")
+    return sinks[fmt](path)
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+def run_audit(inputs: List[Dict[str, str]], job_desc: str, out: str, fmt: str = None,
+              skills: List[str] = None, workers: int = None, restart: bool = False,
+              progress=None, retry_errors: bool = True) -> dict:
+    """
+    Audit every input not already present in `out`. Returns run counters.
+    Rows that ended in an error are dropped from `out` and audited again
+    unless `retry_errors` is False, in which case they count as done.
+    `progress(done, total, errors, elapsed)` is called after each row.
+    """
+    skills = skills or []
+    sink = _sink_for(out, fmt)
+    wanted = job_hash(job_desc)
+
+    done: Set[str] = set()
+    retried = 0
+    if not restart:
+        kept = []
+        for row in sink.existing():
+            if row.get("job_hash") != wanted:
+                raise ValueError(f"{out} holds results for a different job description; "
+                                 "pass --restart to overwrite it")
+            if retry_errors and row.get("status") != "ok":
+                retried += 1
+                continue
+            kept.append(row)
+            done.add(row["path"])
+        if retried:
+            sink.rewrite(kept)
+    todo = [item for item in inputs if item["path"] not in done]
+
+    counters = {"total": len(todo), "skipped": len(done), "retried": retried, "ok": 0, "errors": 0}
+    start = time.time()
+    sink.open(restart)
+    try:
+        # Never fork: see parser._start_method (the API calls this from request threads)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context(_start_method())) as pool:
+            window = (workers or os.cpu_count() or 1) * 4   # bound in-flight work on huge pools
+            pending = set()
+            remaining = iter(todo)
+            while True:
+                for item in remaining:
+                    pending.add(pool.submit(audit_one, item, job_desc, skills))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    row = future.result()
+                    sink.write(row)
+                    counters["ok" if row["status"] == "ok" else "errors"] += 1
+                    if progress:
+                        progress(counters["ok"] + counters["errors"], counters["total"],
+                                 counters["errors"], time.time() - start)
+    finally:
+        sink.close()
+    if isinstance(sink, _ParquetSink):
+        sink.finalize()
+    counters["elapsed_s"] = round(time.time() - start, 3)
+    return counters
+
+
+def _progress_printer(interval: float = 1.0):
+    last = 0.0
+
+    def _print(done: int, total: int, errors: int, elapsed: float):
+        nonlocal last
+        if done < total and time.time() - last < interval:
+            return
+        last = time.time()
+        rate = done / elapsed if elapsed else 0.0
+        eta = (total - done) / rate if rate else 0.0
+        print(f"\r[{done}/{total}] {rate:.1f} files/s, {errors} errors, ETA {eta:.0f}s",
+              end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+    return _print
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk ATS audit of resume PDFs against a job description")
+    parser.add_argument("inputs", nargs="+", help="directories of PDFs, PDF files or manifests (.txt/.csv/.jsonl)")
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job-desc", help="job description text")
+    job.add_argument("--job-desc-file", help="file containing the job description")
+    parser.add_argument("--skills", default="", help="comma-separated skills the job requires")
+    parser.add_argument("--out", required=True, help="output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], help="defaults to the --out extension")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--restart", action="store_true", help="overwrite --out instead of resuming")
+    parser.add_argument("--no-retry-errors", action="store_true",
+                        help="when resuming, keep earlier error rows instead of auditing those PDFs again")
+    parser.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    if args.job_desc_file:
+        with open(args.job_desc_file, encoding="utf-8") as f:
+            job_desc = f.read()
+    else:
+        job_desc = args.job_desc
+    skills = [s.strip() for s in args.skills.split(",") if s.strip()]
+
+    counters = run_audit(list(iter_inputs(args.inputs)), job_desc, args.out, fmt=args.format,
+                         skills=skills, workers=args.workers, restart=args.restart,
+                         progress=None if args.quiet else _progress_printer(),
+                         retry_errors=not args.no_retry_errors)
+    print(json.dumps(counters))
+
+
+if __name__ == "__main__":
+    main()
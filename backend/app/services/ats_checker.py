@@ -6,6 +6,8 @@ Scores a resume against a job description and checks for ATS parse-ability.
 import re
 from typing import Optional
 
+from app.utils.tracing import span
+
 
 # Standard ATS-recognized section headers
 STANDARD_HEADERS = {
@@ -29,24 +31,76 @@ CONTACT_PATTERNS = {
     "linkedin": r'linkedin\.com/in/',
 }
 
+# Quantifiable-achievement patterns (matched against the lowercased text)
+QUANTITY_PATTERNS = [
+    r'\d+\s*%', r'\$\s*\d+', r'\d+\+?\s*(team|engineer|user|student|customer)',
+    r'(led|managed|built|reduced|increased|improved|delivered|launched)',
+]
+
+# Substrings of which at least one must occur for a pattern to match at all.
+# Checked first with a plain substring scan, which is far cheaper than running
+# the regex over a resume it cannot match. Only case-free characters are used
+# for patterns compiled with IGNORECASE.
+REQUIRED_LITERALS = {
+    CONTACT_PATTERNS["email"]: ("@",),
+    CONTACT_PATTERNS["linkedin"]: ("/",),
+    BAD_PATTERNS[0][0]: ("table",),
+    BAD_PATTERNS[2][0]: ("|",),
+    QUANTITY_PATTERNS[0]: ("%",),
+    QUANTITY_PATTERNS[1]: ("$",),
+    QUANTITY_PATTERNS[2]: ("team", "engineer", "user", "student", "customer"),
+    QUANTITY_PATTERNS[3]: ("led", "managed", "built", "reduced", "increased",
+                           "improved", "delivered", "launched"),
+}
+
+
+# ── Compiled rules ────────────────────────────────────────────────────────────
+# Every rule is compiled once here; check_ats only evaluates them.
+def _rule(pattern: str, flags: int = 0, literals: tuple = None, anchored: bool = False):
+    """
+    (regex, required literals, anchored). `anchored` means every match starts
+    at an occurrence of one of the literals, so only those offsets are tried.
+    """
+    return re.compile(pattern, flags), literals or REQUIRED_LITERALS.get(pattern, ()), anchored
+
+
+def _matches(rule, text: str) -> bool:
+    regex, literals, anchored = rule
+    if anchored:
+        for lit in literals:
+            i = text.find(lit)
+            while i != -1:
+                if regex.match(text, i):
+                    return True
+                i = text.find(lit, i + 1)
+        return False
+    if literals and not any(lit in text for lit in literals):
+        return False
+    return regex.search(text) is not None
+
+
+_CONTACT_RULES = [(key, _rule(p, re.IGNORECASE)) for key, p in CONTACT_PATTERNS.items()]
+# Iterates STANDARD_HEADERS in the same order check_ats always reported them
+_HEADER_RULES = [(h, _rule(rf'\b{re.escape(h)}\b', literals=(h,), anchored=True)) for h in STANDARD_HEADERS]
+_FORMAT_RULES = [(_rule(p), msg) for p, msg in BAD_PATTERNS]
+_QUANTITY_RULES = [_rule(p) for p in QUANTITY_PATTERNS]
+
 
+@span("ats.check")
 def check_ats(resume_text: str, job_desc: str, matched_skills: list, missing_skills: list, match_score: float) -> dict:
     text_lower = resume_text.lower()
 
     # ── 1. Contact info (10 pts) ──────────────────────────────────────────────
     contact_score = 0
     contact_details = {}
-    for key, pattern in CONTACT_PATTERNS.items():
-        found = bool(re.search(pattern, resume_text, re.IGNORECASE))
+    for key, rule in _CONTACT_RULES:
+        found = _matches(rule, resume_text)
         contact_details[key] = found
         if found:
             contact_score += 10 / len(CONTACT_PATTERNS)
 
     # ── 2. Standard section headers (15 pts) ─────────────────────────────────
-    found_headers = []
-    for header in STANDARD_HEADERS:
-        if re.search(rf'\b{re.escape(header)}\b', text_lower):
-            found_headers.append(header)
+    found_headers = [header for header, rule in _HEADER_RULES if _matches(rule, text_lower)]
     header_score = min(15, len(found_headers) * 3)
 
     # ── 3. Keyword / skill match density (40 pts) ─────────────────────────────
@@ -56,8 +110,8 @@ def check_ats(resume_text: str, job_desc: str, matched_skills: list, missing_ski
     # ── 4. Formatting cleanliness (20 pts) ────────────────────────────────────
     format_issues = []
     format_score = 20
-    for pattern, msg in BAD_PATTERNS:
-        if re.search(pattern, resume_text):
+    for rule, msg in _FORMAT_RULES:
+        if _matches(rule, resume_text):
             format_issues.append(msg)
             format_score -= 5
 
@@ -69,11 +123,7 @@ def check_ats(resume_text: str, job_desc: str, matched_skills: list, missing_ski
     format_score = max(0, format_score)
 
     # ── 5. Quantifiable achievements (15 pts) ────────────────────────────────
-    quantity_patterns = [
-        r'\d+\s*%', r'\$\s*\d+', r'\d+\+?\s*(team|engineer|user|student|customer)',
-        r'(led|managed|built|reduced|increased|improved|delivered|launched)',
-    ]
-    quant_hits = sum(1 for p in quantity_patterns if re.search(p, text_lower))
+    quant_hits = sum(1 for rule in _QUANTITY_RULES if _matches(rule, text_lower))
     quant_score = min(15, quant_hits * 3)
 
     # ── Total ─────────────────────────────────────────────────────────────────
@@ -0,0 +1,218 @@
+"""
+Local, CPU-only text embeddings.
+
+Two backends, chosen with EMBEDDINGS_BACKEND:
+  - "hashing" (default) — word 1-2 grams + char 3-5 grams through the hashing
+    trick, projected to EMBEDDINGS_DIM dense dimensions. The projection is a
+    fixed sparse random projection, or a TruncatedSVD fitted on a corpus:
+        python -m app.services.embeddings fit jobs.jsonl
+    No model download and no network access.
+  - "sentence-transformers" — a small local model (EMBEDDINGS_MODEL), used
+    only when the optional sentence_transformers package is installed.
+
+Vectors are L2-normalized float32 rows, so cosine similarity is a dot
+product; `quantize_int8` shrinks stored matrices 4x for large indexes.
+"""
+
+import argparse
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.random_projection import SparseRandomProjection
+
+from app import config
+from app.services.skill_store import fingerprint
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional dependency
+    SentenceTransformer = None
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 256, n_features: int = 2 ** 14, seed: int = 42):
+        self.dim = dim
+        self.n_features = n_features
+        self.seed = seed
+        common = dict(n_features=n_features, alternate_sign=False, norm="l2", dtype=np.float32)
+        self._words = HashingVectorizer(analyzer="word", ngram_range=(1, 2), **common)
+        self._chars = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), **common)
+        self._svd = None
+        self._projection = SparseRandomProjection(
+            n_components=dim, random_state=seed, dense_output=True,
+        ).fit(sp.csr_matrix((1, 2 * n_features), dtype=np.float32))
+
+    @property
+    def name(self) -> str:
+        kind = "svd" if self._svd is not None else "rp"
+        return f"hashing-{kind}-{self.dim}-{self.n_features}-{self.seed}"
+
+    def _features(self, texts: List[str]) -> sp.csr_matrix:
+        return sp.hstack([self._words.transform(texts), self._chars.transform(texts)], format="csr")
+
+    def fit(self, texts: List[str]) -> "HashingEmbedder":
+        """Replace the random projection with an SVD learned from a corpus."""
+        features = self._features(list(texts))
+        n_components = min(self.dim, features.shape[0] - 1, features.shape[1] - 1)
+        self._svd = TruncatedSVD(n_components=n_components, random_state=self.seed).fit(features)
+        return self
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        features = self._features(texts)
+        if self._svd is not None:
+            dense = self._svd.transform(features)
+            if dense.shape[1] < self.dim:
+                dense = np.pad(dense, ((0, 0), (0, self.dim - dense.shape[1])))
+        else:
+            dense = self._projection.transform(features)
+        return np.asarray(dense, dtype=np.float32)
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name: str):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is not installed")
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class EmbeddingService:
+    def __init__(self, embedder, cache_size: int = 8192):
+        self.embedder = embedder
+        self.cache_size = cache_size
+        self._cache = OrderedDict()   # fingerprint -> (dim,) float32
+        self._lock = threading.Lock()
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    def embed_many(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embed texts in batches; returns an (n, dim) float32 matrix of unit rows."""
+        keys = [fingerprint(t) for t in texts]
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vec = self._cache.get(key)
+                if vec is not None:
+                    self._cache.move_to_end(key)
+                    out[i] = vec
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            vectors = _normalize(self.embedder.encode([texts[pos[0]] for _, pos in chunk]))
+            with self._lock:
+                for (key, positions), vec in zip(chunk, vectors):
+                    out[positions] = vec
+                    self._cache[key] = vec
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return out
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        a, b = self.embed_many([text_a, text_b])
+        return float(np.dot(a, b))
+
+
+# ── Quantization + search helpers ────────────────────────────────────────────
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns (codes, scales)."""
+    matrix = np.atleast_2d(matrix).astype(np.float32, copy=False)
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def cosine_top_k(query: np.ndarray, matrix: np.ndarray, k: int = 10,
+                 scales: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+    """
+    Top-k rows of `matrix` by cosine similarity to `query` (both unit-normalized).
+    Pass `scales` when `matrix` holds int8 codes from quantize_int8.
+    """
+    if len(matrix) == 0 or k <= 0:
+        return []
+    scores = matrix @ query if scales is None else (matrix.astype(np.float32) @ query) * scales
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(int(i), float(scores[i])) for i in top]
+
+
+# ── Default service ──────────────────────────────────────────────────────────
+def _build_embedder():
+    if config.EMBEDDINGS_BACKEND == "sentence-transformers" and SentenceTransformer is not None:
+        return SentenceTransformerEmbedder(config.EMBEDDINGS_MODEL)
+    if config.EMBEDDINGS_SVD_PATH:
+        try:
+            return joblib.load(config.EMBEDDINGS_SVD_PATH)
+        except FileNotFoundError:
+            pass
+    return HashingEmbedder(dim=config.EMBEDDINGS_DIM)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide service, built on first use (model load is not free)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService(_build_embedder(), cache_size=config.EMBEDDINGS_CACHE_SIZE)
+    return _service
+
+
+def embed_many(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    return get_embedding_service().embed_many(texts, batch_size=batch_size)
+
+
+def main(argv=None):
+    from app.services.tfidf_model import iter_corpus
+
+    parser = argparse.ArgumentParser(description="Fit the hashing embedder's SVD projection")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="learn an SVD projection from a corpus and save it")
+    fit.add_argument("corpus", nargs="+", help=".jsonl files or directories of .txt files")
+    fit.add_argument("--out", default=config.EMBEDDINGS_SVD_PATH)
+    fit.add_argument("--dim", type=int, default=config.EMBEDDINGS_DIM)
+    args = parser.parse_args(argv)
+
+    embedder = HashingEmbedder(dim=args.dim).fit(list(iter_corpus(args.corpus)))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    joblib.dump(embedder, args.out)
+    print(f"Saved {embedder.name} embedder to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
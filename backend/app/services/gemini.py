@@ -1,30 +1,76 @@
 # backend/app/services/gemini.py
-from groq import Groq
 import os
 from dotenv import load_dotenv
+from app.services.llm_cache import response_cache, cache_key
+from app.services.llm_client import achat, chat, get_client
+from app.utils.tracing import record_llm_call, span
 
 # Load .env
 env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
 load_dotenv(dotenv_path=env_path)
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL = "llama-3.3-70b-versatile"
 
-def generate_content(prompt: str) -> str:
-    response = client.chat.completions.create(
-        model=MODEL,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return response.choices[0].message.content
 
-def extract_skills(text, prompt_prefix="Extract all relevant technical and soft skills"):
-    prompt = f"""{prompt_prefix} from the following resume text.
+def __getattr__(name):
+    # `gemini.client` is kept for callers/tests; the pooled client is created on first use
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def generate_content(prompt: str, use_cache: bool = True, site: str = "default") -> str:
+    """
+    Send a prompt to Groq; identical (model, prompt) pairs are served from cache.
+    `site` selects the timeout/retry policy (see llm_client.POLICIES).
+    """
+    key = cache_key(MODEL, prompt)
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            record_llm_call(site, None, "cached")
+            return cached
+
+    with span(f"llm.{site}"):
+        content = chat(prompt, MODEL, site=site)
+    if use_cache:
+        response_cache.set(key, content)
+    return content
+
+
+async def agenerate_content(prompt: str, use_cache: bool = True, site: str = "default") -> str:
+    """Async generate_content: same cache and policies, awaits the Groq call."""
+    key = cache_key(MODEL, prompt)
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            record_llm_call(site, None, "cached")
+            return cached
+
+    with span(f"llm.{site}"):
+        content = await achat(prompt, MODEL, site=site)
+    if use_cache:
+        response_cache.set(key, content)
+    return content
+
+
+def _skills_prompt(text, prompt_prefix):
+    return f"""{prompt_prefix} from the following resume text.
     Include programming languages, frameworks, tools, methodologies, and soft skills.
     Return as a comma-separated list only, no explanation.
 
     Text:
     {text}"""
 
-    result = generate_content(prompt)
+
+def _parse_skills(result: str) -> list:
     skills = result.strip().replace("\n", "").split(",")
     return [s.strip().lower() for s in skills if s.strip()]
+
+
+def extract_skills(text, prompt_prefix="Extract all relevant technical and soft skills"):
+    return _parse_skills(generate_content(_skills_prompt(text, prompt_prefix), site="skills"))
+
+
+async def aextract_skills(text, prompt_prefix="Extract all relevant technical and soft skills"):
+    return _parse_skills(await agenerate_content(_skills_prompt(text, prompt_prefix), site="skills"))
@@ -0,0 +1,333 @@
+"""
+On-disk index of job postings for "which stored jobs fit this resume best".
+
+Layout (JOB_INDEX_DIR):
+  vectors.f32     — memory-mapped float32 matrix, one unit-norm embedding per row
+  jobs.sqlite3    — row -> job id, title, text, tombstone flag, IVF cluster
+  ivf.npy         — IVF centroids (optional, built with build_ivf)
+
+Search paths:
+  exact — one BLAS matrix-vector product over every live row
+  ivf   — score the query against the centroids, then only the rows in the
+          `nprobe` closest clusters (approximate, much less data touched)
+
+Adds are appended (an existing id is overwritten in place), deletes are
+tombstones until `compact()` rewrites the matrix.
+
+Several processes (gunicorn workers) can share one index: rows are
+allocated inside a SQLite write transaction, vectors.f32 is a shared
+mapping, and each process reloads its row count / tombstones / clusters
+whenever SQLite's data_version shows another connection committed. A
+search racing a `compact()` or `build_ivf()` in another process may see
+rows mid-move, so run those maintenance calls off-peak.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app import config
+from app.services.embeddings import get_embedding_service
+from app.services.skill_store import fingerprint
+
+
+class JobIndex:
+    GROWTH_ROWS = 1024
+
+    def __init__(self, directory: str, dim: int, embedding_service=None):
+        self.directory = directory
+        self.dim = dim
+        self._embeddings = embedding_service
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._ivf_path = os.path.join(directory, "ivf.npy")
+
+        self._db = sqlite3.connect(os.path.join(directory, "jobs.sqlite3"),
+                                   check_same_thread=False, isolation_level=None, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " row INTEGER PRIMARY KEY, job_id TEXT UNIQUE NOT NULL, title TEXT,"
+            " job_desc TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0,"
+            " cluster INTEGER NOT NULL DEFAULT -1, added_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        stored_dim = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if stored_dim is None:
+            self._db.execute("INSERT INTO meta VALUES ('dim', ?)", (str(dim),))
+        elif int(stored_dim[0]) != dim:
+            raise ValueError(f"Index at {directory} holds {stored_dim[0]}-d vectors, not {dim}-d")
+
+        self._size = 0
+        self._matrix = None
+        self._capacity = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._clusters = np.zeros(0, dtype=np.int32)
+        self._data_version = None
+        self._open_matrix(self.GROWTH_ROWS)
+        self._sync()
+
+    def _sync(self):
+        """Reload per-process state if another connection committed since (call under the lock)."""
+        version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        (max_row,) = self._db.execute("SELECT COALESCE(MAX(row), -1) FROM jobs").fetchone()
+        self._size = max_row + 1
+        self._open_matrix(self._size)
+        self._alive[:] = False
+        self._clusters[:] = -1
+        for row, deleted, cluster in self._db.execute("SELECT row, deleted, cluster FROM jobs"):
+            self._alive[row] = not deleted
+            self._clusters[row] = cluster
+        self._centroids = np.load(self._ivf_path) if os.path.exists(self._ivf_path) else None
+
+    # ── Storage ──────────────────────────────────────────────────────────────
+    def _open_matrix(self, rows: int):
+        if rows <= self._capacity:
+            return
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        capacity = max(rows, self._capacity * 2)
+        mode = "r+b" if os.path.exists(self._vectors_path) else "w+b"
+        with open(self._vectors_path, mode) as f:
+            # Another process may already have grown the file: map all of it, never shrink it
+            f.seek(0, os.SEEK_END)
+            capacity = max(capacity, f.tell() // (self.dim * 4))
+            if f.tell() < capacity * self.dim * 4:
+                f.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.dim))
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), bool)])
+        self._clusters = np.concatenate(
+            [self._clusters, np.full(capacity - len(self._clusters), -1, np.int32)]
+        )
+        self._capacity = capacity
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        service = self._embeddings or get_embedding_service()
+        return service.embed_many(texts)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return int(self._alive[:self._size].sum())
+
+    # ── Ingest / delete ──────────────────────────────────────────────────────
+    def add(self, jobs: List[Dict]) -> int:
+        """Insert or replace postings: [{id, job_desc, title?}]. Returns rows written."""
+        # Last occurrence wins when the same id appears twice in one batch
+        by_id = {}
+        for job in jobs:
+            if job.get("job_desc"):
+                job_id = job.get("id") or job.get("job_id") or fingerprint(job["job_desc"])[:16]
+                by_id[str(job_id)] = job
+        if not by_id:
+            return 0
+        vectors = self._embed([j["job_desc"] for j in by_id.values()])
+        now = time.time()
+        with self._lock:
+            # Rows are allocated under SQLite's write lock, so two processes
+            # never hand out the same row
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                rows = []
+                for job_id, job in by_id.items():
+                    existing = self._db.execute(
+                        "SELECT row FROM jobs WHERE job_id = ?", (job_id,)
+                    ).fetchone()
+                    if existing:
+                        row = existing[0]
+                    else:
+                        row = self._size
+                        self._size += 1
+                    rows.append((row, job_id, job))
+
+                self._open_matrix(self._size)
+                row_ids = np.array([r for r, _, _ in rows])
+                self._matrix[row_ids] = vectors
+                self._matrix.flush()
+                clusters = self._assign(vectors) if self._centroids is not None else np.full(len(rows), -1)
+                for (row, job_id, job), cluster in zip(rows, clusters):
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO jobs (row, job_id, title, job_desc, deleted, cluster, added_at)"
+                        " VALUES (?, ?, ?, ?, 0, ?, ?)",
+                        (row, job_id, job.get("title", ""), job["job_desc"], int(cluster), now),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                self._data_version = None   # in-memory size may be ahead of the DB: reload
+                raise
+            self._alive[row_ids] = True
+            self._clusters[row_ids] = clusters
+        return len(rows)
+
+    def delete(self, job_ids: List[str]) -> int:
+        with self._lock:
+            self._sync()
+            removed = 0
+            for job_id in job_ids:
+                row = self._db.execute(
+                    "SELECT row FROM jobs WHERE job_id = ? AND deleted = 0", (str(job_id),)
+                ).fetchone()
+                if row:
+                    self._db.execute("UPDATE jobs SET deleted = 1 WHERE row = ?", (row[0],))
+                    self._alive[row[0]] = False
+                    removed += 1
+            return removed
+
+    def compact(self):
+        """Drop tombstoned rows and renumber the matrix densely."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                live = np.flatnonzero(self._alive[:self._size])
+                vectors = np.array(self._matrix[live])
+                records = self._db.execute(
+                    "SELECT row, job_id, title, job_desc, cluster, added_at FROM jobs"
+                    " WHERE deleted = 0 ORDER BY row"
+                ).fetchall()
+                self._db.execute("DELETE FROM jobs")
+                for new_row, (_, job_id, title, job_desc, cluster, added_at) in enumerate(records):
+                    self._db.execute(
+                        "INSERT INTO jobs (row, job_id, title, job_desc, deleted, cluster, added_at)"
+                        " VALUES (?, ?, ?, ?, 0, ?, ?)",
+                        (new_row, job_id, title, job_desc, cluster, added_at),
+                    )
+                self._matrix[:len(live)] = vectors
+                self._matrix[len(live):self._size] = 0
+                self._matrix.flush()
+                self._db.execute("COMMIT")
+            except BaseException:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                self._data_version = None
+                raise
+            clusters = self._clusters[live].copy()
+            self._alive[:] = False
+            self._alive[:len(live)] = True
+            self._clusters[:] = -1
+            self._clusters[:len(live)] = clusters
+            self._size = len(live)
+
+    # ── IVF ──────────────────────────────────────────────────────────────────
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10,
+                  sample_size: int = 50000, seed: int = 0) -> int:
+        """Spherical k-means over (a sample of) the live rows; returns the list count."""
+        with self._lock:
+            self._sync()
+            live = np.flatnonzero(self._alive[:self._size])
+            if len(live) == 0:
+                return 0
+            n_lists = n_lists or max(1, int(np.sqrt(len(live))))
+            n_lists = min(n_lists, len(live))
+            rng = np.random.default_rng(seed)
+            sample = np.array(self._matrix[np.sort(rng.choice(live, min(sample_size, len(live)), replace=False))])
+
+            centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                centroids = (centroids / norms).astype(np.float32)
+
+            self._centroids = centroids
+            np.save(self._ivf_path, centroids)
+            for start in range(0, len(live), 65536):
+                rows = live[start:start + 65536]
+                self._clusters[rows] = self._assign(np.asarray(self._matrix[rows]))
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE jobs SET cluster = ? WHERE row = ?",
+                [(int(self._clusters[r]), int(r)) for r in live],
+            )
+            self._db.execute("COMMIT")
+            return n_lists
+
+    # ── Search ───────────────────────────────────────────────────────────────
+    def search(self, query, k: int = 10, mode: str = "exact", nprobe: int = 8) -> List[Dict]:
+        """Top-k live postings for a query text (or unit vector)."""
+        vector = self._embed([query])[0] if isinstance(query, str) else np.asarray(query, np.float32)
+        # add/compact/_open_matrix replace or rewrite the matrix, flags and row
+        # numbers in place, so scoring and the row -> record lookup both run
+        # under the lock (the embedding above does not need it).
+        with self._lock:
+            self._sync()
+            size = self._size
+            if size == 0 or k <= 0:
+                return []
+
+            if mode == "ivf" and self._centroids is not None:
+                probe = np.argsort(-(self._centroids @ vector))[:max(1, nprobe)]
+                candidates = np.flatnonzero(np.isin(self._clusters[:size], probe) & self._alive[:size])
+                scores = np.asarray(self._matrix[candidates]) @ vector
+            else:
+                candidates = np.flatnonzero(self._alive[:size])
+                scores = (self._matrix[:size] @ vector)[candidates]
+
+            if len(candidates) == 0:
+                return []
+            k = min(k, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return self._records([(int(candidates[i]), float(scores[i])) for i in top])
+
+    def _records(self, hits) -> List[Dict]:
+        if not hits:
+            return []
+        rows = {r: s for r, s in hits}
+        placeholders = ",".join("?" * len(rows))
+        records = {
+            row: (job_id, title, job_desc)
+            for row, job_id, title, job_desc in self._db.execute(
+                f"SELECT row, job_id, title, job_desc FROM jobs WHERE row IN ({placeholders})",
+                list(rows),
+            )
+        }
+        return [
+            {"id": records[r][0], "title": records[r][1], "job_desc": records[r][2],
+             "score": round(s, 6)}
+            for r, s in hits if r in records
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._sync()
+            return {
+                "jobs": len(self),
+                "rows": self._size,
+                "capacity": self._capacity,
+                "dim": self.dim,
+                "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobIndex(config.JOB_INDEX_DIR, get_embedding_service().dim)
+    return _index
@@ -0,0 +1,320 @@
+"""
+Persistent background job queue for slow requests (e.g. tailored resume generation).
+
+Jobs live in SQLite, so they survive restarts and every gunicorn worker
+process can claim from the same queue. Each process runs a small pool of
+daemon worker threads that claim queued jobs atomically, run the handler
+registered for the job's kind, store the result (JSON + optional binary
+artifact) and optionally POST a completion callback.
+
+Lifecycle: queued -> running -> done | failed
+A job whose worker dies or hangs is requeued by requeue_stale(); once it
+has been claimed `max_attempts` times it is marked failed instead.
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# kind -> fn(payload) -> (result dict, artifact bytes or None)
+_handlers: Dict[str, Callable[[dict], Tuple[dict, Optional[bytes]]]] = {}
+
+
+def register_handler(kind: str, fn: Callable[[dict], Tuple[dict, Optional[bytes]]]):
+    _handlers[kind] = fn
+
+
+def check_callback_url(url: str) -> str:
+    """
+    Reject callback URLs that would let a client make the server POST to
+    internal services: https only, and every address the host resolves to
+    must be public unless the host is in JOB_QUEUE_CALLBACK_HOSTS.
+    Raises ValueError; returns the URL unchanged.
+    """
+    parts = urlsplit(url or "")
+    host = (parts.hostname or "").lower()
+    if parts.scheme != "https" or not host:
+        raise ValueError("callback_url must be an https:// URL")
+    if host in config.JOB_QUEUE_CALLBACK_HOSTS:
+        return url
+    if config.JOB_QUEUE_CALLBACK_HOSTS and not config.JOB_QUEUE_CALLBACK_PUBLIC:
+        raise ValueError(f"callback_url host '{host}' is not allowed")
+    try:
+        infos = socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"callback_url host '{host}' does not resolve")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global:
+            raise ValueError(f"callback_url host '{host}' resolves to a non-public address")
+    return url
+
+
+class JobQueue:
+    def __init__(self, path: str, poll_interval: float = 0.5, retention: float = 24 * 3600,
+                 stale_after: float = 600, max_attempts: int = 3):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.stale_after = stale_after
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._workers = []
+        self._stopping = threading.Event()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " status TEXT NOT NULL, result TEXT, artifact BLOB, error TEXT, callback_url TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL, worker TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "attempts" not in columns:   # queue file from before attempts were counted
+            self._db.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at)")
+
+    # ── Producer side ────────────────────────────────────────────────────────
+    def submit(self, kind: str, payload: dict, callback_url: str = None) -> str:
+        if kind not in _handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        if callback_url:
+            check_callback_url(callback_url)
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, kind, payload, status, callback_url, created_at)"
+                " VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(payload), callback_url, time.time()),
+            )
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id: str, with_artifact: bool = False) -> Optional[dict]:
+        columns = "id, kind, status, result, error, created_at, started_at, finished_at"
+        if with_artifact:
+            columns += ", artifact"
+        with self._lock:
+            row = self._db.execute(f"SELECT {columns} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            position = None
+            if row and row[2] == "queued":
+                (position,) = self._db.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (row[5],)
+                ).fetchone()
+        if row is None:
+            return None
+        job = {
+            "job_id": row[0], "kind": row[1], "status": row[2],
+            "result": json.loads(row[3]) if row[3] else None,
+            "error": row[4],
+            "created_at": row[5], "started_at": row[6], "finished_at": row[7],
+        }
+        if position is not None:
+            job["queue_position"] = position
+        if with_artifact:
+            job["artifact"] = row[8]
+        return job
+
+    # ── Consumer side ────────────────────────────────────────────────────────
+    def claim(self, worker: str) -> Optional[Tuple[str, str, dict]]:
+        """Atomically move the oldest queued job to running (safe across processes)."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id, kind, payload FROM jobs WHERE status = 'queued'"
+                    " ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, worker = ?,"
+                        " attempts = attempts + 1 WHERE id = ?",
+                        (time.time(), worker, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _finish(self, job_id: str, status: str, result: dict = None,
+                artifact: bytes = None, error: str = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, artifact = ?, error = ?, finished_at = ?"
+                " WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, artifact, error,
+                 time.time(), job_id),
+            )
+            row = self._db.execute("SELECT callback_url FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        callback_url = row[0] if row else None
+        if callback_url:
+            self._send_callback(callback_url, {"job_id": job_id, "status": status,
+                                               "result": result, "error": error})
+
+    def _send_callback(self, url: str, body: dict):
+        # Checked again at send time: DNS may have changed since submit.
+        # Redirects are not followed, so they cannot point back inside.
+        try:
+            requests.post(check_callback_url(url), json=body,
+                          timeout=config.JOB_QUEUE_CALLBACK_TIMEOUT, allow_redirects=False)
+        except (requests.RequestException, ValueError):
+            pass  # callbacks are best-effort; clients can still poll
+
+    def run_one(self, worker: str = "inline") -> bool:
+        """Claim and execute a single job. Returns False when the queue is empty."""
+        claimed = self.claim(worker)
+        if claimed is None:
+            return False
+        job_id, kind, payload = claimed
+        try:
+            result, artifact = _handlers[kind](payload)
+            self._finish(job_id, "done", result=result, artifact=artifact)
+        except Exception as e:
+            self._finish(job_id, "failed", error=str(e))
+        return True
+
+    def _worker_loop(self, name: str):
+        last_maintenance = 0.0
+        while not self._stopping.is_set():
+            try:
+                if time.time() - last_maintenance > 60:
+                    last_maintenance = time.time()
+                    self.requeue_stale()
+                    self.purge()
+                if self.run_one(name):
+                    continue
+            except Exception:
+                # e.g. "database is locked": keep the worker alive and retry after a pause
+                logger.exception("job queue worker %s: iteration failed", name)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self, workers: int):
+        """Start worker threads once per process."""
+        with self._lock:
+            if self._workers or workers <= 0:
+                return
+            prefix = f"{os.getpid()}-"
+            for i in range(workers):
+                t = threading.Thread(target=self._worker_loop, args=(prefix + str(i),),
+                                     name=f"job-queue-{i}", daemon=True)
+                t.start()
+                self._workers.append(t)
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        for t in self._workers:
+            t.join(timeout=5)
+        self._workers = []
+        self._stopping.clear()
+
+    # ── Maintenance ──────────────────────────────────────────────────────────
+    def requeue_stale(self):
+        """
+        Jobs left 'running' by a crashed or hung worker go back to the queue,
+        unless they have used up max_attempts claims: those are marked failed.
+        """
+        cutoff, now = time.time() - self.stale_after, time.time()
+        error = f"worker died or timed out {self.max_attempts} times"
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                failed = self._db.execute(
+                    "SELECT id, callback_url FROM jobs"
+                    " WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+                    (cutoff, self.max_attempts),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    [(error, now, job_id) for job_id, _ in failed],
+                )
+                self._db.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, worker = NULL"
+                    " WHERE status = 'running' AND started_at < ?",
+                    (cutoff,),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        for job_id, callback_url in failed:
+            if callback_url:
+                self._send_callback(callback_url, {"job_id": job_id, "status": "failed",
+                                                   "result": None, "error": error})
+
+    def purge(self):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (time.time() - self.retention,),
+            )
+
+    def metrics(self, window: int = 500) -> dict:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+            (oldest,) = self._db.execute(
+                "SELECT MIN(created_at) FROM jobs WHERE status = 'queued'"
+            ).fetchone()
+            recent = self._db.execute(
+                "SELECT started_at - created_at, finished_at - started_at FROM jobs"
+                " WHERE status IN ('done', 'failed') ORDER BY finished_at DESC LIMIT ?",
+                (window,),
+            ).fetchall()
+
+        def _summary(values):
+            if not values:
+                return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+            values = sorted(values)
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+            return {"avg": round(sum(values) / len(values), 3), "p50": round(pick(0.5), 3),
+                    "p95": round(pick(0.95), 3), "max": round(values[-1], 3)}
+
+        return {
+            "queue_depth": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_queued_age_s": round(time.time() - oldest, 3) if oldest else 0.0,
+            "wait_time_s": _summary([w for w, _ in recent if w is not None]),
+            "run_time_s": _summary([r for _, r in recent if r is not None]),
+            "workers": len(self._workers),
+        }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(config.JOB_QUEUE_PATH,
+                                  poll_interval=config.JOB_QUEUE_POLL_INTERVAL,
+                                  retention=config.JOB_QUEUE_RETENTION,
+                                  stale_after=config.JOB_QUEUE_STALE_AFTER,
+                                  max_attempts=config.JOB_QUEUE_MAX_ATTEMPTS)
+    return _queue
@@ -0,0 +1,177 @@
+"""
+Content-addressed cache for LLM responses.
+
+Responses are keyed by a SHA-256 of (model, prompt) and stored in two tiers:
+  1. In-process LRU (OrderedDict) — microsecond hits within a worker
+  2. On-disk SQLite               — shared across workers and restarts
+
+Both tiers honour a TTL; the memory tier is bounded by entry count and the
+disk tier is trimmed oldest-accessed-first once it grows past its limit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app import config
+
+
+def cache_key(model: str, prompt: str) -> str:
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+class LLMCache:
+    # How many disk writes between size checks on the SQLite tier
+    TRIM_EVERY = 100
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 max_memory_entries: int = 1024, max_disk_entries: int = 50000,
+                 enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.enabled = enabled
+
+        self._memory = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        self._counters = {"hits": 0, "memory_hits": 0, "disk_hits": 0,
+                          "misses": 0, "stores": 0, "evictions": 0}
+
+    # ── SQLite tier ──────────────────────────────────────────────────────────
+    def _conn(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False,
+                                       isolation_level=None, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache(accessed_at)"
+            )
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        db = self._conn()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if now - created_at > self.ttl:
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+
+    def _disk_set(self, key: str, value: str, now: float):
+        db = self._conn()
+        if db is None:
+            return
+        db.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._writes += 1
+        if self._writes % self.TRIM_EVERY == 0:
+            self._trim_disk(now)
+
+    def _trim_disk(self, now: float):
+        db = self._conn()
+        db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        (count,) = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            db.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._counters["evictions"] += overflow
+
+    # ── Memory tier ──────────────────────────────────────────────────────────
+    def _memory_set(self, key: str, value: str, now: float):
+        self._memory[key] = (now + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._memory_set(key, value, now)
+                self._counters["hits"] += 1
+                self._counters["disk_hits"] += 1
+                return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str):
+        if not self.enabled or not value:
+            return
+        now = time.time()
+        with self._lock:
+            self._memory_set(key, value, now)
+            self._disk_set(key, value, now)
+            self._counters["stores"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "enabled": self.enabled,
+            }
+
+
+response_cache = LLMCache(
+    path=config.LLM_CACHE_PATH or None,
+    ttl=config.LLM_CACHE_TTL,
+    max_memory_entries=config.LLM_CACHE_MEMORY_ENTRIES,
+    max_disk_entries=config.LLM_CACHE_DISK_ENTRIES,
+    enabled=config.LLM_CACHE_ENABLED,
+)
@@ -0,0 +1,329 @@
+"""
+Groq chat completions with bounded latency and graceful failure.
+
+Every call goes through `chat`, which applies, in order:
+  - the caller's deadline (app.utils.resilience.deadline / the per-request
+    budget set in run.py): each attempt's timeout is the smaller of the call
+    site's policy timeout and what is left of the budget;
+  - the circuit breaker: after LLM_BREAKER_FAILURES consecutive timeouts,
+    connection errors or 5xx responses, calls fail fast with
+    LLMUnavailableError until a probe succeeds;
+  - a client-side token bucket (requests and estimated tokens per minute),
+    so bursts queue locally instead of coming back as 429s;
+  - the process-wide llm_slot concurrency cap;
+  - retries with full-jitter exponential backoff on transient failures,
+    honouring Retry-After, never sleeping past the deadline.
+
+Failures surface as LLMError subclasses carrying an HTTP status for routes
+to return (429 / 503 / 504, or 502 for other upstream errors). Latency,
+outcome and token usage per call site go to the tracing metrics.
+
+The Groq client is created on first use and shares one pooled httpx client
+(keep-alive connections, LLM_POOL_* settings); the SDK's own retries are
+disabled in favour of the policy here.
+
+`achat` is the asyncio twin for ASGI / async workers: one AsyncGroq client
+per event loop, up to LLM_ASYNC_MAX_CONCURRENCY calls in flight per loop.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+import weakref
+from typing import NamedTuple, Optional
+
+import groq
+import httpx
+from groq import AsyncGroq, Groq
+
+from app import config
+from app.utils.concurrency import llm_slot
+from app.utils.resilience import CircuitBreaker, TokenBucket, remaining
+from app.utils.tracing import record_llm_call
+
+MIN_ATTEMPT_SECONDS = 0.25          # don't start an attempt with less budget than this
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(RuntimeError):
+    status_code = 502
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict:
+        if not self.retry_after:
+            return {}
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class LLMTimeoutError(LLMError):
+    status_code = 504
+
+
+class LLMRateLimitError(LLMError):
+    status_code = 429
+
+
+class LLMUnavailableError(LLMError):
+    status_code = 503
+
+
+# ── Per-call-site policies ───────────────────────────────────────────────────
+class CallPolicy(NamedTuple):
+    timeout: float          # seconds per attempt
+    max_retries: int
+    backoff_base: float
+    backoff_max: float
+
+
+def _load_policies() -> dict:
+    base = CallPolicy(config.LLM_TIMEOUT, config.LLM_MAX_RETRIES,
+                      config.LLM_BACKOFF_BASE, config.LLM_BACKOFF_MAX)
+    policies = {
+        "default": base,
+        "skills": base._replace(timeout=min(base.timeout, 15.0)),       # short list output
+        "structure": base._replace(timeout=max(base.timeout, 45.0)),    # long JSON output
+        "analysis": base,
+        "tailor": base._replace(max_retries=min(base.max_retries, 1)),  # last stage, little budget left
+    }
+    overrides = json.loads(config.LLM_POLICIES) if config.LLM_POLICIES else {}
+    for site, fields in overrides.items():
+        policies[site] = policies.get(site, base)._replace(**fields)
+    return policies
+
+
+POLICIES = _load_policies()
+
+
+def policy_for(site: str) -> CallPolicy:
+    return POLICIES.get(site, POLICIES["default"])
+
+
+# ── Shared state ─────────────────────────────────────────────────────────────
+breaker = CircuitBreaker(config.LLM_BREAKER_FAILURES, config.LLM_BREAKER_RESET)
+_request_bucket = (TokenBucket(config.LLM_RATE_RPM / 60, config.LLM_RATE_RPM)
+                   if config.LLM_RATE_RPM > 0 else None)
+_token_bucket = (TokenBucket(config.LLM_RATE_TPM / 60, config.LLM_RATE_TPM)
+                 if config.LLM_RATE_TPM > 0 else None)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Groq:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                timeout = httpx.Timeout(config.LLM_TIMEOUT, connect=config.LLM_CONNECT_TIMEOUT)
+                http_client = httpx.Client(
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=config.LLM_POOL_CONNECTIONS,
+                        max_keepalive_connections=config.LLM_POOL_KEEPALIVE,
+                        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+                    ),
+                )
+                _client = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client,
+                               base_url=config.GROQ_BASE_URL or None, timeout=timeout,
+                               max_retries=0)
+    return _client
+
+
+# ── Call path ────────────────────────────────────────────────────────────────
+def _estimate_tokens(prompt: str) -> int:
+    return len(prompt) // 4 + 1   # ~4 characters per token for English text
+
+
+def _reserve_quota(prompt: str, budget: Optional[float]) -> float:
+    """Take request/token quota; return how long to wait for it (raises if past the budget)."""
+    wait = 0.0
+    for bucket, amount in ((_request_bucket, 1), (_token_bucket, _estimate_tokens(prompt))):
+        if bucket is None:
+            continue
+        needed = bucket.reserve(amount, timeout=budget)
+        if needed is None:
+            raise LLMRateLimitError("LLM rate limit: no capacity left within the time budget",
+                                    retry_after=min(amount, bucket.capacity) / bucket.rate)
+        wait = max(wait, needed)
+    return wait
+
+
+def _retry_after(error: groq.APIStatusError) -> Optional[float]:
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _translate(error: Exception, retry_after: Optional[float]) -> LLMError:
+    if isinstance(error, (groq.APITimeoutError, TimeoutError)):
+        return LLMTimeoutError("LLM request timed out")
+    if isinstance(error, groq.APIConnectionError):
+        return LLMUnavailableError(f"LLM unreachable: {error}")
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return LLMRateLimitError("LLM rate limit exceeded", retry_after=retry_after)
+    if status in RETRYABLE_STATUS:
+        return LLMUnavailableError(f"LLM upstream error ({status})", retry_after=retry_after)
+    return LLMError(f"LLM request failed: {error}")
+
+
+def _start_attempt(site: str) -> Optional[float]:
+    """Check budget and breaker before an attempt; returns the budget left."""
+    budget = remaining()
+    if budget is not None and budget < MIN_ATTEMPT_SECONDS:
+        raise LLMTimeoutError(f"Time budget exhausted before the {site} LLM call")
+    if not breaker.allow():
+        raise LLMUnavailableError("LLM temporarily unavailable (circuit open)",
+                                  retry_after=breaker.retry_after())
+    return budget
+
+
+def _attempt_timeout(policy: CallPolicy) -> float:
+    budget = remaining()
+    return policy.timeout if budget is None else min(policy.timeout, max(budget, MIN_ATTEMPT_SECONDS))
+
+
+def _backoff(error: Exception, attempt: int, policy: CallPolicy) -> float:
+    """Record an upstream failure; return the delay before retrying, or raise LLMError."""
+    status = getattr(error, "status_code", None)
+    retryable = status is None or status in RETRYABLE_STATUS
+    retry_after = _retry_after(error) if status is not None else None
+    if status is None or status >= 500 or status == 408:
+        breaker.record_failure()
+    else:
+        breaker.record_success()   # upstream answered; it is up
+    if not retryable or attempt == policy.max_retries:
+        raise _translate(error, retry_after) from error
+    delay = random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2 ** attempt))
+    delay = max(delay, retry_after or 0)
+    budget = remaining()
+    if budget is not None and delay + MIN_ATTEMPT_SECONDS > budget:
+        raise _translate(error, retry_after) from error
+    return delay
+
+
+def _messages(prompt: str) -> list:
+    return [{"role": "user", "content": prompt}]
+
+
+def chat(prompt: str, model: str, site: str = "default") -> str:
+    """One user-message completion under the `site` policy. Raises LLMError."""
+    start = time.perf_counter()
+    try:
+        response = _chat(prompt, model, site)
+    except LLMError as e:
+        record_llm_call(site, time.perf_counter() - start, type(e).__name__)
+        raise
+    record_llm_call(site, time.perf_counter() - start, "ok", getattr(response, "usage", None))
+    return response.choices[0].message.content
+
+
+def _chat(prompt: str, model: str, site: str):
+    policy = policy_for(site)
+    for attempt in range(policy.max_retries + 1):
+        budget = _start_attempt(site)
+        try:
+            wait = _reserve_quota(prompt, budget)
+            if wait:
+                time.sleep(wait)
+            with llm_slot(timeout=_attempt_timeout(policy)):
+                response = get_client().chat.completions.create(
+                    model=model, messages=_messages(prompt), timeout=_attempt_timeout(policy),
+                )
+        except TimeoutError:   # only llm_slot raises the builtin
+            breaker.release()
+            raise LLMTimeoutError("Timed out waiting for a free LLM slot")
+        except (groq.APIConnectionError, groq.APIStatusError) as e:
+            time.sleep(_backoff(e, attempt, policy))
+            continue
+        except Exception:   # throttled, or not an upstream failure
+            breaker.release()
+            raise
+        breaker.record_success()
+        return response
+
+
+# ── Async call path ──────────────────────────────────────────────────────────
+# httpx.AsyncClient connections and asyncio.Semaphore belong to one event
+# loop, so each running loop gets its own AsyncGroq client and slot pool.
+# Budget, breaker, quota and policies are shared with the sync path.
+_async_state = weakref.WeakKeyDictionary()
+
+
+def _loop_state():
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        timeout = httpx.Timeout(config.LLM_TIMEOUT, connect=config.LLM_CONNECT_TIMEOUT)
+        http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=config.LLM_ASYNC_MAX_CONCURRENCY,
+                max_keepalive_connections=config.LLM_POOL_KEEPALIVE,
+                keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+            ),
+        )
+        client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client,
+                           base_url=config.GROQ_BASE_URL or None, timeout=timeout,
+                           max_retries=0)
+        state = _async_state[loop] = (client, asyncio.Semaphore(max(1, config.LLM_ASYNC_MAX_CONCURRENCY)))
+    return state
+
+
+def get_async_client() -> AsyncGroq:
+    """AsyncGroq client for the running event loop (created on first use)."""
+    return _loop_state()[0]
+
+
+async def achat(prompt: str, model: str, site: str = "default") -> str:
+    """Async `chat`: same policy, deadline, quota and breaker; never blocks the loop."""
+    start = time.perf_counter()
+    try:
+        response = await _achat(prompt, model, site)
+    except LLMError as e:
+        record_llm_call(site, time.perf_counter() - start, type(e).__name__)
+        raise
+    record_llm_call(site, time.perf_counter() - start, "ok", getattr(response, "usage", None))
+    return response.choices[0].message.content
+
+
+async def _achat(prompt: str, model: str, site: str):
+    policy = policy_for(site)
+    client, slots = _loop_state()
+    for attempt in range(policy.max_retries + 1):
+        budget = _start_attempt(site)
+        try:
+            wait = _reserve_quota(prompt, budget)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                await asyncio.wait_for(slots.acquire(), _attempt_timeout(policy))
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError("Timed out waiting for a free LLM slot")
+            try:
+                timeout = _attempt_timeout(policy)
+                # httpx timeouts are per read; wait_for bounds the whole attempt
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(model=model, messages=_messages(prompt),
+                                                   timeout=timeout),
+                    timeout,
+                )
+            finally:
+                slots.release()
+        except (groq.APIConnectionError, groq.APIStatusError, asyncio.TimeoutError) as e:
+            await asyncio.sleep(_backoff(e, attempt, policy))
+            continue
+        except BaseException:   # throttled, cancelled, or not an upstream failure
+            breaker.release()
+            raise
+        breaker.record_success()
+        return response
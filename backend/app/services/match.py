@@ -1,29 +1,22 @@
-from app.services.gemini import generate_content
-from typing import List, Dict
+from app.services.gemini import agenerate_content, generate_content
+from app.services.llm_client import LLMError
+from typing import List, Dict, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import contextvars
+import functools
 import re
 import json
+import time
 from app.services.similarity import similarity_checker
+from app.services.skill_store import skill_store
+from app.services.prompt_budget import chunk_text, fit
+from app import config
+from app.utils.concurrency import run_parallel
+
+# Enhanced Skill Normalization (shared with the local skill extractor)
+from app.services.skill_taxonomy import SKILL_SYNONYMS
 
-# Enhanced Skill Normalization
-SKILL_SYNONYMS = {
-    'aws': 'amazon web services',
-    'gcp': 'google cloud platform',
-    'js': 'javascript',
-    'ts': 'typescript',
-    'next.js': 'react',
-    'flask': 'python',
-    's3': 'aws',
-    'lambda': 'serverless',
-    'ec2': 'aws',
-    'vercel': 'cloud deployment',
-    'render': 'cloud deployment',
-    'scikit-learn': 'machine learning',
-    'tf': 'tensorflow',
-    'tfjs': 'tensorflow',
-    'tensorflow.js': 'tensorflow',  
-    'celery': 'cloud services',     
-    'redis': 'cloud services'       
-}
 # Experience Level Keywords
 SENIOR_KEYWORDS = [
     'senior', 'lead', 'principal', 'architect',
@@ -41,12 +34,16 @@ def detect_experience_level(job_desc: str) -> str:
     jd_lower = job_desc.lower()
     return 'senior' if any(kw in jd_lower for kw in SENIOR_KEYWORDS) else 'junior'
 
-def generate_analysis_prompt(resume_text: str, job_desc: str, industry: str = None) -> str:
+def generate_analysis_prompt(resume_text: str, job_desc: str, industry: str = None,
+                             resume_budget: int = None, job_budget: int = None,
+                             exp_level: str = None) -> str:
     """Enhanced prompt with experience level awareness"""
-    exp_level = detect_experience_level(job_desc)
+    exp_level = exp_level or detect_experience_level(job_desc)
     level_context = f"\nRole Level: {exp_level.capitalize()} position"
     
     industry_context = f"\nIndustry: {industry.capitalize()}" if industry else ""
+    resume_text = fit(resume_text, resume_budget or config.PROMPT_TOKENS_ANALYSIS_RESUME, "resume.match")
+    job_desc = fit(job_desc, job_budget or config.PROMPT_TOKENS_ANALYSIS_JOB, "job")
     
     return f"""
     Analyze resume-job match considering:
@@ -60,16 +57,169 @@ def generate_analysis_prompt(resume_text: str, job_desc: str, industry: str = No
     {industry_context}
 
     Resume:
-    {resume_text[:3500]}
+    {resume_text}
 
     Job Description:
-    {job_desc[:2000]}
+    {job_desc}
 
     Return JSON only (no markdown):
     {{"exact_matches": [{{"job_skill": str, "resume_skill": str}}], "missing_core": [str], "industry_analysis": str}}
     """
 
-def compare_resume_and_job(resume_text: str, job_desc: str, industry: str = None) -> Dict:
+def _default_response() -> dict:
+    """Response shape shared by successful and failed analyses."""
+    return {
+        "analysis_method": "combined (gemini + cosine similarity)",
+        "match_score": 0.0,
+        "matched_skills": [],
+        "missing_core_skills": [],
+        "industry_analysis": "",
+        "experience_level": "junior",
+        "score_breakdown": {
+            "exact_matches": 0,
+            "cosine_similarity": {
+                "overall": 0.0,
+                "skills": 0.0,
+                "contribution": 40
+            }
+        },
+        "version": "1.2"
+    }
+
+
+def analysis_prompts(resume_text: str, job_desc: str, industry: str = None) -> List[str]:
+    """
+    Map step of the chunked analysis: one prompt per (job chunk, resume chunk)
+    pair, at most ANALYSIS_MAX_CHUNKS of them. Documents within their prompt
+    budgets (or CHUNKED_ANALYSIS off) give the single budgeted prompt.
+    """
+    if not config.CHUNKED_ANALYSIS:
+        return [generate_analysis_prompt(resume_text, job_desc, industry)]
+    job_chunks, job_budget = chunk_text(job_desc, config.PROMPT_TOKENS_ANALYSIS_JOB, "job",
+                                        max_chunks=config.ANALYSIS_MAX_CHUNKS)
+    resume_chunks, resume_budget = chunk_text(
+        resume_text, config.PROMPT_TOKENS_ANALYSIS_RESUME, "resume.match",
+        max_chunks=max(1, config.ANALYSIS_MAX_CHUNKS // len(job_chunks)),
+    )
+    if len(job_chunks) == 1 and len(resume_chunks) == 1:
+        return [generate_analysis_prompt(resume_text, job_desc, industry)]
+    exp_level = detect_experience_level(job_desc)   # from the whole posting, not one chunk
+    return [generate_analysis_prompt(resume_chunk, job_chunk, industry,
+                                     resume_budget, job_budget, exp_level)
+            for job_chunk in job_chunks for resume_chunk in resume_chunks]
+
+
+def merge_analyses(partials: List[dict]) -> dict:
+    """
+    Reduce step: union of the chunks' exact_matches (first occurrence per
+    normalized job skill, in prompt order), missing_core minus anything some
+    other chunk matched, and the distinct industry_analysis texts.
+    """
+    matches, matched = [], set()
+    for partial in partials:
+        for match in partial.get("exact_matches") or []:
+            key = normalize_skill(str(match.get("job_skill", ""))) if isinstance(match, dict) else ""
+            if key and key not in matched:
+                matched.add(key)
+                matches.append(match)
+    missing, seen = [], set()
+    for partial in partials:
+        for skill in partial.get("missing_core") or []:
+            key = normalize_skill(str(skill))
+            if key and key not in matched and key not in seen:
+                seen.add(key)
+                missing.append(skill)
+    analyses = []
+    for partial in partials:
+        text = str(partial.get("industry_analysis") or "").strip()
+        if text and text not in analyses:
+            analyses.append(text)
+    return {"exact_matches": matches, "missing_core": missing, "industry_analysis": " ".join(analyses)}
+
+
+def _analysis_stage_names(count: int) -> List[str]:
+    return ["analysis"] if count == 1 else [f"analysis.{i}" for i in range(count)]
+
+
+def _reduce_analyses(responses: List[str], timings: dict) -> dict:
+    """Parse each chunk's response and merge; a single response is used as is."""
+    if len(responses) == 1:
+        return _parse_analysis(responses[0])
+    names = _analysis_stage_names(len(responses))
+    timings["analysis"] = max(timings.get(name, 0.0) for name in names)
+    return merge_analyses([_parse_analysis(r) for r in responses])
+
+
+def _parse_analysis(response_text: str) -> dict:
+    """The LLM's analysis JSON, tolerating surrounding text; empty analysis if unparseable."""
+    try:
+        results = json.loads(response_text)
+    except json.JSONDecodeError:
+        # Fallback parsing if response isn't clean JSON
+        try:
+            start = max(response_text.find('{'), 0)
+            end = max(response_text.rfind('}') + 1, 1)
+            results = json.loads(response_text[start:end])
+        except:
+            results = {
+                "exact_matches": [],
+                "missing_core": [],
+                "industry_analysis": "Analysis unavailable"
+            }
+    return results
+
+
+def _score_analysis(results: dict, similarity_results: dict, timings: dict,
+                    job_desc: str, industry: str, default_response: dict,
+                    chunks: int = 1) -> dict:
+    """Combine the parsed LLM analysis with similarity scores into the match result."""
+    # Step 3: Calculate scores with enhanced logic
+    total_core_skills = len(results.get("exact_matches", [])) + len(results.get("missing_core", []))
+
+    # Base score (60% weight)
+    exact_match_score = 0
+    if total_core_skills > 0:
+        exact_match_score = (len(results.get("exact_matches", [])) / total_core_skills) * 60
+
+    # Similarity score (40% weight)
+    similarity_score = similarity_results["combined_score"] * 40
+
+    # Combined score with junior tech boost
+    combined_score = min(100.0, exact_match_score + similarity_score)
+    if industry and industry.lower() == "tech" and detect_experience_level(job_desc) == "junior":
+        combined_score = min(100.0, combined_score * 1.1)  # 10% boost for junior tech roles
+
+    # Step 4: Prepare matched skills output
+    matched_skills = [
+        f"{m.get('job_skill', '?')} → {m.get('resume_skill', '?')}"
+        for m in results.get("exact_matches", [])
+    ]
+
+    # Step 5: Compile final response
+    return {
+        **default_response,
+        "match_score": round(combined_score, 2),
+        "matched_skills": matched_skills,
+        "missing_core_skills": results.get("missing_core", []),
+        "industry_analysis": results.get("industry_analysis", ""),
+        "experience_level": detect_experience_level(job_desc),
+        "score_breakdown": {
+            "exact_matches": len(results.get("exact_matches", [])),
+            "cosine_similarity": {
+                "overall": round(similarity_results["overall_score"], 4),
+                "skills": round(similarity_results["skill_similarity"], 4),
+                "contribution": 40
+            }
+        },
+        "timings_ms": {**timings, **similarity_results.get("timings_ms", {})},
+        "analysis_chunks": chunks,
+    }
+
+
+def compare_resume_and_job(resume_text: str, job_desc: str, industry: str = None,
+                           resume_skills: List[str] = None, job_skills: List[str] = None,
+                           resume_id: str = None, overall_score: float = None,
+                           similarity_method: str = None) -> Dict:
     """
     Compare a resume against a job description with enhanced matching logic.
     
@@ -77,6 +227,11 @@ def compare_resume_and_job(resume_text: str, job_desc: str, industry: str = None
         resume_text: Text content of the resume
         job_desc: Job description text
         industry: Optional industry context
+        resume_skills: Optional precomputed resume skills (skips that LLM extraction)
+        job_skills: Optional precomputed job skills (skips that LLM extraction)
+        resume_id: Optional fingerprint from /upload that resolves to stored resume skills
+        overall_score: Optional precomputed TF-IDF similarity of the full texts
+        similarity_method: "llm" or "embedding" (defaults to SIMILARITY_METHOD)
         
     Returns:
         Dictionary containing match results with structure:
@@ -88,95 +243,124 @@ def compare_resume_and_job(resume_text: str, job_desc: str, industry: str = None
             "industry_analysis": str,
             "experience_level": str,
             "score_breakdown": Dict,
+            "timings_ms": Dict[str, float],
             "version": str
         }
     """
-    # Initialize default response structure
-    default_response = {
-        "analysis_method": "combined (gemini + cosine similarity)",
-        "match_score": 0.0,
-        "matched_skills": [],
-        "missing_core_skills": [],
-        "industry_analysis": "",
-        "experience_level": "junior",
-        "score_breakdown": {
-            "exact_matches": 0,
-            "cosine_similarity": {
-                "overall": 0.0,
-                "skills": 0.0,
-                "contribution": 40
-            }
-        },
-        "version": "1.2"
+    default_response = _default_response()
+
+    if resume_skills is None and resume_id:
+        resume_skills = skill_store.get(resume_id)
+
+    try:
+        # Step 1: Get structured analysis from Gemini and semantic similarity
+        # in parallel — neither depends on the other's output
+        # (one analysis per chunk pair when the documents exceed their budgets)
+        prompts = analysis_prompts(resume_text, job_desc, industry)
+        names = _analysis_stage_names(len(prompts))
+        tasks = {name: functools.partial(generate_content, prompt, site="analysis")
+                 for name, prompt in zip(names, prompts)}
+        tasks["similarity"] = lambda: similarity_checker.calculate_similarity(
+            resume_text, job_desc, resume_skills=resume_skills, job_skills=job_skills,
+            overall_score=overall_score, method=similarity_method,
+        )
+        stage_results, timings = run_parallel(tasks, max_workers=max(config.PIPELINE_MAX_WORKERS, len(tasks)))
+        results = _reduce_analyses([stage_results[name] for name in names], timings)
+        return _score_analysis(results, stage_results["similarity"], timings,
+                               job_desc, industry, default_response, chunks=len(prompts))
+
+    except LLMError:
+        raise   # rate limit / breaker / deadline: the route answers with its status
+    except Exception as e:
+        return _failed_analysis(default_response, e)
+
+
+def _failed_analysis(default_response: dict, error: Exception) -> dict:
+    return {
+        **default_response,
+        "error": f"Analysis failed: {str(error)}",
+        "industry_analysis": "System error during analysis"
     }
 
+
+async def _timed(name: str, awaitable, timings: dict):
+    start = time.perf_counter()
     try:
-        # Step 1: Get structured analysis from Gemini
-        prompt = generate_analysis_prompt(resume_text, job_desc, industry)
-        response_text = generate_content(prompt)
+        return await awaitable
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
 
-        # Step 2: Parse response with robust error handling
-        try:
-            results = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Fallback parsing if response isn't clean JSON
-            try:
-                start = max(response_text.find('{'), 0)
-                end = max(response_text.rfind('}') + 1, 1)
-                results = json.loads(response_text[start:end])
-            except:
-                results = {
-                    "exact_matches": [],
-                    "missing_core": [],
-                    "industry_analysis": "Analysis unavailable"
-                }
-
-        # Step 3: Calculate semantic similarity
-        similarity_results = similarity_checker.calculate_similarity(resume_text, job_desc)
-        
-        # Step 4: Calculate scores with enhanced logic
-        total_core_skills = len(results.get("exact_matches", [])) + len(results.get("missing_core", []))
-        
-        # Base score (60% weight)
-        exact_match_score = 0
-        if total_core_skills > 0:
-            exact_match_score = (len(results.get("exact_matches", [])) / total_core_skills) * 60
-        
-        # Similarity score (40% weight)
-        similarity_score = similarity_results["combined_score"] * 40
-        
-        # Combined score with junior tech boost
-        combined_score = min(100.0, exact_match_score + similarity_score)
-        if industry and industry.lower() == "tech" and detect_experience_level(job_desc) == "junior":
-            combined_score = min(100.0, combined_score * 1.1)  # 10% boost for junior tech roles
-
-        # Step 5: Prepare matched skills output
-        matched_skills = [
-            f"{m.get('job_skill', '?')} → {m.get('resume_skill', '?')}"
-            for m in results.get("exact_matches", [])
-        ]
-
-        # Step 6: Compile final response
-        return {
-            **default_response,
-            "match_score": round(combined_score, 2),
-            "matched_skills": matched_skills,
-            "missing_core_skills": results.get("missing_core", []),
-            "industry_analysis": results.get("industry_analysis", ""),
-            "experience_level": detect_experience_level(job_desc),
-            "score_breakdown": {
-                "exact_matches": len(results.get("exact_matches", [])),
-                "cosine_similarity": {
-                    "overall": round(similarity_results["overall_score"], 4),
-                    "skills": round(similarity_results["skill_similarity"], 4),
-                    "contribution": 40
-                }
-            }
-        }
 
+async def acompare_resume_and_job(resume_text: str, job_desc: str, industry: str = None,
+                                  resume_skills: List[str] = None, job_skills: List[str] = None,
+                                  resume_id: str = None, overall_score: float = None,
+                                  similarity_method: str = None) -> Dict:
+    """
+    Async compare_resume_and_job (same arguments and result). The LLM analysis
+    is awaited on the event loop; the similarity stage (TF-IDF / embeddings,
+    skill lookups) runs in a worker thread alongside it.
+    """
+    default_response = _default_response()
+
+    if resume_skills is None and resume_id:
+        resume_skills = skill_store.get(resume_id)
+
+    try:
+        prompts = analysis_prompts(resume_text, job_desc, industry)
+        names = _analysis_stage_names(len(prompts))
+        similarity = functools.partial(
+            similarity_checker.calculate_similarity,
+            resume_text, job_desc, resume_skills=resume_skills, job_skills=job_skills,
+            overall_score=overall_score, method=similarity_method,
+        )
+        timings = {}
+        *responses, similarity_results = await asyncio.gather(
+            *(_timed(name, agenerate_content(prompt, site="analysis"), timings)
+              for name, prompt in zip(names, prompts)),
+            _timed("similarity", asyncio.to_thread(similarity), timings),
+        )
+        results = _reduce_analyses(responses, timings)
+        return _score_analysis(results, similarity_results, timings,
+                               job_desc, industry, default_response, chunks=len(prompts))
+
+    except LLMError:
+        raise   # rate limit / breaker / deadline: the route answers with its status
     except Exception as e:
-        return {
-            **default_response,
-            "error": f"Analysis failed: {str(e)}",
-            "industry_analysis": "System error during analysis"
-        }
\ No newline at end of file
+        return _failed_analysis(default_response, e)
+
+
+def compare_resume_to_jobs(resume_text: str, job_descs: List[str], industry: str = None,
+                           resume_skills: List[str] = None, resume_id: str = None,
+                           max_workers: int = None,
+                           similarity_method: str = None) -> Iterator[Tuple[int, Dict]]:
+    """
+    Match one resume against many job descriptions.
+
+    TF-IDF scores for every posting come from a single sparse product, the
+    resume's skills are resolved once up front, and the per-job LLM analyses
+    run on a bounded pool. Yields (index, result) in completion order.
+    """
+    if resume_skills is None and resume_id:
+        resume_skills = skill_store.get(resume_id)
+    if resume_skills is None and (similarity_method or config.SIMILARITY_METHOD) == "llm":
+        resume_skills = similarity_checker.skills_for(resume_text)
+
+    tfidf_scores = similarity_checker.batch_tfidf_similarity(resume_text, job_descs)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers or config.BATCH_MAX_CONCURRENCY))
+    try:
+        # Each job runs in a copy of the caller's context (deadline, trace collector)
+        futures = {
+            pool.submit(
+                contextvars.copy_context().run,
+                compare_resume_and_job, resume_text, job, industry,
+                resume_skills=resume_skills, overall_score=tfidf_scores[i],
+                similarity_method=similarity_method,
+            ): i
+            for i, job in enumerate(job_descs)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Stop queued work if the consumer goes away mid-stream
+        pool.shutdown(wait=False, cancel_futures=True)
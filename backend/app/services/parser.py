@@ -1,10 +1,173 @@
 # backend/app/services/parser.py
+"""
+PDF -> plain text.
+
+Uploads are read in chunks: small ones stay in memory, anything past
+PDF_SPOOL_BYTES is spooled to a temp file and opened by path, so MuPDF reads
+pages from disk instead of a second in-memory copy. Size and page limits are
+enforced while reading / before extracting. Documents with many pages are
+split into page ranges extracted by worker processes (each opens the same
+file, so an in-memory upload is written to a temp file first).
+
+iter_pdf_pages yields page texts in order as they become available;
+parse_pdf_text joins them.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Iterator, List, Union
+
 import fitz
 
-def parse_pdf_text(file):
-    doc = fitz.open(stream=file.read(),filetype="pdf")
-    text = ""
-    for page in doc:
-        text+= page.get_text()
-    return text.strip()
+from app import config
+from app.utils.tracing import span
+
+CHUNK_BYTES = 256 * 1024
+
+
+class PDFLimitError(ValueError):
+    """The PDF exceeds PDF_MAX_BYTES or PDF_MAX_PAGES."""
+
+
+# ── Input spooling ───────────────────────────────────────────────────────────
+@contextmanager
+def _spooled(file, max_bytes: int):
+    """
+    Yield ("path", path) or ("stream", bytes) for a path, bytes or file-like
+    object, reading the latter in chunks and spilling to a temp file once it
+    outgrows PDF_SPOOL_BYTES.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        if os.path.getsize(file) > max_bytes:
+            raise PDFLimitError(f"PDF is larger than {max_bytes} bytes")
+        yield "path", os.fspath(file)
+        return
+    if isinstance(file, (bytes, bytearray)):
+        file = BytesIO(file)
+
+    buffer, size, spool = BytesIO(), 0, None
+    try:
+        while True:
+            chunk = file.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise PDFLimitError(f"PDF is larger than {max_bytes} bytes")
+            if spool is None and size > config.PDF_SPOOL_BYTES:
+                spool = tempfile.NamedTemporaryFile(prefix="lumascan-", suffix=".pdf", delete=False)
+                spool.write(buffer.getvalue())
+                buffer = None
+            (spool or buffer).write(chunk)
+        if spool is None:
+            yield "stream", buffer.getvalue()
+        else:
+            spool.close()
+            yield "path", spool.name
+    finally:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+
+
+@contextmanager
+def _on_disk(kind: str, source):
+    """A path for `source`: worker processes open the file themselves."""
+    if kind == "path":
+        yield source
+        return
+    with tempfile.NamedTemporaryFile(prefix="lumascan-", suffix=".pdf", delete=False) as spool:
+        spool.write(source)
+    try:
+        yield spool.name
+    finally:
+        os.unlink(spool.name)
+
+
+def _open(kind: str, source):
+    return fitz.open(source) if kind == "path" else fitz.open(stream=source, filetype="pdf")
+
+
+# ── Page-parallel extraction ─────────────────────────────────────────────────
+def _extract_range(path: str, start: int, stop: int) -> List[str]:
+    """Worker process: text of pages [start, stop) of the PDF at `path`."""
+    with fitz.open(path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _start_method() -> str:
+    """
+    Never fork: the pool is created lazily from request threads, and a
+    forked child would inherit other threads' locks (logging, the Groq
+    client, SQLite) in whatever state they were in.
+    """
+    available = multiprocessing.get_all_start_methods()
+    if config.PDF_PARSE_START_METHOD in available and config.PDF_PARSE_START_METHOD != "fork":
+        return config.PDF_PARSE_START_METHOD
+    return "forkserver" if "forkserver" in available else "spawn"
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=config.PDF_PARSE_WORKERS,
+                                            mp_context=multiprocessing.get_context(_start_method()))
+    return _pool
+
+
+def _reset_pool_after_fork():
+    """A forked server worker (e.g. gunicorn --preload) must build its own pool."""
+    global _pool, _pool_lock
+    _pool, _pool_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def iter_pdf_pages(file: Union[str, bytes, object], max_pages: int = None, max_bytes: int = None,
+                   parallel: bool = True) -> Iterator[str]:
+    """Yield the text of each page, in order."""
+    max_pages = max_pages or config.PDF_MAX_PAGES
+    max_bytes = max_bytes or config.PDF_MAX_BYTES
+    with _spooled(file, max_bytes) as (kind, source):
+        with _open(kind, source) as doc:
+            pages = doc.page_count
+            if pages > max_pages:
+                raise PDFLimitError(f"PDF has {pages} pages (limit {max_pages})")
+
+            # Decided by page count, not size: a small upload can still have many pages
+            use_pool = (parallel and config.PDF_PARSE_WORKERS > 1
+                        and pages >= config.PDF_PARALLEL_MIN_PAGES)
+            if not use_pool:
+                for page in doc:
+                    yield page.get_text()
+                return
+
+        workers = config.PDF_PARSE_WORKERS
+        step = max(1, -(-pages // (workers * 2)))   # ~2 ranges per worker
+        with _on_disk(kind, source) as path:
+            futures = [_get_pool().submit(_extract_range, path, start, min(start + step, pages))
+                       for start in range(0, pages, step)]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
 
+@span("pdf.parse")
+def parse_pdf_text(file, parallel: bool = True):
+    return "".join(iter_pdf_pages(file, parallel=parallel)).strip()
@@ -0,0 +1,353 @@
+"""
+Fits resumes and job descriptions into a per-prompt token budget by
+content value instead of position (the old `text[:3500]`-style slices).
+
+  count_tokens(text)        — local token estimate, no tokenizer download.
+  split_sections(text, kind) — "resume" / "job" text -> Section list, by
+                               recognised headings (Skills, Experience,
+                               Requirements, Benefits, ...).
+  fit(text, budget, profile) — drops boilerplate (EEO statements, benefits,
+                               street addresses, page footers) and repeated
+                               lines, then packs whole sections in profile
+                               weight order, line by line for the one that
+                               no longer fits. Output keeps document order.
+  chunk_text(text, budget, profile)
+                            — the same cleaned content split into
+                               budget-sized chunks along section lines, for
+                               map-reduce prompts over long documents
+                               (match analysis, structure parsing). A chunk
+                               that continues a section repeats its heading
+                               and the last CHUNK_OVERLAP_TOKENS of it.
+
+Profiles weight sections for what a prompt needs: the match analysis wants
+a resume's skills and experience before its contact header, the structure
+parser wants the header too, and every job prompt wants requirements
+before the company blurb. With PROMPT_BUDGETING off, `fit` is the old head
+truncation at CHARS_PER_TOKEN characters per token.
+"""
+
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app import config
+from app.utils.tracing import PROMPT_TOKENS
+
+VERSION = "3"            # part of the upload extraction version; bump when packing changes
+CHARS_PER_TOKEN = 4      # what the old character caps assumed
+SPLIT_LINE_TOKENS = 80   # longer lines (pasted paragraphs) are split into sentences
+MIN_DEDUP_CHARS = 25     # shorter repeats ("Summer 2024", "Python") are kept
+
+_WORD = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9\"'(•*-])")
+_SPACES = re.compile(r"[ \t\u00a0]+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: short words and punctuation are one token,
+    longer words one per ~6 letters, digit runs one per 3 digits.
+    Errs slightly high against Llama-family tokenizers on English text.
+    """
+    total = 0
+    for piece in _WORD.findall(text or ""):
+        if piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1
+    return total
+
+
+# ── Sections ─────────────────────────────────────────────────────────────────
+class Section(NamedTuple):
+    name: str                 # canonical name ("skills", "requirements", "header", ...)
+    heading: Optional[str]    # the heading line as written, None for the preamble
+    lines: List[str]
+
+
+# canonical name -> (exact heading phrases, roots accepted in CAPS / "Heading:" lines).
+# Order matters for roots: "preferred qualifications" is preferred, not requirements.
+_SECTIONS = {
+    "resume": [
+        ("summary", {"summary", "professional summary", "objective", "career objective", "profile",
+                     "about me", "about"}, ("summary", "objective", "profile")),
+        ("skills", {"skills", "technical skills", "skills and interests",
+                    "technologies", "tech stack", "core competencies", "competencies", "tools",
+                    "additional skills"}, ("skill", "technolog", "competenc")),
+        ("experience", {"experience", "work experience", "professional experience", "employment",
+                        "employment history", "work history", "relevant experience", "internships",
+                        "internship experience"}, ("experience", "employment", "work history", "internship")),
+        ("projects", {"projects", "personal projects", "academic projects", "technical projects",
+                      "selected projects"}, ("project",)),
+        ("education", {"education", "academic background", "education and training"},
+         ("education", "academic")),
+        ("certifications", {"certifications", "certificates", "licenses and certifications", "awards",
+                            "honors", "honors and awards", "achievements", "publications"},
+         ("certif", "award", "honor", "publication")),
+        ("activities", {"activities", "extracurricular activities", "extracurriculars", "leadership",
+                        "leadership and activities", "volunteer", "volunteering", "volunteer experience",
+                        "involvement", "organizations", "interests"},
+         ("activit", "extracurricular", "leadership", "volunteer", "involvement")),
+    ],
+    "job": [
+        ("preferred", {"preferred qualifications", "preferred skills", "nice to have", "nice to haves",
+                       "bonus points", "bonus", "pluses"}, ("prefer", "nice to have", "bonus")),
+        ("requirements", {"requirements", "qualifications", "minimum qualifications",
+                          "basic qualifications", "required qualifications", "what you'll need",
+                          "what you need", "what we're looking for", "who you are", "you have",
+                          "skills", "required skills", "must have", "must haves"},
+         ("requirement", "qualification", "what you'll need", "looking for", "must have")),
+        ("responsibilities", {"responsibilities", "key responsibilities", "what you'll do",
+                              "what you will do", "the role", "about the role", "role overview",
+                              "duties", "your impact", "day to day"},
+         ("responsibilit", "what you'll do", "what you will do", "duties", "the role")),
+        ("company", {"about us", "about the company", "who we are", "our mission", "our story",
+                     "why join us", "the company"}, ("about us", "who we are", "mission", "company")),
+        ("benefits", {"benefits", "perks", "perks and benefits", "what we offer", "compensation",
+                      "salary", "pay", "compensation and benefits", "why you'll love working here"},
+         ("benefit", "perk", "compensation", "salary", "what we offer")),
+        ("eeo", {"equal opportunity", "equal employment opportunity", "eeo statement", "eeo",
+                 "diversity and inclusion"}, ("equal opportunity", "equal employment", "eeo", "diversity")),
+        ("apply", {"how to apply", "application process", "next steps"}, ("how to apply", "application")),
+    ],
+}
+
+# A resume line like "ADDITIONAL SKILLS: a, b" (prepended by the frontend) is a
+# one-line skills section of its own.
+_INLINE_SKILLS = re.compile(r"^\s*ADDITIONAL SKILLS:", re.IGNORECASE)
+
+
+def _heading_name(line: str, kind: str) -> Optional[str]:
+    stripped = line.strip().strip("#*•-_= ").strip()
+    colon = stripped.endswith(":")
+    stripped = stripped.rstrip(":").strip()
+    if not stripped or len(stripped) > 50 or len(stripped.split()) > 6 or stripped[-1] in ".,;":
+        return None
+    phrase = _SPACES.sub(" ", stripped.lower().replace("’", "'").replace("&", "and"))
+    caps = stripped.isupper()
+    for name, exact, _roots in _SECTIONS[kind]:
+        if phrase in exact:
+            return name
+    if caps or colon:
+        for name, _exact, roots in _SECTIONS[kind]:
+            if any(root in phrase for root in roots):
+                return name
+    return None
+
+
+def _split_long(line: str) -> List[str]:
+    """
+    Lines over SPLIT_LINE_TOKENS split at sentence ends, then (unpunctuated
+    paragraphs, PDFs without line breaks) into word runs, so no line is ever
+    too long to pack.
+    """
+    if count_tokens(line) <= SPLIT_LINE_TOKENS:
+        return [line]
+    parts = []
+    for sentence in _SENTENCE_END.split(line):
+        while sentence:
+            head = _truncate(sentence, SPLIT_LINE_TOKENS)
+            parts.append(head)
+            sentence = sentence[len(head):].strip()
+    return parts
+
+
+def _truncate(line: str, tokens: int) -> str:
+    """Longest whole-word prefix of `line` within `tokens` (a cut word if even one is too long)."""
+    end, spent = 0, 0
+    for match in re.finditer(r"\S+", line):
+        spent += count_tokens(match.group())
+        if spent > tokens:
+            break
+        end = match.end()
+    return line[:end] if end else line[:max(1, tokens)]   # >= 1 token per character
+
+
+def split_sections(text: str, kind: str = "resume") -> List[Section]:
+    """Sections in document order; text before the first heading is "header"."""
+    sections = [Section("header", None, [])]
+    for raw in (text or "").splitlines():
+        line = _SPACES.sub(" ", raw).strip()
+        if not line:
+            continue
+        if kind == "resume" and _INLINE_SKILLS.match(line):
+            sections.append(Section("skills", None, [line]))
+            sections.append(Section("header", None, []))
+            continue
+        name = _heading_name(line, kind)
+        if name is not None:
+            sections.append(Section(name, line, []))
+            continue
+        sections[-1].lines.extend(_split_long(line))
+    return [s for s in sections if s.lines or s.heading]
+
+
+# ── Boilerplate ──────────────────────────────────────────────────────────────
+_ADDRESS = re.compile(
+    r"\b\d{1,6}\s+(?:[A-Z][A-Za-z]*\.?\s+){1,4}"
+    r"(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way|Court|Ct|Place|Pl)\b\.?"
+    r"(?:,?\s*(?:Apt|Suite|Ste|Unit|#)\.?\s*\w+)?"
+)
+_DOUBLE_SEPARATOR = re.compile(r"\s*([|•·])(?:\s*[|•·,])+\s*")
+_BOILERPLATE = {
+    "resume": [re.compile(p, re.IGNORECASE) for p in (
+        r"^references (?:are )?available (?:up)?on request",
+        r"^page \d+(?: of \d+)?$",
+    )],
+    "job": [re.compile(p, re.IGNORECASE) for p in (
+        r"equal (?:employment )?opportunity",
+        r"without regard to (?:race|age|sex|gender|religion)",
+        r"reasonable accommodations?",
+        r"affirmative action",
+        r"\be-?verify\b",
+        r"protected (?:veteran|class|characteristic|status)",
+        r"\b(?:medical|dental|vision|health|life) (?:insurance|coverage|plans?|benefits)\b",
+        r"\b401\(?k\)?",
+        r"\bpaid (?:time off|holidays|parental leave)\b|\bunlimited pto\b",
+        r"\b(?:click|hit) (?:the )?apply\b|\bapply now\b|\bsubmit your (?:resume|application)\b",
+        r"\bfollow us on\b",
+        r"^page \d+(?: of \d+)?$",
+    )],
+}
+
+
+def _clean_line(line: str, kind: str) -> str:
+    """The line without boilerplate; "" when nothing worth sending is left."""
+    if any(p.search(line) for p in _BOILERPLATE[kind]):
+        return ""
+    if _ADDRESS.search(line):
+        line = _DOUBLE_SEPARATOR.sub(r" \1 ", _ADDRESS.sub("", line)).strip(" |•·,;-")
+    return line
+
+
+# ── Packing ──────────────────────────────────────────────────────────────────
+# kind, {section: weight}; weight 0 drops the section, unknown names use "other"
+PROFILES: Dict[str, Tuple[str, Dict[str, float]]] = {
+    "resume.match": ("resume", {
+        "skills": 1.0, "experience": 0.9, "projects": 0.8, "certifications": 0.6,
+        "summary": 0.5, "education": 0.5, "other": 0.4, "activities": 0.3, "header": 0.1,
+    }),
+    "resume.structure": ("resume", {
+        "header": 1.0, "skills": 0.95, "experience": 0.9, "education": 0.9, "projects": 0.85,
+        "activities": 0.6, "certifications": 0.6, "other": 0.5, "summary": 0.4,
+    }),
+    "job": ("job", {
+        "requirements": 1.0, "preferred": 0.8, "responsibilities": 0.7, "header": 0.6,
+        "other": 0.5, "company": 0.2, "benefits": 0.0, "eeo": 0.0, "apply": 0.0,
+    }),
+}
+
+
+def _prepare(text: str, kind: str, weights: Dict[str, float]):
+    """Sections worth sending as (weight, heading, [(line, tokens)]), boilerplate and repeats removed."""
+    seen = set()
+    prepared = []
+    for section in split_sections(text, kind):
+        weight = weights.get(section.name, weights.get("other", 0.5))
+        if weight <= 0:
+            continue
+        lines = []
+        for line in section.lines:
+            line = _clean_line(line, kind)
+            if not line:
+                continue
+            key = " ".join(re.findall(r"\w+", line.lower()))
+            if len(key) >= MIN_DEDUP_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append((line, count_tokens(line) + 1))   # +1 for the newline
+        if lines:
+            prepared.append((weight, section.heading, lines))
+    return prepared
+
+
+def fit(text: str, budget: int, profile: str) -> str:
+    """`text` reduced to at most ~`budget` tokens, keeping the highest-value content."""
+    text = text or ""
+    if not config.PROMPT_BUDGETING:
+        return text[:budget * CHARS_PER_TOKEN]
+    kind, weights = PROFILES[profile]
+    prepared = _prepare(text, kind, weights)
+
+    left = budget
+    chosen: Dict[int, List[str]] = {}
+    for index in sorted(range(len(prepared)), key=lambda i: -prepared[i][0]):
+        _weight, heading, lines = prepared[index]
+        heading_cost = count_tokens(heading) + 1 if heading else 0
+        if left <= heading_cost + 1:
+            continue
+        taken, spent = [], heading_cost
+        for line, cost in lines:
+            if spent + cost <= left:
+                taken.append(line)
+                spent += cost
+        if not taken:   # not even one line fits: send the start of the first one
+            taken = [_truncate(lines[0][0], left - heading_cost - 1)]
+            spent += count_tokens(taken[0]) + 1
+        if taken:
+            chosen[index] = taken
+            left -= spent
+
+    out = []
+    for index, (_weight, heading, lines) in enumerate(prepared):
+        if index not in chosen:
+            continue
+        if heading:
+            out.append(heading)
+        out.extend(chosen[index])
+    packed = "\n".join(out)
+    PROMPT_TOKENS.inc(profile, "input", amount=count_tokens(text))
+    PROMPT_TOKENS.inc(profile, "sent", amount=count_tokens(packed))
+    return packed
+
+
+def _pack_chunks(prepared, budget: int, overlap: int) -> List[List[str]]:
+    chunks, current, spent = [], [], 0
+    for _weight, heading, lines in prepared:
+        heading_cost = count_tokens(heading) + 1 if heading else 0
+        in_chunk = []   # (line, cost) of this section already in `current`
+        for line, cost in lines:
+            needs_heading = heading and not in_chunk
+            if current and spent + cost + (heading_cost if needs_heading else 0) > budget:
+                chunks.append(current)
+                tail = []
+                for previous in reversed(in_chunk):
+                    if sum(c for _, c in tail) + previous[1] > overlap:
+                        break
+                    tail.insert(0, previous)
+                current = ([heading] if heading else []) + [t for t, _ in tail]
+                spent = heading_cost + sum(c for _, c in tail)
+                in_chunk = tail
+            elif needs_heading:
+                current.append(heading)
+                spent += heading_cost
+            current.append(line)
+            spent += cost
+            in_chunk.append((line, cost))
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, budget: int, profile: str, max_chunks: int = None,
+               overlap: int = None) -> Tuple[List[str], int]:
+    """
+    Cleaned `text` as chunks of ~`budget` tokens, plus the budget actually
+    used: when more than `max_chunks` would be needed, chunks grow instead
+    so the LLM call count stays bounded. Pass that budget on to `fit` for
+    each chunk to keep it whole. A document that fits is one chunk, and so
+    is every document when PROMPT_BUDGETING is off.
+    """
+    if not config.PROMPT_BUDGETING:
+        return [text or ""], budget
+    kind, weights = PROFILES[profile]
+    prepared = _prepare(text or "", kind, weights)
+    overlap = config.CHUNK_OVERLAP_TOKENS if overlap is None else overlap
+    chunks = _pack_chunks(prepared, budget, min(overlap, budget // 4))
+    while max_chunks and len(chunks) > max_chunks:
+        budget = math.ceil(budget * len(chunks) / max_chunks)
+        chunks = _pack_chunks(prepared, budget, min(overlap, budget // 4))
+    return ["\n".join(chunk) for chunk in chunks] or [""], budget
@@ -0,0 +1,55 @@
+"""
+Cache of rendered resume PDFs keyed by canonicalized resume data.
+
+The key is a SHA-256 over the resume JSON serialized with sorted keys plus
+the template version, so the same content always maps to the same key no
+matter how the client ordered its fields. The key doubles as the ETag for
+/api/resume/render and /api/resume/download, letting clients skip
+re-downloading an unchanged resume entirely.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Tuple
+
+from app import config
+from app.services.resume_pdf import TEMPLATE_VERSION, generate_resume_pdf
+from app.utils.blob_cache import BlobCache
+
+render_cache = BlobCache(
+    directory=config.RENDER_CACHE_DIR or None,
+    max_memory_bytes=config.RENDER_CACHE_MEMORY_BYTES,
+    max_disk_bytes=config.RENDER_CACHE_DISK_BYTES,
+)
+
+# One lock per key in flight, so concurrent identical renders run once
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def render_key(data: dict, summary: str = "") -> str:
+    canonical = json.dumps(
+        {"template": TEMPLATE_VERSION, "data": data, "summary": summary},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def render_pdf_cached(data: dict, summary: str = "") -> Tuple[str, bytes]:
+    """Return (key, pdf_bytes), rendering only on a cache miss."""
+    key = render_key(data, summary)
+    pdf = render_cache.get(key)
+    if pdf is not None:
+        return key, pdf
+
+    with _inflight_lock:
+        lock = _inflight.setdefault(key, threading.Lock())
+    with lock:
+        pdf = render_cache.get(key)
+        if pdf is None:
+            pdf = generate_resume_pdf(data, summary).getvalue()
+            render_cache.put(key, pdf)
+    with _inflight_lock:
+        _inflight.pop(key, None)
+    return key, pdf
@@ -1,6 +1,6 @@
 """
 End-to-end tailored resume pipeline:
-  1. Load resume_data.json
+  1. Load the user's stored resume data (app.services.resume_store)
   2. Ask Groq LLM which projects + skills best match the job description
   3. Reorder / filter content for that specific job
   4. Generate PDF (matching resume.cls style)
@@ -8,27 +8,25 @@ End-to-end tailored resume pipeline:
 """
 
 import json
-import os
 import re
 
-from app.services.gemini import generate_content
+from app import config
+from app.services.gemini import agenerate_content, generate_content
 from app.services.ats_checker import check_ats
-from app.services.resume_pdf import generate_resume_pdf
+from app.services.prompt_budget import fit
+from app.services.render_cache import render_pdf_cached
+from app.services.resume_store import DEFAULT_USER, resume_store
+from app.utils.concurrency import run_stages
+from app.utils.tracing import span
 
-DATA_FILE = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../../resume/resume_data.json")
-)
+def _load_data(user_id: str = DEFAULT_USER) -> dict:
+    stored = resume_store.get(user_id)
+    if stored is None:
+        raise FileNotFoundError(f"no resume data stored for user {user_id!r}")
+    return stored.data
 
 
-def _load_data() -> dict:
-    if not os.path.exists(DATA_FILE):
-        raise FileNotFoundError("resume_data.json not found")
-    with open(DATA_FILE) as f:
-        return json.load(f)
-
-
-def _tailor_with_llm(data: dict, job_desc: str) -> dict:
-    """Ask the LLM to pick and reorder projects/skills for this job."""
+def _tailor_prompt(data: dict, job_desc: str) -> str:
     project_list = "\n".join(
         f"  - {p['title']}: {p.get('keyHighlight', '')}. {'; '.join(p['bullets'][:1])}"
         for p in data["projects"]
@@ -38,12 +36,13 @@ def _tailor_with_llm(data: dict, job_desc: str) -> dict:
         data["skills"].get("frameworks", []) +
         data["skills"].get("tools", [])
     )
+    job_desc = fit(job_desc, config.PROMPT_TOKENS_TAILOR_JOB, "job")
 
-    prompt = f"""You are a professional resume writer and ATS optimization expert.
+    return f"""You are a professional resume writer and ATS optimization expert.
 
 Given this job description:
 ---
-{job_desc[:3000]}
+{job_desc}
 ---
 
 Candidate's available projects:
@@ -64,7 +63,9 @@ Rules:
 - top_languages/top_frameworks/top_tools must be subsets of the provided lists, ordered most-relevant-first
 """
 
-    raw = generate_content(prompt)
+
+def _apply_tailoring(data: dict, raw: str) -> dict:
+    """Reorder projects/skills as the LLM response says; unparseable responses keep `data`."""
     raw = re.sub(r"```json|```", "", raw).strip()
 
     try:
@@ -120,6 +121,15 @@ Rules:
     return tailored
 
 
+def _tailor_with_llm(data: dict, job_desc: str) -> dict:
+    """Ask the LLM to pick and reorder projects/skills for this job."""
+    return _apply_tailoring(data, generate_content(_tailor_prompt(data, job_desc), site="tailor"))
+
+
+async def _atailor_with_llm(data: dict, job_desc: str) -> dict:
+    return _apply_tailoring(data, await agenerate_content(_tailor_prompt(data, job_desc), site="tailor"))
+
+
 def _build_plain_text(data: dict) -> str:
     lines = [
         data["personal"]["name"],
@@ -147,42 +157,74 @@ def _build_plain_text(data: dict) -> str:
 
 
 def run_pipeline(resume_text: str, job_desc: str, industry: str = "",
-                  user_data: dict = None) -> dict:
+                  user_data: dict = None, user_id: str = DEFAULT_USER) -> dict:
+    """
+    Stages run on a dependency-aware executor:
+
+        match ──────────────┐
+                            ├──> ats
+        tailor ──> pdf      │
+               └────────────┘
+
+    match (analysis prompt + both skill extractions) and tailor are
+    independent LLM round trips, so they overlap; the process-wide
+    LLM_MAX_CONCURRENCY cap keeps the fan-out within Groq rate limits.
+    """
+    import copy
+    import time
     from app.services.match import compare_resume_and_job
 
-    # 1. Use user-provided data, or fall back to stored resume_data.json
-    data = user_data if user_data else _load_data()
+    started = time.perf_counter()
+
+    # 1. Use user-provided data, or fall back to the user's stored resume
+    data = user_data if user_data else _load_data(user_id)
 
     # 2. Match score
-    match_result = compare_resume_and_job(resume_text, job_desc, industry or None)
+    def _match():
+        return compare_resume_and_job(resume_text, job_desc, industry or None)
 
     # 3. Tailor
-    tailored = _tailor_with_llm(data, job_desc)
+    def _tailor():
+        return _tailor_with_llm(data, job_desc)
 
     # 4. Generate PDF (top 4 projects only)
-    import copy
-    pdf_data = copy.deepcopy(tailored)
-    pdf_data["projects"] = tailored["projects"][:4]
-    pdf_buf = generate_resume_pdf(pdf_data)
+    def _pdf(tailor):
+        pdf_data = copy.deepcopy(tailor)
+        pdf_data["projects"] = tailor["projects"][:4]
+        return pdf_data, render_pdf_cached(pdf_data)[1]
 
     # 5. ATS check
-    plain_text = _build_plain_text(tailored)
-    ats_result = check_ats(
-        plain_text,
-        job_desc,
-        match_result.get("matched_skills", []),
-        match_result.get("missing_core_skills", []),
-        match_result.get("match_score", 0),
-    )
+    def _ats(match, tailor):
+        plain_text = _build_plain_text(tailor)
+        return check_ats(
+            plain_text,
+            job_desc,
+            match.get("matched_skills", []),
+            match.get("missing_core_skills", []),
+            match.get("match_score", 0),
+        )
+
+    results, timings = run_stages({
+        "match": span("pipeline.match")(_match),
+        "tailor": span("pipeline.tailor")(_tailor),
+        "pdf": (span("pipeline.pdf")(_pdf), ["tailor"]),
+        "ats": (span("pipeline.ats")(_ats), ["match", "tailor"]),
+    })
+    match_result = results["match"]
+    tailored = results["tailor"]
+    pdf_data, pdf_bytes = results["pdf"]
 
     # Clean internal keys before returning to frontend
     export_data = copy.deepcopy(pdf_data)
     export_data.pop("_selected_titles", None)
 
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
     return {
-        "pdf_bytes": pdf_buf.read(),
-        "ats_result": ats_result,
+        "pdf_bytes": pdf_bytes,
+        "ats_result": results["ats"],
         "match_result": match_result,
         "selected_projects": tailored.get("_selected_titles", []),
         "tailored_data": export_data,
+        "timings_ms": timings,
     }
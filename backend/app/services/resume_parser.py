@@ -1,15 +1,38 @@
 """
 Parses raw resume text into a structured ResumeEditorData-compatible dict
 using the Groq LLM. Used when a new user uploads their resume.
+
+Resumes longer than PROMPT_TOKENS_STRUCTURE are parsed in chunks
+(prompt_budget.chunk_text) concurrently, and the partial structures are
+merged: first non-empty personal field, skills unioned per category, and
+entries matched on their identifying fields (projects by title, experience
+by company + position, ...) with bullets unioned.
 """
 
+import asyncio
+import functools
 import json
 import re
-from app.services.gemini import generate_content
+from typing import List, Optional, Tuple
 
+from app import config
+from app.services.gemini import agenerate_content, generate_content
+from app.services.prompt_budget import chunk_text, fit
+from app.utils.concurrency import run_parallel
 
-def parse_resume_to_structure(resume_text: str) -> dict:
-    prompt = f"""You are a resume parsing expert. Extract structured data from the resume text below.
+SKILL_CATEGORIES = ("languages", "frameworks", "tools", "databases")
+# Fields identifying the same entry seen in two chunks
+ENTRY_KEYS = {
+    "education": ("degree", "institution"),
+    "projects": ("title",),
+    "experience": ("company", "position"),
+    "activities": ("title",),
+}
+
+
+def _structure_prompt(resume_text: str, budget: int = None) -> str:
+    resume_text = fit(resume_text, budget or config.PROMPT_TOKENS_STRUCTURE, "resume.structure")
+    return f"""You are a resume parsing expert. Extract structured data from the resume text below.
 
 Return ONLY valid JSON (no markdown, no explanation) matching this exact schema:
 {{
@@ -72,10 +95,11 @@ Rules:
 
 Resume text:
 ---
-{resume_text[:4000]}
+{resume_text}
 ---"""
 
-    raw = generate_content(prompt)
+
+def _parse_structure(raw: str) -> dict:
     raw = re.sub(r"```json|```", "", raw).strip()
 
     try:
@@ -89,6 +113,10 @@ Resume text:
         else:
             raise ValueError("Could not parse LLM response as JSON")
 
+    return _with_defaults(data)
+
+
+def _with_defaults(data: dict) -> dict:
     # Ensure all required keys exist with safe defaults
     data.setdefault("personal", {"name": "", "phone": "", "email": "", "linkedin": ""})
     data.setdefault("education", [])
@@ -98,3 +126,115 @@ Resume text:
     data.setdefault("activities", [])
 
     return data
+
+
+def _norm(value) -> str:
+    return " ".join(re.findall(r"\w+", str(value or "").lower()))
+
+
+def _same_entry(a: dict, b: dict, fields) -> bool:
+    """Every identifying field filled in on both sides agrees (and at least one is)."""
+    compared = [(_norm(a.get(f)), _norm(b.get(f))) for f in fields]
+    compared = [(x, y) for x, y in compared if x and y]
+    return bool(compared) and all(x == y for x, y in compared)
+
+
+def _merge_entry(into: dict, entry: dict):
+    for field, value in entry.items():
+        if field == "bullets":
+            bullets = into.setdefault("bullets", [])
+            known = {_norm(b) for b in bullets}
+            for bullet in value or []:
+                if _norm(bullet) and _norm(bullet) not in known:
+                    known.add(_norm(bullet))
+                    bullets.append(bullet)
+        elif value and not into.get(field):
+            into[field] = value
+
+
+def merge_structures(parts: List[dict]) -> dict:
+    """
+    Merge partial structures from consecutive chunks, in chunk order. An
+    entry with none of its identifying fields (bullets that continued past a
+    chunk boundary) is folded into the previous entry of its section.
+    """
+    merged = {"personal": {}, "skills": {c: [] for c in SKILL_CATEGORIES},
+              **{section: [] for section in ENTRY_KEYS}}
+    for part in parts:
+        for field, value in (part.get("personal") or {}).items():
+            if value and not merged["personal"].get(field):
+                merged["personal"][field] = value
+        for category, skills in (part.get("skills") or {}).items():
+            bucket = merged["skills"].setdefault(category, [])
+            known = {_norm(s) for s in bucket}
+            for skill in skills or []:
+                if _norm(skill) and _norm(skill) not in known:
+                    known.add(_norm(skill))
+                    bucket.append(skill)
+        for section, fields in ENTRY_KEYS.items():
+            entries = merged[section]
+            for entry in part.get(section) or []:
+                if not isinstance(entry, dict):
+                    continue
+                if not any(_norm(entry.get(f)) for f in fields):
+                    if entries:
+                        _merge_entry(entries[-1], entry)
+                    continue
+                existing = next((e for e in entries if _same_entry(e, entry, fields)), None)
+                if existing is None:
+                    entries.append(json.loads(json.dumps(entry)))
+                else:
+                    _merge_entry(existing, entry)
+    for field in ("name", "phone", "email", "linkedin"):
+        merged["personal"].setdefault(field, "")
+    return _with_defaults(merged)
+
+
+def _structure_chunks(resume_text: str) -> Tuple[List[str], Optional[int]]:
+    """Chunks for the map-reduce parse, or ([resume_text], None) when it fits one prompt."""
+    if not config.CHUNKED_ANALYSIS:
+        return [resume_text], None
+    chunks, budget = chunk_text(resume_text, config.PROMPT_TOKENS_STRUCTURE, "resume.structure",
+                                max_chunks=config.STRUCTURE_MAX_CHUNKS)
+    return ([resume_text], None) if len(chunks) == 1 else (chunks, budget)
+
+
+def _parse_chunk(chunk: str, budget: Optional[int]) -> dict:
+    return _parse_structure(generate_content(_structure_prompt(chunk, budget), site="structure"))
+
+
+def parse_resume_to_structure(resume_text: str) -> dict:
+    chunks, budget = _structure_chunks(resume_text)
+    if len(chunks) == 1:
+        return _parse_chunk(resume_text, budget)
+    results, _ = run_parallel(
+        {str(i): functools.partial(_parse_chunk, chunk, budget) for i, chunk in enumerate(chunks)},
+        max_workers=len(chunks),
+    )
+    return merge_structures([results[str(i)] for i in range(len(chunks))])
+
+
+async def _aparse_chunk(chunk: str, budget: Optional[int]) -> dict:
+    return _parse_structure(await agenerate_content(_structure_prompt(chunk, budget), site="structure"))
+
+
+async def aparse_resume_to_structure(resume_text: str) -> dict:
+    chunks, budget = _structure_chunks(resume_text)
+    if len(chunks) == 1:
+        return await _aparse_chunk(resume_text, budget)
+    parts = await asyncio.gather(*(_aparse_chunk(chunk, budget) for chunk in chunks))
+    return merge_structures(list(parts))
+
+
+def skills_from_structure(data: dict) -> list:
+    """
+    Flat skill list (lowercased, de-duplicated, in order) from parsed resume
+    data — lets /upload skip the separate extract_skills call.
+    """
+    seen = []
+    for category in SKILL_CATEGORIES:
+        for skill in (data.get("skills") or {}).get(category) or []:
+            skill = str(skill).strip().lower()
+            if skill and skill not in seen:
+                seen.append(skill)
+    return seen
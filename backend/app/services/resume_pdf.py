@@ -19,8 +19,11 @@ Layout reference:
                 bullet list
 """
 
+import copy
+import hashlib
 import json
-import os
+import threading
+from collections import OrderedDict
 from io import BytesIO
 
 from reportlab.lib.pagesizes import letter
@@ -32,9 +35,12 @@ from reportlab.platypus import (
 )
 from reportlab.lib.colors import black, HexColor
 
-DATA_FILE = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../../resume/resume_data.json")
-)
+from app.services.resume_store import DEFAULT_USER, resume_store
+from app.utils.sanitize import sanitize
+from app.utils.tracing import span
+
+# Bump whenever the layout/styling below changes — part of every render cache key
+TEMPLATE_VERSION = "1"
 
 GRAY  = HexColor("#555555")
 LGRAY = HexColor("#aaaaaa")
@@ -42,27 +48,7 @@ LGRAY = HexColor("#aaaaaa")
 # ── Safe text: strip/replace all non-Latin-1 to avoid font glyph gaps ────────
 def _safe(text: str) -> str:
     """Replace problem chars so Helvetica renders them correctly."""
-    replacements = {
-        "–": "-",   # en dash
-        "—": "-",   # em dash
-        "‘": "'",   # left single quote
-        "’": "'",   # right single quote
-        "“": '"',   # left double quote
-        "”": '"',   # right double quote
-        "•": "*",   # bullet
-        " ": " ",   # non-breaking space
-        "--": " - ",     # LaTeX double-dash
-        "\\$": "$",
-        "\\#": "#",
-        "\\%": "%",
-        "&": "&amp;",
-        "<": "&lt;",
-        ">": "&gt;",
-    }
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    # Final safety: drop anything above Latin-1
-    return text.encode("latin-1", errors="replace").decode("latin-1")
+    return sanitize(text)
 
 
 def _bold_safe(text: str) -> str:
@@ -102,25 +88,171 @@ def _styles():
     return name_s, contact_s, section_s, entry_title_s, sub_s, body_s, bullet_s
 
 
+# Built once per process — ParagraphStyle objects are never mutated
+_STYLES = _styles()
+
+
+# ── Memoized flowables ────────────────────────────────────────────────────────
+class _MemoParagraph(Paragraph):
+    """
+    Paragraph whose line breaking is shared by every copy of one prototype.
+    Copies made by _block() share `_wrap_memo`, so an unchanged paragraph is
+    only broken into lines once per available width.
+    """
+    _wrap_memo = None
+
+    def wrap(self, availWidth, availHeight):
+        memo = self._wrap_memo
+        if memo is None:
+            return super().wrap(availWidth, availHeight)
+        hit = memo.get(availWidth)
+        if hit is None:
+            result = super().wrap(availWidth, availHeight)
+            memo[availWidth] = (self.blPara, self.height, self._wrapWidths)
+            return result
+        self.width = availWidth
+        self.blPara, self.height, self._wrapWidths = hit
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        # Splitting can rewrite frags in place — detach from the prototype first
+        self._wrap_memo = None
+        self.frags = copy.deepcopy(self.frags)
+        self.__dict__.pop("blPara", None)
+        return super().split(availWidth, availHeight)
+
+
+def _para(text: str, style) -> Paragraph:
+    p = _MemoParagraph(text, style)
+    p._wrap_memo = {}
+    return p
+
+
+_BLOCK_CACHE_SIZE = 1024
+_block_cache = OrderedDict()   # (kind, content hash) -> [prototype flowables]
+_block_lock = threading.Lock()
+
+
+def _block(kind: str, content, builder) -> list:
+    """
+    Flowables for one block of the resume (header, section title, a single
+    project/job/activity...), memoized by a hash of the block's content.
+    Each call returns fresh shallow copies so layout state is never shared.
+    """
+    digest = hashlib.sha1(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    key = (kind, TEMPLATE_VERSION, digest)
+    with _block_lock:
+        prototypes = _block_cache.get(key)
+        if prototypes is not None:
+            _block_cache.move_to_end(key)
+    if prototypes is None:
+        prototypes = builder(content)
+        with _block_lock:
+            _block_cache[key] = prototypes
+            while len(_block_cache) > _BLOCK_CACHE_SIZE:
+                _block_cache.popitem(last=False)
+    return [copy.copy(f) for f in prototypes]
+
+
+def clear_render_memo():
+    with _block_lock:
+        _block_cache.clear()
+
+
 def _hrule(thick=0.5, before=1, after=3):
     return HRFlowable(width="100%", thickness=thick, color=black,
                       spaceBefore=before, spaceAfter=after)
 
 
 def _section_title(text, s):
-    return Paragraph(_safe(text).upper(), s)
+    return _para(_safe(text).upper(), s)
 
 
 def _two_col(left_html: str, right_text: str, style) -> Paragraph:
     """Bold left, right-aligned date — simulated with wide spacer trick."""
     right = _safe(right_text)
-    return Paragraph(
+    return _para(
         f'{left_html}<font color="#888888">&nbsp;&nbsp;&nbsp;{right}</font>',
         style,
     )
 
 
+# ── Block builders ────────────────────────────────────────────────────────────
+def _header_block(p: dict) -> list:
+    s_name, s_contact = _STYLES[0], _STYLES[1]
+    bullet = "  •  "
+    contact = _safe(p["phone"]) + bullet + _safe(p["email"]) + bullet + _safe(p["linkedin"])
+    return [
+        _para(_safe(p["name"]).upper(), s_name),
+        _hrule(thick=0.8, before=1, after=2),
+        _para(contact, s_contact),
+    ]
+
+
+def _section_block(title: str) -> list:
+    return [_section_title(title, _STYLES[2]), _hrule()]
+
+
+def _education_block(e: dict) -> list:
+    _, _, _, s_etitle, s_sub, s_body, _ = _STYLES
+    return [
+        _two_col(f"<b>{_safe(e['degree'])}</b>", f"Graduating {e['graduation']}", s_etitle),
+        _two_col(_safe(e["institution"]), e["gpa"] + " GPA", s_body),
+        _para(_safe(e.get("college", "")), s_sub),
+        _para(f"<b>Relevant coursework:</b> {_safe(e['coursework'])}", s_body),
+    ]
+
+
+def _skills_block(skills: dict) -> list:
+    s_body = _STYLES[5]
+    skill_rows = [
+        ("Programming Languages", ", ".join(skills.get("languages", []))),
+        ("Frameworks & Libraries", ", ".join(skills.get("frameworks", []))),
+        ("Tools & Technologies",   ", ".join(skills.get("tools", []))),
+        ("Databases",              ", ".join(skills.get("databases", []))),
+    ]
+    return [
+        _para(f"<b>{_safe(cat)}:</b> {_safe(vals)}", s_body)
+        for cat, vals in skill_rows if vals
+    ]
+
+
+def _project_block(proj: dict) -> list:
+    s_etitle, s_sub, s_bullet = _STYLES[3], _STYLES[4], _STYLES[6]
+    return [
+        _two_col(f"<b>{_safe(proj['title'])}</b>", proj["duration"], s_etitle),
+        _para(_safe(proj.get("keyHighlight", "")), s_sub),
+        *[_para(f"- {_safe(b)}", s_bullet) for b in proj["bullets"]],
+    ]
+
+
+def _experience_block(exp: dict) -> list:
+    s_etitle, s_bullet = _STYLES[3], _STYLES[6]
+    left = f"<b>{_safe(exp['company'])}, {_safe(exp['location'])}: {_safe(exp['position'])}</b>"
+    return [
+        _two_col(left, exp["duration"], s_etitle),
+        *[_para(f"- {_safe(b)}", s_bullet) for b in exp["bullets"]],
+    ]
+
+
+def _activity_block(act: dict) -> list:
+    s_etitle, s_sub, s_bullet = _STYLES[3], _STYLES[4], _STYLES[6]
+    story = [_two_col(f"<b>{_safe(act['title'])}</b>", act["duration"], s_etitle)]
+    if act.get("keyHighlight"):
+        story.append(_para(_safe(act["keyHighlight"]), s_sub))
+    story.extend(_para(f"- {_safe(b)}", s_bullet) for b in act["bullets"])
+    return story
+
+
+@span("pdf.render")
 def generate_resume_pdf(data: dict, summary: str = "") -> BytesIO:
+    """
+    Render the resume. The story is assembled from memoized blocks, so an
+    edit to one bullet only re-parses (and re-breaks the lines of) the
+    project/job it belongs to; every other block reuses its flowables.
+    """
     buf = BytesIO()
     doc = SimpleDocTemplate(
         buf, pagesize=letter,
@@ -128,99 +260,43 @@ def generate_resume_pdf(data: dict, summary: str = "") -> BytesIO:
         topMargin=0.4 * inch, bottomMargin=0.4 * inch,
     )
 
-    s_name, s_contact, s_section, s_etitle, s_sub, s_body, s_bullet = _styles()
     story = []
-    p = data["personal"]
 
-    # ── NAME ──────────────────────────────────────────────────────────────────
-    story.append(Paragraph(_safe(p["name"]).upper(), s_name))
-    story.append(_hrule(thick=0.8, before=1, after=2))
-
-    # ── CONTACT ───────────────────────────────────────────────────────────────
-    bullet = "  •  "
-    contact = _safe(p["phone"]) + bullet + _safe(p["email"]) + bullet + _safe(p["linkedin"])
-    story.append(Paragraph(contact, s_contact))
+    # ── NAME + CONTACT ────────────────────────────────────────────────────────
+    story += _block("header", data["personal"], _header_block)
 
     # ── EDUCATION ─────────────────────────────────────────────────────────────
-    story.append(_section_title("Education", s_section))
-    story.append(_hrule())
+    story += _block("section", "Education", _section_block)
     for e in data["education"]:
-        story.append(_two_col(
-            f"<b>{_safe(e['degree'])}</b>",
-            f"Graduating {e['graduation']}",
-            s_etitle,
-        ))
-        story.append(_two_col(
-            _safe(e["institution"]),
-            e["gpa"] + " GPA",
-            s_body,
-        ))
-        story.append(Paragraph(_safe(e.get("college", "")), s_sub))
-        story.append(Paragraph(
-            f"<b>Relevant coursework:</b> {_safe(e['coursework'])}", s_body
-        ))
+        story += _block("education", e, _education_block)
 
     # ── TECHNICAL SKILLS ──────────────────────────────────────────────────────
-    story.append(_section_title("Technical Skills", s_section))
-    story.append(_hrule())
-
-    skill_rows = [
-        ("Programming Languages", ", ".join(data["skills"].get("languages", []))),
-        ("Frameworks & Libraries", ", ".join(data["skills"].get("frameworks", []))),
-        ("Tools & Technologies",   ", ".join(data["skills"].get("tools", []))),
-        ("Databases",              ", ".join(data["skills"].get("databases", []))),
-    ]
-    for cat, vals in skill_rows:
-        if vals:
-            story.append(Paragraph(f"<b>{_safe(cat)}:</b> {_safe(vals)}", s_body))
+    story += _block("section", "Technical Skills", _section_block)
+    story += _block("skills", data["skills"], _skills_block)
 
     # ── TECHNICAL PROJECTS ────────────────────────────────────────────────────
-    story.append(_section_title("Technical Projects", s_section))
-    story.append(_hrule())
-
+    story += _block("section", "Technical Projects", _section_block)
     for proj in data["projects"]:
-        story.append(_two_col(
-            f"<b>{_safe(proj['title'])}</b>",
-            proj["duration"],
-            s_etitle,
-        ))
-        story.append(Paragraph(_safe(proj.get("keyHighlight", "")), s_sub))
-        for b in proj["bullets"]:
-            story.append(Paragraph(f"- {_safe(b)}", s_bullet))
+        story += _block("project", proj, _project_block)
 
     # ── WORK EXPERIENCE ───────────────────────────────────────────────────────
-    story.append(_section_title("Work Experience", s_section))
-    story.append(_hrule())
-
+    story += _block("section", "Work Experience", _section_block)
     for exp in data["experience"]:
-        left = f"<b>{_safe(exp['company'])}, {_safe(exp['location'])}: {_safe(exp['position'])}</b>"
-        story.append(_two_col(left, exp["duration"], s_etitle))
-        for b in exp["bullets"]:
-            story.append(Paragraph(f"- {_safe(b)}", s_bullet))
+        story += _block("experience", exp, _experience_block)
 
     # ── EXTRACURRICULAR ACTIVITIES ────────────────────────────────────────────
-    story.append(_section_title("Extracurricular Activities", s_section))
-    story.append(_hrule())
-
+    story += _block("section", "Extracurricular Activities", _section_block)
     for act in data["activities"]:
-        story.append(_two_col(
-            f"<b>{_safe(act['title'])}</b>",
-            act["duration"],
-            s_etitle,
-        ))
-        if act.get("keyHighlight"):
-            story.append(Paragraph(_safe(act["keyHighlight"]), s_sub))
-        for b in act["bullets"]:
-            story.append(Paragraph(f"- {_safe(b)}", s_bullet))
+        story += _block("activity", act, _activity_block)
 
     doc.build(story)
     buf.seek(0)
     return buf
 
 
-def build_pdf_from_file() -> BytesIO:
-    if not os.path.exists(DATA_FILE):
-        raise FileNotFoundError(f"resume_data.json not found at {DATA_FILE}")
-    with open(DATA_FILE) as f:
-        data = json.load(f)
-    return generate_resume_pdf(data)
+def build_pdf_from_file(user_id: str = DEFAULT_USER) -> BytesIO:
+    """Render the user's stored resume (the name predates the resume store)."""
+    stored = resume_store.get(user_id)
+    if stored is None:
+        raise FileNotFoundError(f"no resume data stored for user {user_id!r}")
+    return generate_resume_pdf(stored.data)
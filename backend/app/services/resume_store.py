@@ -0,0 +1,237 @@
+"""
+Per-user master resume data (what used to be the one shared
+resume/resume_data.json), persisted in SQLite:
+
+  resumes         — user_id -> current version, ETag and data
+  resume_history  — every saved version, newest RESUME_HISTORY_LIMIT kept
+
+Reads go through an in-memory LRU of parsed documents. Saves are atomic
+(one BEGIN IMMEDIATE transaction) and take an optional If-Match: when the
+caller's ETag is no longer current the save fails with VersionConflict
+instead of overwriting someone else's edit. Writes replace the cached
+entry; writes made by other processes are noticed through SQLite's
+data_version and drop the whole cache.
+
+The first read for DEFAULT_USER imports the legacy resume_data.json, if
+present, as version 1.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+from app import config
+
+DEFAULT_USER = "default"
+
+
+class VersionConflict(Exception):
+    """The If-Match ETag is not the stored one (None when nothing is stored)."""
+
+    def __init__(self, current_etag: Optional[str]):
+        super().__init__("resume data was modified by another request")
+        self.current_etag = current_etag
+
+
+class StoredResume(NamedTuple):
+    data: dict
+    version: int
+    etag: str
+    updated_at: float
+
+
+def _canonical(data: dict) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _etag(user_id: str, version: int, body: str) -> str:
+    digest = hashlib.sha256(f"{user_id}\0{version}\0{body}".encode("utf-8")).hexdigest()
+    return f"v{version}-{digest[:16]}"
+
+
+class ResumeStore:
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 256,
+                 history_limit: int = 50, legacy_file: Optional[str] = None):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.history_limit = history_limit
+        self.legacy_file = legacy_file
+        self._memory = OrderedDict()   # user_id -> StoredResume
+        self._data_version = None
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False,
+                                       isolation_level=None, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resumes ("
+                " user_id TEXT PRIMARY KEY, version INTEGER NOT NULL, etag TEXT NOT NULL,"
+                " data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_history ("
+                " user_id TEXT NOT NULL, version INTEGER NOT NULL, etag TEXT NOT NULL,"
+                " data TEXT NOT NULL, saved_at REAL NOT NULL, PRIMARY KEY (user_id, version))"
+            )
+        return self._db
+
+    # ── cache ────────────────────────────────────────────────────────────────
+    def _remember(self, user_id: str, entry: StoredResume):
+        self._memory[user_id] = entry
+        self._memory.move_to_end(user_id)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _sync(self, db):
+        """Drop the cache if another connection (e.g. another worker) committed since.
+        data_version ignores this connection's own commits."""
+        current = db.execute("PRAGMA data_version").fetchone()[0]
+        if current != self._data_version:
+            self._memory.clear()
+            self._data_version = current
+
+    @staticmethod
+    def _copy(entry: StoredResume) -> StoredResume:
+        return entry._replace(data=copy.deepcopy(entry.data))
+
+    # ── reads ────────────────────────────────────────────────────────────────
+    def get(self, user_id: str = DEFAULT_USER) -> Optional[StoredResume]:
+        """Current resume for `user_id` (a private copy), or None."""
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                self._sync(db)
+            entry = self._memory.get(user_id)
+            if entry is not None:
+                self._memory.move_to_end(user_id)
+                return self._copy(entry)
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT data, version, etag, updated_at FROM resumes WHERE user_id = ?", (user_id,),
+            ).fetchone()
+            if row is None:
+                entry = self._import_legacy(db, user_id)
+                if entry is None:
+                    return None
+            else:
+                entry = StoredResume(json.loads(row[0]), row[1], row[2], row[3])
+            self._remember(user_id, entry)
+            return self._copy(entry)
+
+    def history(self, user_id: str = DEFAULT_USER) -> List[dict]:
+        """Saved versions, newest first: [{version, etag, saved_at}]."""
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return []
+            rows = db.execute(
+                "SELECT version, etag, saved_at FROM resume_history WHERE user_id = ?"
+                " ORDER BY version DESC", (user_id,),
+            ).fetchall()
+        return [{"version": v, "etag": e, "saved_at": t} for v, e, t in rows]
+
+    def get_version(self, user_id: str, version: int) -> Optional[StoredResume]:
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT data, version, etag, saved_at FROM resume_history"
+                " WHERE user_id = ? AND version = ?", (user_id, version),
+            ).fetchone()
+        return StoredResume(json.loads(row[0]), row[1], row[2], row[3]) if row else None
+
+    # ── writes ───────────────────────────────────────────────────────────────
+    def save(self, user_id: str, data: dict,
+             if_match: Union[None, str, Iterable[str]] = None) -> StoredResume:
+        """
+        Store `data` as the next version. `if_match` is None (unconditional),
+        "*" (something must be stored) or the ETag(s) the caller last read;
+        otherwise VersionConflict. Saving identical data keeps the current version.
+        """
+        body = _canonical(data)
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                raise RuntimeError("resume store is not configured (RESUME_STORE_PATH)")
+            self._sync(db)
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT version, etag, data, updated_at FROM resumes WHERE user_id = ?", (user_id,),
+                ).fetchone()
+                current_etag = row[1] if row else None
+                if if_match is not None:
+                    expected = {if_match} if isinstance(if_match, str) else set(if_match)
+                    if current_etag is None or ("*" not in expected and current_etag not in expected):
+                        raise VersionConflict(current_etag)
+                if row is not None and row[2] == body:
+                    db.execute("ROLLBACK")
+                    entry = StoredResume(json.loads(body), row[0], row[1], row[3])
+                    self._remember(user_id, entry)
+                    return self._copy(entry)
+                entry = self._write(db, user_id, body, (row[0] if row else 0) + 1, now)
+                db.execute("COMMIT")
+            except BaseException:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                raise
+            self._remember(user_id, entry)
+            return self._copy(entry)
+
+    def _write(self, db, user_id: str, body: str, version: int, now: float) -> StoredResume:
+        etag = _etag(user_id, version, body)
+        db.execute(
+            "INSERT OR REPLACE INTO resumes (user_id, version, etag, data, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)", (user_id, version, etag, body, now),
+        )
+        db.execute(
+            "INSERT OR REPLACE INTO resume_history (user_id, version, etag, data, saved_at)"
+            " VALUES (?, ?, ?, ?, ?)", (user_id, version, etag, body, now),
+        )
+        if self.history_limit > 0:
+            db.execute(
+                "DELETE FROM resume_history WHERE user_id = ? AND version <= ?",
+                (user_id, version - self.history_limit),
+            )
+        return StoredResume(json.loads(body), version, etag, now)
+
+    def _import_legacy(self, db, user_id: str) -> Optional[StoredResume]:
+        """Seed DEFAULT_USER from the old shared resume_data.json (first read only)."""
+        if user_id != DEFAULT_USER or not self.legacy_file or not os.path.exists(self.legacy_file):
+            return None
+        with open(self.legacy_file) as f:
+            body = _canonical(json.load(f))
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT data, version, etag, updated_at FROM resumes WHERE user_id = ?", (user_id,),
+            ).fetchone()
+            if row is not None:   # another process imported it first
+                db.execute("ROLLBACK")
+                return StoredResume(json.loads(row[0]), row[1], row[2], row[3])
+            entry = self._write(db, user_id, body, 1, time.time())
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        return entry
+
+
+resume_store = ResumeStore(config.RESUME_STORE_PATH or None,
+                           max_memory_entries=config.RESUME_CACHE_ENTRIES,
+                           history_limit=config.RESUME_HISTORY_LIMIT,
+                           legacy_file=config.RESUME_LEGACY_FILE or None)
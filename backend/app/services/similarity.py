@@ -1,7 +1,17 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import re
+from typing import List, Optional
 from app.services.gemini import extract_skills
+from app.services.skill_store import skill_store, fingerprint
+from app.services.skill_taxonomy import get_skill_matcher, merge_skills, recall_looks_low
+from app.services.tfidf_model import tfidf_model
+from app.services.embeddings import get_embedding_service
+from app import config
+from app.utils.concurrency import run_parallel
+from app.utils.tracing import span
+
+SIMILARITY_METHODS = ("llm", "embedding")
 
 
 class SimilarityChecker:
@@ -15,16 +25,113 @@ class SimilarityChecker:
     def _tfidf_similarity(self, text_a: str, text_b: str) -> float:
         if not text_a.strip() or not text_b.strip():
             return 0.0
+        # Corpus-fitted model: cached vectors + one dot product
+        if tfidf_model.fitted:
+            score = tfidf_model.similarity(text_a, text_b)
+            if score is not None:
+                return score
+        # No model (or no in-vocabulary terms): fit on just this pair
         vec = TfidfVectorizer().fit_transform([text_a, text_b])
         return float(cosine_similarity(vec[0], vec[1])[0][0])
 
-    def calculate_similarity(self, resume_text: str, job_desc: str) -> dict:
-        overall_score = self._tfidf_similarity(resume_text, job_desc)
+    def batch_tfidf_similarity(self, text: str, others: List[str]) -> List[float]:
+        """
+        Cosine similarity of `text` against every document in `others`, using
+        one vectorizer fit and a single sparse matrix-vector product.
+        """
+        if not text.strip() or not others:
+            return [0.0] * len(others)
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        if tfidf_model.fitted:
+            matrix = tfidf_model.vectors([text] + list(others))
+            scores = (matrix[1:] @ matrix[0].T).toarray().ravel()
+            # Same fallback as _tfidf_similarity: a side with no in-vocabulary
+            # terms gets a fit on just that pair instead of a flat 0.0
+            no_signal = matrix[0].nnz == 0
+            scores = [self._tfidf_similarity(text, other)
+                      if other.strip() and (no_signal or matrix[i + 1].nnz == 0) else score
+                      for i, (score, other) in enumerate(zip(scores, others))]
+        else:
+            matrix = TfidfVectorizer().fit_transform([text] + list(others))
+            scores = (matrix[1:] @ matrix[0].T).toarray().ravel()
+        return [float(s) if other.strip() else 0.0 for s, other in zip(scores, others)]
+
+    @staticmethod
+    def store_key(text: str, mode: Optional[str] = None) -> str:
+        """
+        skill_store key for `text` under an extractor mode. "llm" keeps the bare
+        fingerprint (what /upload stores as resume_id); local/tiered results also
+        carry the mode and taxonomy version, so switching either re-extracts.
+        """
+        mode = mode or config.SKILL_EXTRACTOR
+        key = fingerprint(text)
+        if mode == "llm":
+            return key
+        return f"{key}:{mode}:{get_skill_matcher().version}"
+
+    @span("similarity.skills")
+    def skills_for(self, text: str) -> List[str]:
+        """Skills for a document — from the fingerprint store, else extracted (then stored)."""
+        mode = config.SKILL_EXTRACTOR
+        key = self.store_key(text, mode)
+        skills = skill_store.get(key)
+        if skills is None:
+            skills = self.extract(text, mode)
+            skill_store.put(key, skills)
+        return skills
+
+    def extract(self, text: str, mode: Optional[str] = None) -> List[str]:
+        """Extract skills with config.SKILL_EXTRACTOR ("llm", "local" or "tiered")."""
+        mode = mode or config.SKILL_EXTRACTOR
+        if mode == "llm":
+            return extract_skills(text)
+        matcher = get_skill_matcher()
+        skills, unknown = matcher.scan(text)
+        if mode == "local" or not recall_looks_low(skills, unknown):
+            return skills
+        return merge_skills(skills, extract_skills(text), matcher)
+
+    @span("similarity")
+    def calculate_similarity(self, resume_text: str, job_desc: str,
+                             resume_skills: Optional[List[str]] = None,
+                             job_skills: Optional[List[str]] = None,
+                             overall_score: Optional[float] = None,
+                             method: Optional[str] = None) -> dict:
+        """
+        method="llm" scores skill overlap from extract_skills on both sides;
+        method="embedding" replaces that with a local embedding cosine of the
+        full texts, so no LLM call is made at all.
+        """
+        method = method or config.SIMILARITY_METHOD
+        use_embeddings = method == "embedding"
+
+        # Only the sides without precomputed skills go to the LLM; those that
+        # do are independent calls, so run them side by side
+        tasks = {}
+        if overall_score is None:
+            tasks["tfidf"] = lambda: self._tfidf_similarity(resume_text, job_desc)
+        if use_embeddings:
+            tasks["embedding"] = lambda: get_embedding_service().similarity(resume_text, job_desc)
+        else:
+            if resume_skills is None:
+                tasks["resume_skills"] = lambda: self.skills_for(resume_text)
+            if job_skills is None:
+                tasks["job_skills"] = lambda: self.skills_for(job_desc)
+        results, timings = run_parallel(tasks) if tasks else ({}, {})
+        if overall_score is None:
+            overall_score = results["tfidf"]
+
+        if resume_skills is None:
+            resume_skills = results.get("resume_skills", [])
+        if job_skills is None:
+            job_skills = results.get("job_skills", [])
 
-        resume_skills = self.preprocess_skills(', '.join(extract_skills(resume_text)))
-        job_skills = self.preprocess_skills(', '.join(extract_skills(job_desc)))
+        resume_skills = self.preprocess_skills(', '.join(resume_skills))
+        job_skills = self.preprocess_skills(', '.join(job_skills))
 
-        if not resume_skills or not job_skills:
+        if use_embeddings:
+            skill_similarity = max(0.0, results["embedding"])
+        elif not resume_skills or not job_skills:
             skill_similarity = 0.0
         else:
             skill_similarity = self._tfidf_similarity(
@@ -37,6 +144,10 @@ class SimilarityChecker:
             "overall_score": overall_score,
             "skill_similarity": skill_similarity,
             "combined_score": combined_score,
+            "method": method,
+            "resume_skills": sorted(resume_skills),
+            "job_skills": sorted(job_skills),
+            "timings_ms": timings,
         }
 
 
@@ -0,0 +1,86 @@
+"""
+Stores extracted skill lists by text fingerprint so the same resume is only
+sent to the LLM once. /upload records the resume's skills under its
+fingerprint (returned to the client as resume_id), and every later match
+against that resume resolves its skills from here instead of re-extracting.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from app import config
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(text: str) -> str:
+    """Stable id for a document: SHA-256 of its whitespace-normalized text."""
+    normalized = _WHITESPACE.sub(" ", text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SkillStore:
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 2048):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()   # fingerprint -> [skills]
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False,
+                                       isolation_level=None, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS skills ("
+                " fingerprint TEXT PRIMARY KEY, skills TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _remember(self, key: str, skills: List[str]):
+        self._memory[key] = skills
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        if not key:
+            return None
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return list(self._memory[key])
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute("SELECT skills FROM skills WHERE fingerprint = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            skills = json.loads(row[0])
+            self._remember(key, skills)
+            return list(skills)
+
+    def put(self, key: str, skills: List[str]):
+        skills = list(skills or [])
+        if not key or not skills:
+            return
+        with self._lock:
+            self._remember(key, skills)
+            db = self._conn()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO skills (fingerprint, skills, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(skills), time.time()),
+                )
+
+
+skill_store = SkillStore(config.SKILL_STORE_PATH or None)
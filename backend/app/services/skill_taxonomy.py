@@ -0,0 +1,173 @@
+"""
+Local, deterministic skill extraction from a curated taxonomy.
+
+app/data/skills_taxonomy.json lists canonical skills with their aliases
+(seeded with SKILL_SYNONYMS). Every surface form is tokenized and inserted
+into a token trie; a scan walks the trie from each token and keeps the
+longest match, so "spring boot" wins over "spring" and a resume is matched
+in one pass over its tokens. Words that are also ordinary English ("Go",
+"Rust", "Express") only count in their listed exact spelling.
+
+The scan also reports tech-looking tokens it could not place (CamelCase,
+"*.js", "++"/"#" suffixes). SimilarityChecker uses that to decide, in
+"tiered" mode, whether local recall looks too low and the LLM should be
+consulted as well.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app import config
+
+# Normalizations used when comparing skills; every term here is also a
+# taxonomy entry, so the local extractor recognizes them
+SKILL_SYNONYMS = {
+    'aws': 'amazon web services',
+    'gcp': 'google cloud platform',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'next.js': 'react',
+    'flask': 'python',
+    's3': 'aws',
+    'lambda': 'serverless',
+    'ec2': 'aws',
+    'vercel': 'cloud deployment',
+    'render': 'cloud deployment',
+    'scikit-learn': 'machine learning',
+    'tf': 'tensorflow',
+    'tfjs': 'tensorflow',
+    'tensorflow.js': 'tensorflow',
+    'celery': 'cloud services',
+    'redis': 'cloud services'
+}
+
+# Words with internal "." / "+" / "#", or CamelCase: probably a technology
+_TOKEN = re.compile(r"\.?[\w+#]+(?:[./&'-][\w+#]+)*")
+_TECH_SHAPE = re.compile(
+    r"^(?:[A-Za-z]\w*(?:\+\+|#)|[A-Za-z]\w*\.(?:js|ts|net|io|py)|[a-z]+[A-Z]\w*|[A-Z][a-z]+[A-Z]\w*)$"
+)
+_END = ""   # trie key marking a complete term
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text)
+
+
+class SkillMatcher:
+    def __init__(self, version: str = ""):
+        self._trie: Dict = {}
+        self._terms = 0
+        self.version = version   # changes with the taxonomy file / SKILL_SYNONYMS
+
+    def add(self, surface: str, canonical: str, case_sensitive: bool = False):
+        tokens = tokenize(surface if case_sensitive else surface.lower())
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        # (canonical, exact tokens or None); an exact-case surface never replaces a plain one
+        if not case_sensitive or _END not in node:
+            node[_END] = (canonical, tuple(tokens) if case_sensitive else None)
+            self._terms += 1
+
+    def __len__(self) -> int:
+        return self._terms
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name for a whole skill string (alias or name), if known."""
+        node = self._trie
+        tokens = tokenize(skill)
+        for token in tokens:
+            node = node.get(token.lower())
+            if node is None:
+                return None
+        entry = node.get(_END)
+        if entry is None or (entry[1] is not None and entry[1] != tuple(tokens)):
+            return None
+        return entry[0]
+
+    def scan(self, text: str) -> Tuple[List[str], List[str]]:
+        """(skills found in order of first mention, unmatched tech-looking tokens)."""
+        tokens, spaced, prev_end = [], [], 0
+        for m in _TOKEN.finditer(text):
+            tokens.append(m.group())
+            # A term may only span whitespace: "AWS (EC2" is two skills, not "aws ec2"
+            spaced.append(text[prev_end:m.start()].isspace())
+            prev_end = m.end()
+        lowered = [t.lower() for t in tokens]
+        found, unknown = {}, {}
+        i, n = 0, len(tokens)
+        while i < n:
+            node, best, j = self._trie, None, i
+            while j < n and (j == i or spaced[j]):
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                entry = node.get(_END)
+                if entry is not None and (entry[1] is None or entry[1] == tuple(tokens[i:j])):
+                    best = (entry[0], j)
+            if best:
+                found.setdefault(best[0], None)
+                i = best[1]
+            else:
+                if _TECH_SHAPE.match(tokens[i]):
+                    unknown.setdefault(lowered[i], None)
+                i += 1
+        return list(found), list(unknown)
+
+
+def load_matcher(path: str) -> SkillMatcher:
+    with open(path, "rb") as f:
+        raw = f.read()
+    taxonomy = json.loads(raw)
+    ambiguous = set(taxonomy.get("ambiguous", []))
+    digest = hashlib.sha256(raw + json.dumps(SKILL_SYNONYMS, sort_keys=True).encode("utf-8"))
+    matcher = SkillMatcher(version=digest.hexdigest()[:12])
+    for skill in taxonomy["skills"]:
+        for surface in [skill["name"], *skill.get("aliases", [])]:
+            if surface.lower() not in ambiguous:
+                matcher.add(surface, skill["name"])
+    for surface, canonical in taxonomy.get("case_sensitive", {}).items():
+        matcher.add(surface, canonical, case_sensitive=True)
+    for key, value in SKILL_SYNONYMS.items():
+        for term in (key, value):
+            if term not in ambiguous and matcher.canonical(term) is None:
+                matcher.add(term, term)
+    return matcher
+
+
+def recall_looks_low(skills: List[str], unknown: List[str]) -> bool:
+    """Too few skills found, or too many tech-looking words the taxonomy doesn't know."""
+    if len(skills) < config.SKILL_TIERED_MIN_SKILLS:
+        return True
+    return len(skills) / (len(skills) + len(unknown)) < config.SKILL_TIERED_MIN_COVERAGE
+
+
+def merge_skills(local: List[str], llm: List[str], matcher: "SkillMatcher") -> List[str]:
+    """Local skills first, then LLM-only skills (mapped to canonical names where known)."""
+    merged = dict.fromkeys(local)
+    for skill in llm:
+        merged.setdefault(matcher.canonical(skill) or skill.strip().lower(), None)
+    return [s for s in merged if s]
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = load_matcher(config.SKILL_TAXONOMY_PATH)
+    return _matcher
+
+
+def extract_skills_local(text: str) -> List[str]:
+    return get_skill_matcher().scan(text)[0]
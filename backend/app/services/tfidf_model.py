@@ -0,0 +1,146 @@
+"""
+Corpus-level TF-IDF model shared by every similarity computation.
+
+The vectorizer is fitted offline on a job-description corpus, persisted with
+joblib and loaded once when the service starts, so IDF weights reflect real
+term rarity and scores are stable across requests. Transformed sparse
+vectors are memoized by text fingerprint, which makes a repeat comparison a
+single sparse dot product.
+
+Fit a model from the backend directory:
+    python -m app.services.tfidf_model fit jobs.jsonl [more.jsonl | txt_dir ...]
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app import config
+from app.services.skill_store import fingerprint
+
+
+def fit_vectorizer(texts: Iterable[str], min_df: int = 1, max_df: float = 0.95,
+                   ngram_max: int = 1) -> TfidfVectorizer:
+    vectorizer = TfidfVectorizer(
+        sublinear_tf=True, min_df=min_df, max_df=max_df,
+        ngram_range=(1, ngram_max), dtype=np.float32,
+    )
+    vectorizer.fit(texts)
+    return vectorizer
+
+
+class TfidfModel:
+    def __init__(self, vectorizer: Optional[TfidfVectorizer] = None, cache_size: int = 4096):
+        self.vectorizer = vectorizer
+        self.cache_size = cache_size
+        self._vectors = OrderedDict()   # fingerprint -> 1 x V csr row
+        self._lock = threading.Lock()
+
+    @property
+    def fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    @classmethod
+    def load(cls, path: str, cache_size: int = 4096) -> "TfidfModel":
+        if path and os.path.exists(path):
+            return cls(joblib.load(path), cache_size=cache_size)
+        return cls(None, cache_size=cache_size)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump(self.vectorizer, path)
+
+    def vectors(self, texts: List[str]) -> sp.csr_matrix:
+        """Rows of L2-normalized TF-IDF vectors; only uncached texts are transformed."""
+        keys = [fingerprint(t) for t in texts]
+        rows = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                row = self._vectors.get(key)
+                if row is not None:
+                    self._vectors.move_to_end(key)
+                    rows[i] = row
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            fresh = self.vectorizer.transform([texts[i] for i in first])
+            with self._lock:
+                for j, (key, positions) in enumerate(missing.items()):
+                    row = fresh[j]
+                    for i in positions:
+                        rows[i] = row
+                    self._vectors[key] = row
+                while len(self._vectors) > self.cache_size:
+                    self._vectors.popitem(last=False)
+
+        return sp.vstack(rows, format="csr")
+
+    def similarities(self, text: str, others: List[str]) -> np.ndarray:
+        matrix = self.vectors([text] + list(others))
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+    def similarity(self, text_a: str, text_b: str) -> Optional[float]:
+        """Cosine similarity, or None when either text has no in-vocabulary terms."""
+        matrix = self.vectors([text_a, text_b])
+        if matrix[0].nnz == 0 or matrix[1].nnz == 0:
+            return None
+        return float((matrix[0] @ matrix[1].T).toarray()[0][0])
+
+
+# ── Corpus loading for offline fitting ───────────────────────────────────────
+def iter_corpus(paths: List[str]) -> Iterator[str]:
+    """Yield documents from .jsonl files (job_desc/description/text field) or dirs of .txt."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(glob.glob(os.path.join(path, "**", "*.txt"), recursive=True)):
+                with open(name, encoding="utf-8", errors="ignore") as f:
+                    yield f.read()
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    text = row.get("job_desc") or row.get("description") or row.get("text")
+                    if text:
+                        yield text
+        else:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                yield f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the shared TF-IDF vectorizer")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fit = sub.add_parser("fit", help="fit on a job-description corpus and save it")
+    fit.add_argument("corpus", nargs="+", help=".jsonl files or directories of .txt files")
+    fit.add_argument("--out", default=config.TFIDF_MODEL_PATH)
+    fit.add_argument("--min-df", type=int, default=2)
+    fit.add_argument("--max-df", type=float, default=0.95)
+    fit.add_argument("--ngram-max", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    vectorizer = fit_vectorizer(iter_corpus(args.corpus), min_df=args.min_df,
+                                max_df=args.max_df, ngram_max=args.ngram_max)
+    TfidfModel(vectorizer).save(args.out)
+    print(f"Saved vectorizer with {len(vectorizer.vocabulary_)} terms to {args.out}")
+
+
+# Loaded once per process; unfitted (None) until a model has been trained
+tfidf_model = TfidfModel.load(config.TFIDF_MODEL_PATH, cache_size=config.TFIDF_VECTOR_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    main()
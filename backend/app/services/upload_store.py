@@ -0,0 +1,144 @@
+"""
+Remembers what /upload produced for a resume so re-uploads are instant.
+
+Two lookups, both persistent (SQLite):
+  pdfs     — SHA-256 of the uploaded PDF bytes -> text fingerprint
+             (skips PyMuPDF for a byte-identical re-upload)
+  uploads  — text fingerprint -> resume_text, skills, structured_data
+             (also catches a re-exported PDF with the same text)
+
+Each upload row records the extraction version: a hash of the model name
+and the source of the prompt-building and parsing functions. When either
+changes, the stored LLM output is ignored and regenerated; the PDF -> text
+mapping does not depend on the prompts and stays valid.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app import config
+from app.services import gemini
+from app.services import prompt_budget
+from app.services import resume_parser
+
+CHUNK_BYTES = 256 * 1024
+
+
+def pdf_digest(file) -> str:
+    """SHA-256 of an uploaded file, read in chunks; rewinds the stream afterwards."""
+    digest = hashlib.sha256()
+    start = file.tell()
+    for chunk in iter(lambda: file.read(CHUNK_BYTES), b""):
+        digest.update(chunk)
+    file.seek(start)
+    return digest.hexdigest()
+
+
+_version = None
+
+
+def extraction_version() -> str:
+    """
+    Changes whenever the model, the upload prompts, prompt budgeting or how a
+    long resume is chunked and merged (code or settings) change.
+    """
+    global _version
+    if _version is None:
+        parts = [gemini.MODEL, prompt_budget.VERSION]
+        parts += [f"{name}={getattr(config, name)}" for name in (
+            "PROMPT_BUDGETING", "PROMPT_TOKENS_STRUCTURE", "CHUNKED_ANALYSIS",
+            "STRUCTURE_MAX_CHUNKS", "CHUNK_OVERLAP_TOKENS")]
+        for fn in (gemini._skills_prompt, gemini._parse_skills,
+                   resume_parser._structure_prompt, resume_parser._parse_structure,
+                   resume_parser._structure_chunks, resume_parser.merge_structures,
+                   resume_parser._merge_entry, resume_parser._same_entry,
+                   resume_parser._with_defaults):
+            try:
+                parts.append(inspect.getsource(fn))
+            except (OSError, TypeError):   # no source available (e.g. frozen build)
+                parts.append(fn.__qualname__)
+        _version = hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+    return _version
+
+
+class UploadStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False,
+                                       isolation_level=None, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pdfs ("
+                " pdf_hash TEXT PRIMARY KEY, text_fp TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                " text_fp TEXT PRIMARY KEY, resume_text TEXT NOT NULL, skills TEXT,"
+                " structured_data TEXT, version TEXT, created_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def text_for_pdf(self, pdf_hash: str) -> Optional[str]:
+        """Extracted text of a previously seen PDF (by byte hash), if stored."""
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT u.resume_text FROM pdfs p JOIN uploads u ON u.text_fp = p.text_fp"
+                " WHERE p.pdf_hash = ?", (pdf_hash,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, text_fp: str, version: str) -> Optional[dict]:
+        """Stored LLM results for a text fingerprint, if produced by `version`."""
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT skills, structured_data FROM uploads WHERE text_fp = ? AND version = ?",
+                (text_fp, version),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"skills": json.loads(row[0]), "structured_data": json.loads(row[1])}
+
+    def put(self, text_fp: str, resume_text: str, pdf_hash: str = None, skills=None,
+            structured_data=None, version: str = None):
+        """Record an upload. Without results, only the PDF -> text mapping is refreshed."""
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return
+            db.execute("BEGIN")
+            if skills is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO uploads"
+                    " (text_fp, resume_text, skills, structured_data, version, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (text_fp, resume_text, json.dumps(skills), json.dumps(structured_data),
+                     version, now),
+                )
+            if pdf_hash:
+                db.execute(
+                    "INSERT OR REPLACE INTO pdfs (pdf_hash, text_fp, created_at) VALUES (?, ?, ?)",
+                    (pdf_hash, text_fp, now),
+                )
+            db.execute("COMMIT")
+
+
+upload_store = UploadStore(config.UPLOAD_STORE_PATH or None)
@@ -0,0 +1,138 @@
+# backend/app/utils/blob_cache.py
+"""
+Byte-budgeted LRU for binary blobs (rendered PDFs), with disk spill.
+
+Hot blobs stay in memory up to `max_memory_bytes`; anything evicted from
+memory is written to `directory` (if given), which is itself trimmed
+oldest-first once it passes `max_disk_bytes`. A disk hit is promoted back
+into memory.
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class BlobCache:
+    def __init__(self, directory: Optional[str] = None, max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()   # key -> bytes
+        self._memory_bytes = 0
+        self._disk_bytes = None        # computed lazily on first spill
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "spills": 0}
+
+    # ── Disk tier ────────────────────────────────────────────────────────────
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _disk_usage(self) -> int:
+        if self._disk_bytes is None:
+            total = 0
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    try:
+                        total += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        pass
+            self._disk_bytes = total
+        return self._disk_bytes
+
+    def _spill(self, key: str, data: bytes):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self._disk_bytes = self._disk_usage() + len(data)
+        self._counters["spills"] += 1
+        if self._disk_bytes > self.max_disk_bytes:
+            self._trim_disk()
+
+    def _trim_disk(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)   # LRU order on disk follows mtime
+            return data
+        except OSError:
+            return None
+
+    # ── Memory tier ──────────────────────────────────────────────────────────
+    def _memory_put(self, key: str, data: bytes):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            if self.directory:
+                self._spill(old_key, old_data)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._counters["hits"] += 1
+                self._counters["memory_hits"] += 1
+                return data
+            data = self._disk_get(key)
+            if data is not None:
+                self._memory_put(key, data)
+                self._counters["hits"] += 1
+                self._counters["disk_hits"] += 1
+                return data
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._memory_put(key, data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.directory) and os.path.exists(self._path(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "memory_entries": len(self._memory),
+                    "memory_bytes": self._memory_bytes}
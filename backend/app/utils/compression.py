@@ -0,0 +1,50 @@
+# backend/app/utils/compression.py
+"""
+gzip for JSON responses (resume data, match results, legacy pdf_b64 payloads).
+Streaming and file responses are left alone.
+
+A compressed body is a different representation, so its ETag gets a
+"-gzip" suffix (as Apache does) and Vary: Accept-Encoding is set; routes
+that honour If-None-Match / If-Match compare through identity_etag().
+"""
+
+import gzip
+
+from flask import request
+
+COMPRESSIBLE = {"application/json", "text/plain", "text/html"}
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def identity_etag(etag: str) -> str:
+    """The ETag of the uncompressed body, given one that may carry GZIP_ETAG_SUFFIX."""
+    return etag[:-len(GZIP_ETAG_SUFFIX)] if etag.endswith(GZIP_ETAG_SUFFIX) else etag
+
+
+def init_gzip(app, min_size: int = 1024, level: int = 5):
+    @app.after_request
+    def _gzip_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or response.mimetype not in COMPRESSIBLE
+            or "Content-Encoding" in response.headers
+            or "gzip" not in request.headers.get("Accept-Encoding", "").lower()
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=level))
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Content-Length"] = str(len(response.get_data()))
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    return app
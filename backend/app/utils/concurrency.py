@@ -0,0 +1,100 @@
+# backend/app/utils/concurrency.py
+"""
+Small helpers for running independent pipeline stages concurrently.
+
+  run_stages  — dependency-aware executor: each stage starts as soon as the
+                stages it depends on have finished, and receives their
+                results as keyword arguments.
+  run_parallel — shorthand for a set of stages with no dependencies.
+  llm_slot    — process-wide cap on in-flight LLM requests, so fan-out never
+                exceeds the provider's rate limits no matter how deeply the
+                stages are nested.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Tuple, Union
+
+from app import config
+
+_llm_slots = threading.BoundedSemaphore(max(1, config.LLM_MAX_CONCURRENCY))
+
+
+@contextmanager
+def llm_slot(timeout: float = None):
+    """
+    Hold one of the LLM_MAX_CONCURRENCY slots for the duration of a call.
+    Raises TimeoutError if no slot frees up within `timeout` seconds.
+    """
+    if not _llm_slots.acquire(timeout=timeout):
+        raise TimeoutError("No free LLM slot within the time budget")
+    try:
+        yield
+    finally:
+        _llm_slots.release()
+
+
+StageSpec = Union[Callable, Tuple[Callable, Iterable[str]]]
+
+
+def run_stages(stages: Dict[str, StageSpec], max_workers: int = None) -> Tuple[dict, dict]:
+    """
+    Run a DAG of stages on a thread pool.
+
+    `stages` maps name -> fn or (fn, deps). A stage's fn is called with the
+    results of its deps as keyword arguments. Returns (results, timings_ms).
+    The first exception raised by any stage is re-raised after the pool shuts
+    down; stages that have not started yet are skipped.
+    """
+    specs = {}
+    for name, spec in stages.items():
+        fn, deps = (spec, ()) if callable(spec) else spec
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        specs[name] = (fn, deps)
+
+    results, timings = {}, {}
+    pending = dict(specs)
+    running = {}
+
+    def _timed(name, fn, kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(**kwargs)
+        finally:
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    workers = max_workers or config.PIPELINE_MAX_WORKERS
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(specs) or 1))) as pool:
+        while pending or running:
+            ready = [n for n, (_, deps) in pending.items() if all(d in results for d in deps)]
+            for name in ready:
+                fn, deps = pending.pop(name)
+                kwargs = {d: results[d] for d in deps}
+                # Each stage runs in a copy of the caller's context (request deadline etc.)
+                running[pool.submit(contextvars.copy_context().run, _timed, name, fn, kwargs)] = name
+
+            if not running:
+                raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                results[name] = future.result()
+
+    return results, timings
+
+
+def run_parallel(tasks: Dict[str, Callable], max_workers: int = None) -> Tuple[dict, dict]:
+    """Run independent zero-argument callables concurrently."""
+    return run_stages(dict(tasks), max_workers=max_workers)
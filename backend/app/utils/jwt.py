@@ -1 +1,72 @@
 # Supabase JWT verification
+"""
+Verify the HS256 access tokens Supabase issues to signed-in users (the
+project's JWT secret signs them), using only the standard library.
+
+    claims = verify(token, config.SUPABASE_JWT_SECRET, audience="authenticated")
+    user_id = claims["sub"]
+
+Anything wrong with the token — malformed, another algorithm, a bad
+signature, expired, wrong audience, no subject — raises JWTError.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+
+
+class JWTError(Exception):
+    pass
+
+
+def _b64decode(part: str) -> bytes:
+    return base64.urlsafe_b64decode(part + "=" * (-len(part) % 4))
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def sign(claims: dict, secret: str) -> str:
+    """HS256-sign `claims` (used by tests and local tooling; Supabase signs real tokens)."""
+    header = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64encode(signature)}"
+
+
+def verify(token: str, secret: str, audience: Optional[str] = None, leeway: float = 30) -> dict:
+    """Claims of a valid HS256 token with a `sub`; raises JWTError otherwise."""
+    if not secret:
+        raise JWTError("token verification is not configured")
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        claims = json.loads(_b64decode(payload_b64))
+        signature = _b64decode(signature_b64)
+    except (ValueError, TypeError):
+        raise JWTError("malformed token")
+    if not isinstance(header, dict) or header.get("alg") != "HS256" or not isinstance(claims, dict):
+        raise JWTError("unsupported token")
+
+    expected = hmac.new(secret.encode(), f"{header_b64}.{payload_b64}".encode("ascii"),
+                        hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise JWTError("invalid signature")
+
+    now = time.time()
+    exp, nbf = claims.get("exp"), claims.get("nbf")
+    if not isinstance(exp, (int, float)) or now > exp + leeway:
+        raise JWTError("token expired")
+    if isinstance(nbf, (int, float)) and now < nbf - leeway:
+        raise JWTError("token not yet valid")
+    if audience is not None:
+        aud = claims.get("aud")
+        if audience not in (aud if isinstance(aud, list) else [aud]):
+            raise JWTError("wrong audience")
+    if not isinstance(claims.get("sub"), str) or not claims["sub"]:
+        raise JWTError("token has no subject")
+    return claims
@@ -0,0 +1,171 @@
+# backend/app/utils/resilience.py
+"""
+Building blocks for calling a slow, rate-limited upstream safely.
+
+  deadline      — absolute time budget carried in a contextvar, so every
+                  call made while handling one request shares it (nested
+                  budgets can only shorten it).
+  TokenBucket   — client-side rate limiter; waits for capacity, or fails
+                  fast when the wait would outlive the deadline.
+  CircuitBreaker — stops sending requests after repeated failures and lets
+                  a single probe through once the cool-down has passed.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Limit everything inside the block to `seconds` (None or <= 0: no extra limit)."""
+    if not seconds or seconds <= 0:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when there is no deadline."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def init_request_budget(app, seconds: float):
+    """Give every Flask request a `seconds` budget shared by the calls it makes."""
+    if not seconds or seconds <= 0:
+        return app
+
+    @app.before_request
+    def _start_budget():
+        from flask import g
+        g._deadline_token = _deadline.set(time.monotonic() + seconds)
+
+    @app.teardown_request
+    def _end_budget(exc=None):
+        from flask import g
+        token = g.pop("_deadline_token", None)
+        if token is not None:
+            try:
+                _deadline.reset(token)
+            except ValueError:   # created in a different context (e.g. streamed response)
+                pass
+
+    return app
+
+
+class TokenBucket:
+    """`rate` units per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Take `amount` now (possibly going negative); return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def _refund(self, amount: float):
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def reserve(self, amount: float = 1.0, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Claim `amount` and return the seconds to wait before using it, or None
+        (nothing taken) if that wait exceeds `timeout`. Lets async callers sleep
+        without blocking the loop.
+        """
+        amount = min(amount, self.capacity)
+        wait = self._reserve(amount)
+        if timeout is not None and wait > timeout:
+            self._refund(amount)
+            return None
+        return wait
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until `amount` is available. False (nothing taken) if that exceeds `timeout`."""
+        wait = self.reserve(amount, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """closed -> (failure_threshold consecutive failures) -> open -> (reset_after) -> half-open."""
+
+    def __init__(self, failure_threshold: int, reset_after: float):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """May a request go out now? In half-open state only one probe at a time."""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_after - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self.failure_threshold > 0 and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """A probe ended without telling us anything about upstream health."""
+        with self._lock:
+            self._probing = False
@@ -0,0 +1,62 @@
+# backend/app/utils/sanitize.py
+"""
+Text -> ReportLab Paragraph markup, safe for the built-in Helvetica fonts.
+
+All replacements (smart quotes, dashes, bullets, XML escapes, LaTeX "--"
+and "\\$"-style escapes, anything outside Latin-1) are compiled into a
+single regex and applied in one pass. Results are memoized: the same skill
+names, dates and headings come through on every render.
+
+Equivalent to applying REPLACEMENTS one after another with str.replace and
+then round-tripping through latin-1 with errors="replace".
+"""
+
+import re
+from functools import lru_cache
+
+# Order matters for the sequential definition (e.g. "–" -> "-" runs before
+# "--" is collapsed, "&" is escaped before "<" and ">").
+REPLACEMENTS = {
+    "–": "-",   # en dash
+    "—": "-",   # em dash
+    "‘": "'",   # left single quote
+    "’": "'",   # right single quote
+    "“": '"',   # left double quote
+    "”": '"',   # right double quote
+    "•": "*",   # bullet
+    " ": " ",   # non-breaking space
+    "--": " - ",     # LaTeX double-dash
+    "\\$": "$",
+    "\\#": "#",
+    "\\%": "%",
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+}
+
+# The only interaction between entries is that "–"/"—" turn into "-" before
+# "--" is collapsed, so any pair of dash-like chars counts as "--" here.
+_DASHES = "-" + "".join(old for old, new in REPLACEMENTS.items() if new == "-")
+_ESCAPED = "".join(old[1] for old in REPLACEMENTS if len(old) == 2 and old[0] == "\\")
+_SUBS = {old: new for old, new in REPLACEMENTS.items() if old != "--"}
+_SUBS.update({a + b: REPLACEMENTS["--"] for a in _DASHES for b in _DASHES})
+_SUBS.update({"-": "-", "\\": "\\"})   # lone "-" / "\\" match but stay as they are
+
+# One leading character class (so the regex engine can skip ahead to the
+# next candidate char), optionally extended to a "--" pair or a "\\$" escape.
+_FIRST = "".join(old for old in _SUBS if len(old) == 1)
+_PATTERN = re.compile(
+    f"[{re.escape(_FIRST)}\u0100-\U0010ffff]"
+    f"(?:(?<=[{_DASHES}])[{_DASHES}]|(?<=\\\\)[{re.escape(_ESCAPED)}])?"
+)
+
+
+def _replace(match) -> str:
+    # Anything not in the table is a non-Latin-1 char -> "?" (latin-1 "replace")
+    return _SUBS.get(match.group(), "?")
+
+
+@lru_cache(maxsize=8192)
+def sanitize(text: str) -> str:
+    """Replace problem chars so Helvetica renders them correctly."""
+    return _PATTERN.sub(_replace, text)
@@ -0,0 +1,259 @@
+# backend/app/utils/tracing.py
+"""
+Lightweight spans and Prometheus metrics, without extra dependencies.
+
+  span("pdf.render")      — context manager / decorator (sync or async).
+                            Records the duration in the
+                            lumascan_span_seconds{span=...} histogram and in
+                            the current request's timing collector.
+  record_llm_call(...)    — per-call-site LLM latency, outcome and token
+                            counters (fed by llm_client).
+  init_tracing(app)       — per-request collector, the
+                            lumascan_http_request_seconds histogram, an
+                            optional Server-Timing header and GET /metrics
+                            in Prometheus text format.
+
+The collector lives in a contextvar; run_stages and the batch pool copy the
+caller's context into their threads, so spans in fanned-out stages land in
+the request that started them. Metrics are per process: with several
+gunicorn workers each one exposes its own /metrics.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from app import config
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# ── Metric types ─────────────────────────────────────────────────────────────
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}   # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[-1] if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, n in zip(self.buckets, series):
+                    le = _labels(self.labelnames, labels, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {n}")
+                inf = _labels(self.labelnames, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+_registry = OrderedDict()
+
+
+def _register(metric):
+    _registry[metric.name] = metric
+    return metric
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+SPAN_SECONDS = _register(Histogram(
+    "lumascan_span_seconds", "Duration of instrumented stages", ["span"]))
+HTTP_SECONDS = _register(Histogram(
+    "lumascan_http_request_seconds", "HTTP request latency", ["method", "endpoint", "status"]))
+LLM_SECONDS = _register(Histogram(
+    "lumascan_llm_request_seconds", "Groq call latency per call site, retries included", ["site"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)))
+LLM_CALLS = _register(Counter(
+    "lumascan_llm_requests_total", "Groq calls per call site and outcome", ["site", "outcome"]))
+LLM_TOKENS = _register(Counter(
+    "lumascan_llm_tokens_total", "Tokens reported by Groq per call site", ["site", "kind"]))
+PROMPT_TOKENS = _register(Counter(
+    "lumascan_prompt_budget_tokens_total",
+    "Estimated document tokens before (input) and after (sent) prompt budgeting", ["profile", "stage"]))
+
+
+def record_llm_call(site: str, seconds: Optional[float], outcome: str, usage=None):
+    """outcome: "ok", "cached" or an LLMError class name. `usage` is the completion's usage."""
+    LLM_CALLS.inc(site, outcome)
+    if seconds is not None:
+        LLM_SECONDS.observe(seconds, site)
+    if usage is not None:
+        for kind in ("prompt_tokens", "completion_tokens"):
+            LLM_TOKENS.inc(site, kind.split("_")[0], amount=getattr(usage, kind, 0) or 0)
+
+
+# ── Spans ────────────────────────────────────────────────────────────────────
+class _Collector:
+    """Per-request span totals: name -> [total ms, count]."""
+
+    def __init__(self):
+        self.spans: Dict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, ms: float):
+        with self._lock:
+            entry = self.spans.setdefault(name, [0.0, 0])
+            entry[0] += ms
+            entry[1] += 1
+
+
+_collector: contextvars.ContextVar = contextvars.ContextVar("trace_collector", default=None)
+
+
+class span:
+    """
+    Time a block (`with span("name"):`) or a function (`@span("name")`).
+    Durations go to lumascan_span_seconds and the request's Server-Timing.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        SPAN_SECONDS.observe(elapsed, self.name)
+        collector = _collector.get()
+        if collector is not None:
+            collector.add(self.name, elapsed * 1000)
+        return False
+
+    def __call__(self, fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(self.name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def current_spans() -> Dict[str, Tuple[float, int]]:
+    """Span totals recorded so far in this request: name -> (ms, count)."""
+    collector = _collector.get()
+    if collector is None:
+        return {}
+    with collector._lock:
+        return {name: (round(ms, 1), n) for name, (ms, n) in collector.spans.items()}
+
+
+def server_timing_header(spans: Dict[str, Tuple[float, int]], total_ms: float) -> str:
+    parts = []
+    for name, (ms, n) in spans.items():
+        desc = f';desc="x{n}"' if n > 1 else ""
+        parts.append(f"{name};dur={ms:.1f}{desc}")
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+# ── Flask wiring ─────────────────────────────────────────────────────────────
+def init_tracing(app, server_timing: bool = None, metrics_path: str = "/metrics"):
+    server_timing = config.SERVER_TIMING if server_timing is None else server_timing
+
+    @app.before_request
+    def _start_trace():
+        from flask import g
+        g._trace_start = time.perf_counter()
+        g._trace_token = _collector.set(_Collector())
+
+    @app.after_request
+    def _finish_trace(response):
+        from flask import g, request
+        start = g.pop("_trace_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_SECONDS.observe(elapsed, request.method, endpoint, str(response.status_code))
+        if server_timing and endpoint != metrics_path:
+            response.headers["Server-Timing"] = server_timing_header(current_spans(), elapsed * 1000)
+        return response
+
+    @app.teardown_request
+    def _end_trace(exc=None):
+        from flask import g
+        token = g.pop("_trace_token", None)
+        if token is not None:
+            try:
+                _collector.reset(token)
+            except ValueError:   # created in a different context (e.g. streamed response)
+                pass
+
+    if metrics_path:
+        def metrics():
+            from flask import Response
+            return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+        app.add_url_rule(metrics_path, "metrics", metrics)
+
+    return app
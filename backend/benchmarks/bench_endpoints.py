@@ -0,0 +1,325 @@
+# backend/benchmarks/bench_endpoints.py
+"""
+End-to-end API throughput against a local fake Groq server.
+
+    cd backend && python -m benchmarks.bench_endpoints [--concurrency 8] [--requests 100] \\
+        [--endpoints upload,match,generate,render] [--latency-ms 500] [--error-rate 0.01] \\
+        [--server werkzeug|gunicorn] [--warm] [--out results.json] [--baseline previous.json]
+
+Starts benchmarks.fake_groq in-process and the Flask app (run.py) as a
+subprocess pointed at it through GROQ_BASE_URL, with a throwaway data
+directory, no client-side rate limit and — unless --warm — the LLM cache
+and upload dedup store disabled and every payload made unique, so each
+request pays for its full pipeline.
+
+Endpoints run one after another at the chosen concurrency. For each one
+the report has p50/p95/p99/mean latency, requests/s, status counts, the
+server's CPU seconds and peak RSS (whole process tree, sampled from /proc;
+null on other platforms) and how many fake LLM calls it made. The JSON is
+written to --out (default benchmarks/results/endpoints-<timestamp>.json);
+--baseline prints the change against an earlier report.
+"""
+
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.resume_generator import _build_plain_text  # noqa: E402
+from app.services.resume_pdf import generate_resume_pdf  # noqa: E402
+from benchmarks.bench_render import SAMPLE  # noqa: E402
+from benchmarks.fake_groq import FakeGroq  # noqa: E402
+
+ENDPOINTS = ("upload", "match", "generate", "render")
+JOB_DESC = ("Backend Software Engineer. Required: Python, Flask or FastAPI, AWS, Docker, "
+            "PostgreSQL, Redis. Nice to have: Kubernetes, Terraform, Go. 2+ years of experience "
+            "building REST APIs, CI/CD with GitHub Actions, strong communication skills.")
+
+
+# ── Payloads ──────────────────────────────────────────────────────────────────
+def _payloads(warm: bool):
+    """endpoint -> fn(i) -> (method, path, requests kwargs)."""
+    pdf = generate_resume_pdf(SAMPLE).getvalue()
+    resume_text = _build_plain_text(SAMPLE)
+
+    def job(i):
+        return JOB_DESC if warm else f"{JOB_DESC} (Req #{i})"
+
+    def data(i):
+        if warm:
+            return SAMPLE
+        return dict(SAMPLE, personal=dict(SAMPLE["personal"], name=f"Jane Doe {i}"))
+
+    return {
+        "upload": lambda i: ("POST", "/api/upload",
+                             {"files": {"resume": ("resume.pdf", pdf, "application/pdf")}}),
+        "match": lambda i: ("POST", "/api/match",
+                            {"json": {"resume_text": resume_text, "job_desc": job(i)}}),
+        "generate": lambda i: ("POST", "/api/resume/generate",
+                               {"json": {"resume_text": resume_text, "job_desc": job(i),
+                                         "user_data": data(i)}}),
+        "render": lambda i: ("POST", "/api/resume/render", {"json": {"data": data(i)}}),
+    }
+
+
+# ── Server process and /proc sampling ─────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(args, port: int, env: dict) -> subprocess.Popen:
+    if args.server == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "-w", str(args.workers), "--threads", str(args.threads),
+               "-b", f"127.0.0.1:{port}", "--log-level", "warning", "run:app"]
+    else:
+        cmd = [sys.executable, "-c",
+               f"from run import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Server did not start within 60s")
+
+
+def _process_tree(pid: int) -> list:
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+    tree, frontier = [pid], [pid]
+    while frontier:
+        frontier = [child for child, parent in parents.items() if parent in frontier]
+        tree.extend(frontier)
+    return tree
+
+
+def _cpu_seconds(pids: list) -> float:
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])   # utime + stime
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / ticks
+
+
+def _rss_bytes(pids: list) -> int:
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class _Sampler:
+    """CPU time and peak RSS of the server process tree over one phase."""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.enabled = os.path.isdir(f"/proc/{pid}")
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        if self.enabled:
+            self._cpu = _cpu_seconds(_process_tree(self.pid))
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes(_process_tree(self.pid)))
+            self._stop.wait(self.interval)
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            self._stop.set()
+            self._thread.join()
+            self.cpu = _cpu_seconds(_process_tree(self.pid)) - self._cpu
+
+
+# ── Load ──────────────────────────────────────────────────────────────────────
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))   # nearest-rank
+    return sorted_values[min(len(sorted_values), max(rank, 1)) - 1]
+
+
+def _run_phase(base_url: str, payload, count: int, concurrency: int, timeout: float):
+    local = threading.local()
+
+    def one(i):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, kwargs = payload(i)
+        start = time.perf_counter()
+        try:
+            status = session.request(method, base_url + path, timeout=timeout, **kwargs).status_code
+        except requests.RequestException:
+            status = "error"
+        return (time.perf_counter() - start) * 1000, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(count)))
+    return results, time.perf_counter() - started
+
+
+def bench_endpoint(name: str, base_url: str, payload, server_pid: int, fake: FakeGroq, args) -> dict:
+    for i in range(args.warmup):   # imports, model loading, connection setup
+        _run_phase(base_url, lambda _: payload(-1 - i), 1, 1, args.timeout)
+
+    llm_before = dict(fake.counts)
+    with _Sampler(server_pid) as sampler:
+        results, elapsed = _run_phase(base_url, payload, args.requests, args.concurrency, args.timeout)
+    latencies = sorted(ms for ms, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok = sum(n for status, n in statuses.items() if status.startswith("2"))
+
+    return {
+        "requests": len(results),
+        "ok": ok,
+        "errors": len(results) - ok,
+        "status_counts": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(results) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 1),
+            "p95": round(_percentile(latencies, 95), 1),
+            "p99": round(_percentile(latencies, 99), 1),
+            "mean": round(sum(latencies) / len(latencies), 1),
+            "max": round(latencies[-1], 1),
+        },
+        "server_cpu_s": round(sampler.cpu, 3) if sampler.enabled else None,
+        "server_cpu_util": round(sampler.cpu / elapsed, 3) if sampler.enabled else None,
+        "server_peak_rss_mb": round(sampler.peak / 2 ** 20, 1) if sampler.enabled else None,
+        "llm_calls": fake.counts["requests"] - llm_before["requests"],
+        "llm_errors": fake.counts["errors"] - llm_before["errors"],
+    }
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+def _compare(report: dict, baseline: dict):
+    rows = []
+    for name, now in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        for metric, path in (("p50", ("latency_ms", "p50")), ("p95", ("latency_ms", "p95")),
+                             ("p99", ("latency_ms", "p99")), ("rps", ("rps",))):
+            old, new = before, now
+            for key in path:
+                old, new = old[key], new[key]
+            change = (new - old) / old * 100 if old else 0.0
+            rows.append(f"{name:<9} {metric:<4} {old:>10.1f} -> {new:>10.1f}  ({change:+.1f}%)")
+    print("\n".join(rows), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="per endpoint")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=120.0, help="client timeout per request")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="fake Groq median latency")
+    parser.add_argument("--sigma", type=float, default=0.4, help="fake Groq log-normal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fake Groq 503/429 share")
+    parser.add_argument("--server", choices=["werkzeug", "gunicorn"], default="werkzeug")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--warm", action="store_true",
+                        help="identical payloads with caches on (measures the cached path)")
+    parser.add_argument("--out")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.endpoints.split(",") if n.strip()]
+    unknown = set(names) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    fake = FakeGroq(latency_ms=args.latency_ms, sigma=args.sigma, error_rate=args.error_rate, seed=0).start()
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="lumascan-bench-") as data_dir:
+        env = dict(os.environ, GROQ_BASE_URL=fake.base_url, GROQ_API_KEY="bench",
+                   LUMASCAN_DATA_DIR=data_dir, LLM_RATE_RPM="0", LLM_RATE_TPM="0",
+                   ALLOWED_ORIGINS="http://localhost")
+        if not args.warm:
+            env.update(LLM_CACHE_ENABLED="0", UPLOAD_STORE_PATH="")
+        server = _start_server(args, port, env)
+        try:
+            payloads = _payloads(args.warm)
+            base_url = f"http://127.0.0.1:{port}"
+            endpoints = {}
+            for name in names:
+                endpoints[name] = bench_endpoint(name, base_url, payloads[name], server.pid, fake, args)
+                print(f"{name}: {json.dumps(endpoints[name]['latency_ms'])} "
+                      f"{endpoints[name]['rps']} req/s", file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+            fake.stop()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        "cpu_count": os.cpu_count(),
+        "endpoints": endpoints,
+    }
+    out = args.out or os.path.join(BACKEND_DIR, "benchmarks", "results",
+                                   f"endpoints-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Saved {out}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            _compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_render.py
+"""
+Resume render latency: full rebuild vs. a single-bullet edit.
+
+    cd backend && python -m benchmarks.bench_render [--runs 50] [--data resume_data.json]
+
+Without --data the legacy resume_data.json (RESUME_LEGACY_FILE) is used, or a built-in
+two-page sample when that file is not present.
+
+"full" clears the block memo before every render (the old behaviour:
+every paragraph parsed and line-broken from scratch); "edit" appends to
+one bullet between renders, so only that project's block is rebuilt.
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import config  # noqa: E402
+from app.services.resume_pdf import clear_render_memo, generate_resume_pdf  # noqa: E402
+
+
+SAMPLE = {
+    "personal": {"name": "Jane Doe", "phone": "555-123-4567",
+                 "email": "jane@example.com", "linkedin": "linkedin.com/in/janedoe"},
+    "education": [{
+        "degree": "B.S. Computer Science", "institution": "Arizona State University",
+        "college": "Ira A. Fulton Schools of Engineering", "graduation": "May 2026",
+        "gpa": "3.8", "coursework": "Data Structures, Algorithms, Operating Systems, Databases",
+    }],
+    "skills": {
+        "languages": ["Python", "TypeScript", "SQL", "C++", "Go"],
+        "frameworks": ["Flask", "React", "Next.js", "FastAPI", "PyTorch"],
+        "tools": ["Docker", "AWS", "Git", "Kubernetes", "Terraform"],
+        "databases": ["PostgreSQL", "Redis", "MongoDB"],
+    },
+    "projects": [
+        {"title": f"Project {i}", "duration": "Spring 2025",
+         "keyHighlight": "Resume analyzer with LLM-backed job matching",
+         "bullets": [f"Built a Flask API with {n} endpoints serving 500+ weekly users, "
+                     "cutting p95 latency by 40% through caching & batching" for n in range(4)]}
+        for i in range(5)
+    ],
+    "experience": [
+        {"company": f"Company {i}", "location": "Phoenix, AZ", "position": "Software Intern",
+         "duration": "Summer 2024",
+         "bullets": [f"Led migration of {n} services to AWS Lambda, reducing hosting "
+                     "cost by 35% while keeping 99.9% availability" for n in range(4)]}
+        for i in range(4)
+    ],
+    "activities": [
+        {"title": "ACM Chapter", "duration": "2023 - Present", "keyHighlight": "Workshop lead",
+         "bullets": ["Organised 12 workshops on systems programming for 200+ students"]},
+    ],
+}
+
+
+def _timed(fn, runs):
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 2),
+        "mean_ms": round(statistics.fmean(samples), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--data", default=config.RESUME_LEGACY_FILE)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.data):
+        with open(args.data) as f:
+            data = json.load(f)
+    else:
+        data = SAMPLE
+
+    def full(_):
+        clear_render_memo()
+        generate_resume_pdf(data)
+
+    generate_resume_pdf(data)   # warm the memo
+    edited = copy.deepcopy(data)
+    section = "projects" if data.get("projects") else "experience"
+    original = edited[section][0]["bullets"][0]
+
+    def edit(i):
+        edited[section][0]["bullets"][0] = f"{original} ({i})"
+        generate_resume_pdf(edited)
+
+    report = {"runs": args.runs, "full_rebuild": _timed(full, args.runs),
+              "single_bullet_edit": _timed(edit, args.runs)}
+    report["speedup_p50"] = round(
+        report["full_rebuild"]["p50_ms"] / report["single_bullet_edit"]["p50_ms"], 2
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
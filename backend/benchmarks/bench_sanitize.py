@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_sanitize.py
+"""
+Microbenchmark: resume text sanitizer, chained str.replace vs. single pass.
+
+    cd backend && python -m benchmarks.bench_sanitize [--number 20000]
+
+"cold" bypasses the memo so only the regex pass is measured; "warm" is the
+steady state during a render, where dates, skill names and headings repeat.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.sanitize import REPLACEMENTS, sanitize  # noqa: E402
+
+SAMPLES = [
+    "Python",
+    "Summer 2024 – Present",
+    "Frameworks & Libraries",
+    "Built a Flask API serving 500+ users — cut p95 latency by 40\\% using Redis caching",
+    "Led migration of 12 services to AWS Lambda, saving \\$30k/yr in hosting costs",
+    "“LumaScan” – resume analyzer with LLM-backed job matching and ATS scoring",
+]
+
+
+def chained(text: str) -> str:
+    for old, new in REPLACEMENTS.items():
+        text = text.replace(old, new)
+    return text.encode("latin-1", errors="replace").decode("latin-1")
+
+
+def _per_call_us(fn, number):
+    seconds = min(timeit.repeat(lambda: [fn(t) for t in SAMPLES], number=number, repeat=3))
+    return round(seconds / (number * len(SAMPLES)) * 1e6, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    report = {
+        "chained_replace_us": _per_call_us(chained, args.number),
+        "single_pass_cold_us": _per_call_us(sanitize.__wrapped__, args.number),
+        "single_pass_warm_us": _per_call_us(sanitize, args.number),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# backend/benchmarks/bench_skills.py
+"""
+Local skill extraction: taxonomy load time and scans per second.
+
+    cd backend && python -m benchmarks.bench_skills [--text resume.txt] [--number 500]
+
+Without --text the synthetic resume from bench_ats is used. Compare the
+per-scan figure with a Groq extract_skills round trip (typically 0.5-2 s).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import config  # noqa: E402
+from app.services.skill_taxonomy import load_matcher, recall_looks_low  # noqa: E402
+from benchmarks.bench_ats import SAMPLE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--text")
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    text = SAMPLE
+    if args.text:
+        with open(args.text) as f:
+            text = f.read()
+
+    start = time.perf_counter()
+    matcher = load_matcher(config.SKILL_TAXONOMY_PATH)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    skills, unknown = matcher.scan(text)
+    seconds = min(timeit.repeat(lambda: matcher.scan(text), number=args.number, repeat=3))
+    print(json.dumps({
+        "terms": len(matcher),
+        "load_ms": round(load_ms, 2),
+        "words": len(text.split()),
+        "per_scan_us": round(seconds / args.number * 1e6, 1),
+        "skills_found": len(skills),
+        "unknown_terms": unknown,
+        "llm_fallback": recall_looks_low(skills, unknown),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# backend/benchmarks/fake_groq.py
+"""
+Local stand-in for the Groq chat completions API, for offline benchmarks.
+
+Answers POST /openai/v1/chat/completions (what the Groq SDK calls under
+GROQ_BASE_URL) with canned responses shaped like the real ones for each of
+our prompts — match analysis JSON, tailoring JSON, parsed resume JSON or a
+comma-separated skill list — after a simulated latency drawn from a
+log-normal distribution. A configurable share of requests fails with 503
+or 429 (with Retry-After) to exercise retries.
+
+    cd backend && python -m benchmarks.fake_groq --port 8900 --latency-ms 600 --error-rate 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8900 python run.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANALYSIS = {
+    "exact_matches": [{"job_skill": "python", "resume_skill": "python"},
+                      {"job_skill": "aws", "resume_skill": "aws"},
+                      {"job_skill": "docker", "resume_skill": "docker"}],
+    "missing_core": ["kubernetes", "terraform"],
+    "industry_analysis": "Strong backend fundamentals; limited infrastructure-as-code exposure.",
+}
+TAILORING = {
+    "selected_project_titles": ["LumaScan", "Distributed Cache"],
+    "top_languages": ["Python", "Go", "SQL"],
+    "top_frameworks": ["Flask", "FastAPI"],
+    "top_tools": ["Docker", "AWS", "Kubernetes"],
+}
+STRUCTURE = {
+    "personal": {"name": "Jane Doe", "phone": "555-123-4567", "email": "jane@example.com",
+                 "linkedin": "linkedin.com/in/janedoe"},
+    "education": [{"degree": "B.S. Computer Science", "institution": "Arizona State University",
+                   "college": "", "graduation": "May 2026", "gpa": "3.8", "coursework": ""}],
+    "skills": {"languages": ["Python", "Go", "SQL"], "frameworks": ["Flask", "React"],
+               "tools": ["Docker", "AWS", "Git"], "databases": ["PostgreSQL", "Redis"]},
+    "projects": [{"title": "LumaScan", "duration": "2025",
+                  "keyHighlight": "Resume analyzer scoring resumes against job descriptions",
+                  "bullets": ["Built a Flask API with TF-IDF and LLM scoring"]}],
+    "experience": [{"company": "Acme", "location": "Tempe, AZ", "position": "Software Engineer Intern",
+                    "duration": "Summer 2025", "bullets": ["Cut p95 latency by 40% with Redis caching"]}],
+    "activities": [],
+}
+SKILLS = "python, flask, aws, docker, postgresql, redis, react, git, sql, communication"
+
+
+def canned_response(prompt: str) -> str:
+    if "Analyze resume-job match" in prompt:
+        return json.dumps(ANALYSIS)
+    if "resume writer" in prompt:
+        return json.dumps(TAILORING)
+    if "resume parsing expert" in prompt:
+        return json.dumps(STRUCTURE)
+    return SKILLS
+
+
+class FakeGroq:
+    """Latency ~ lognormal(median latency_ms, sigma); error_rate split between 503 and 429."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 500.0,
+                 sigma: float = 0.4, error_rate: float = 0.0, seed: int = None):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._lock:
+            delay = self.latency_ms * self._random.lognormvariate(0, self.sigma) if self.latency_ms else 0.0
+            failure = self._random.random() < self.error_rate
+            status = self._random.choice((503, 429)) if failure else 200
+            self.counts["requests"] += 1
+            self.counts["errors"] += failure
+        return delay / 1000, status
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                delay, status = fake._draw()
+                time.sleep(delay)
+                if status != 200:
+                    self._send(status, {"error": {"message": "simulated failure", "type": "server_error"}},
+                               {"Retry-After": "1"} if status == 429 else None)
+                    return
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+                content = canned_response(prompt)
+                usage = {"prompt_tokens": len(prompt) // 4 + 1, "completion_tokens": len(content) // 4 + 1}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                with fake._lock:
+                    fake.counts["prompt_tokens"] += usage["prompt_tokens"]
+                    fake.counts["completion_tokens"] += usage["completion_tokens"]
+                self._send(200, {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                })
+
+        return Handler
+
+    def start(self) -> "FakeGroq":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="median simulated latency")
+    parser.add_argument("--sigma", type=float, default=0.4, help="log-normal spread (0 = fixed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503/429 responses")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    fake = FakeGroq(args.host, args.port, args.latency_ms, args.sigma, args.error_rate, args.seed)
+    print(f"Fake Groq listening on {fake.base_url}", flush=True)
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,24 @@ from flask_cors import CORS
 from app.routes.upload import upload_bp
 from app.routes.scan import scan_bp
 from app.routes.resume import resume_bp
+from app.routes.jobs import jobs_bp
+from app.services.job_queue import get_job_queue
+from app import config
+from app.utils.compression import init_gzip
+from app.utils.resilience import init_request_budget
+from app.utils.tracing import init_tracing
 
 def create_app():
     app = Flask(__name__)
 
     allowed_origins = os.environ.get("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
-    CORS(app, origins=allowed_origins)
+    CORS(app, origins=allowed_origins, expose_headers=[
+        "X-Match-Score", "X-ATS-Score", "X-ATS-Grade", "X-Selected-Projects", "X-Timings-Ms", "ETag",
+        "Server-Timing", "X-Resume-Version",
+    ])
+    init_gzip(app)
+    init_request_budget(app, config.LLM_REQUEST_BUDGET)
+    init_tracing(app, metrics_path=config.METRICS_PATH)
 
     @app.route('/')
     def home():
@@ -18,6 +30,10 @@ def create_app():
     app.register_blueprint(upload_bp, url_prefix='/api')
     app.register_blueprint(scan_bp, url_prefix='/api')
     app.register_blueprint(resume_bp)
+    app.register_blueprint(jobs_bp, url_prefix='/api')
+
+    # Background workers for queued /api/resume/generate requests
+    get_job_queue().start(config.JOB_QUEUE_WORKERS)
 
     return app
 
@@ -1,9 +1,23 @@
 # backend/tests/conftest.py
 import pytest
-from backend.app import create_app
 import os
 import tempfile
 
+# Keep caches and stores written during tests out of the real data dir, and
+# don't start background queue workers (tests drive the queue with run_one)
+os.environ.setdefault("LUMASCAN_DATA_DIR", tempfile.mkdtemp(prefix="lumascan-test-"))
+os.environ.setdefault("JOB_QUEUE_WORKERS", "0")
+
+from backend.app import create_app
+
+
+@pytest.fixture(autouse=True)
+def groq_api_key(monkeypatch):
+    """The Groq clients are built lazily and refuse to start without a key; tests never reach Groq."""
+    if not os.environ.get("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test-key")
+
+
 @pytest.fixture
 def app():
     app = create_app()
@@ -14,6 +28,18 @@ def app():
 def client(app):
     return app.test_client()
 
+@pytest.fixture
+def api_app():
+    """The full API app from run.py (every blueprint registered)."""
+    from run import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def api_client(api_app):
+    return api_app.test_client()
+
 @pytest.fixture
 def sample_pdf():
     # Create a simple PDF for testing
@@ -25,4 +51,38 @@ def sample_pdf():
     doc.save(temp_pdf.name)
     doc.close()
     yield temp_pdf.name
-    os.unlink(temp_pdf.name)
\ No newline at end of file
+    os.unlink(temp_pdf.name)
+
+@pytest.fixture
+def sample_resume_data():
+    return {
+        "personal": {"name": "Jane Doe", "phone": "555-123-4567",
+                     "email": "jane@example.com", "linkedin": "linkedin.com/in/janedoe"},
+        "education": [{
+            "degree": "B.S. Computer Science", "institution": "Arizona State University",
+            "college": "Ira A. Fulton Schools of Engineering", "graduation": "May 2026",
+            "gpa": "3.8", "coursework": "Data Structures, Algorithms, Databases",
+        }],
+        "skills": {
+            "languages": ["Python", "TypeScript", "SQL"],
+            "frameworks": ["Flask", "React", "Next.js"],
+            "tools": ["Docker", "AWS", "Git"],
+            "databases": ["PostgreSQL"],
+        },
+        "projects": [
+            {"title": "LumaScan", "duration": "Spring 2025",
+             "keyHighlight": "Resume analyzer with LLM matching",
+             "bullets": ["Built a Flask API serving 500+ users", "Reduced latency by 40%"]},
+            {"title": "Chess Engine", "duration": "Fall 2024",
+             "keyHighlight": "Minimax engine in C++",
+             "bullets": ["Implemented alpha-beta pruning"]},
+        ],
+        "experience": [
+            {"company": "Acme", "location": "Phoenix, AZ", "position": "Software Intern",
+             "duration": "Summer 2024", "bullets": ["Led migration to AWS Lambda"]},
+        ],
+        "activities": [
+            {"title": "ACM Chapter", "duration": "2023 - Present",
+             "keyHighlight": "Workshop lead", "bullets": ["Managed 12 workshops"]},
+        ],
+    }
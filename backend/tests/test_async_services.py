@@ -0,0 +1,118 @@
+# backend/tests/test_async_services.py
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.services import llm_client
+from app.services.gemini import aextract_skills, extract_skills
+from app.services.llm_cache import LLMCache
+from app.services.match import acompare_resume_and_job, compare_resume_and_job
+from app.services.resume_generator import _atailor_with_llm, _tailor_with_llm
+from app.services.resume_parser import aparse_resume_to_structure, parse_resume_to_structure
+from app.utils.resilience import CircuitBreaker
+
+RESUME = "Jane Doe. Python, Flask and AWS. Built a resume analyzer."
+JOB = "Backend engineer: Python, AWS, Kubernetes"
+ANALYSIS = '{"exact_matches": [{"job_skill": "python", "resume_skill": "python"}], "missing_core": ["kubernetes"], "industry_analysis": "ok"}'
+DATA = {
+    "projects": [{"title": "LumaScan", "bullets": ["b"]}, {"title": "Other", "bullets": ["c"]}],
+    "skills": {"languages": ["Java", "Python"], "frameworks": [], "tools": []},
+}
+
+
+def _fake_llm(prompt, **kwargs):
+    if "Analyze resume-job match" in prompt:
+        return ANALYSIS
+    if "resume writer" in prompt:
+        return '{"selected_project_titles": ["Other"], "top_languages": ["Python"]}'
+    if "resume parsing expert" in prompt:
+        return json.dumps({"personal": {"name": "Jane Doe"}})
+    return "Python, Flask, AWS"
+
+
+async def _afake_llm(prompt, **kwargs):
+    return _fake_llm(prompt)
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def test_async_services_match_sync_results():
+    with patch("app.services.gemini.generate_content", side_effect=_fake_llm), \
+         patch("app.services.resume_parser.generate_content", side_effect=_fake_llm), \
+         patch("app.services.resume_generator.generate_content", side_effect=_fake_llm), \
+         patch("app.services.match.generate_content", side_effect=_fake_llm), \
+         patch("app.services.gemini.agenerate_content", side_effect=_afake_llm), \
+         patch("app.services.resume_parser.agenerate_content", side_effect=_afake_llm), \
+         patch("app.services.resume_generator.agenerate_content", side_effect=_afake_llm), \
+         patch("app.services.match.agenerate_content", side_effect=_afake_llm):
+        assert asyncio.run(aextract_skills(RESUME)) == extract_skills(RESUME) == ["python", "flask", "aws"]
+        assert asyncio.run(aparse_resume_to_structure(RESUME)) == parse_resume_to_structure(RESUME)
+        assert asyncio.run(_atailor_with_llm(DATA, JOB)) == _tailor_with_llm(DATA, JOB)
+
+        kwargs = dict(resume_skills=["python"], job_skills=["python", "aws"])
+        sync_result = compare_resume_and_job(RESUME, JOB, "tech", **kwargs)
+        async_result = asyncio.run(acompare_resume_and_job(RESUME, JOB, "tech", **kwargs))
+    assert "error" not in async_result
+    assert set(async_result["timings_ms"]) >= {"analysis", "similarity"}
+    sync_result.pop("timings_ms")
+    async_result.pop("timings_ms")
+    assert async_result == sync_result
+
+
+def test_achat_multiplexes_concurrent_calls():
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.1)
+        return _completion("ok")
+
+    async def run():
+        client = llm_client.get_async_client()
+        with patch.object(client.chat.completions, "create", new=AsyncMock(side_effect=slow_create)):
+            start = time.perf_counter()
+            results = await asyncio.gather(*(llm_client.achat(f"p{i}", "model") for i in range(50)))
+            return results, time.perf_counter() - start
+
+    with patch.object(llm_client, "_request_bucket", None), \
+         patch.object(llm_client, "_token_bucket", None):
+        results, elapsed = asyncio.run(run())
+    assert results == ["ok"] * 50
+    assert elapsed < 1.0   # 50 x 100 ms, overlapped on one thread
+
+
+def test_achat_bounds_a_hung_attempt_and_retries():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs["timeout"])
+        if len(calls) == 1:
+            await asyncio.sleep(10)   # never answers
+        return _completion("ok")
+
+    async def run():
+        client = llm_client.get_async_client()
+        with patch.object(client.chat.completions, "create", new=AsyncMock(side_effect=create)):
+            return await llm_client.achat("prompt", "model")
+
+    policies = {"default": llm_client.policy_for("default")._replace(timeout=0.3, backoff_base=0.01)}
+    with patch.dict(llm_client.POLICIES, policies), \
+         patch.object(llm_client, "breaker", CircuitBreaker(3, 1.0)), \
+         patch.object(llm_client, "_request_bucket", None), \
+         patch.object(llm_client, "_token_bucket", None):
+        start = time.perf_counter()
+        assert asyncio.run(run()) == "ok"
+    assert len(calls) == 2
+    assert time.perf_counter() - start < 1.0
+
+
+def test_agenerate_content_uses_cache():
+    from app.services import gemini
+
+    cache = LLMCache()
+    with patch.object(gemini, "response_cache", cache), \
+         patch("app.services.gemini.achat", new=AsyncMock(return_value="python")) as achat:
+        assert asyncio.run(gemini.agenerate_content("prompt")) == "python"
+        assert asyncio.run(gemini.agenerate_content("prompt")) == "python"
+    assert achat.await_count == 1
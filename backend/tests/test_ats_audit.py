@@ -0,0 +1,129 @@
+# backend/tests/test_ats_audit.py
+import csv
+import json
+
+import pytest
+
+from app.services.ats_audit import iter_inputs, main, run_audit
+from app.services.resume_pdf import generate_resume_pdf
+
+JOB = "Backend engineer: Python, Flask, AWS Lambda, PostgreSQL and React experience."
+
+
+@pytest.fixture
+def pool(tmp_path, sample_resume_data):
+    folder = tmp_path / "resumes"
+    (folder / "nested").mkdir(parents=True)
+    for name in ["a.pdf", "b.pdf", "nested/c.pdf"]:
+        (folder / name).write_bytes(generate_resume_pdf(sample_resume_data).getvalue())
+    (folder / "broken.pdf").write_bytes(b"not a pdf")
+    (folder / "notes.txt").write_text("ignored")
+    return folder
+
+
+def _rows(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_iter_inputs_walks_directories_and_manifests(pool, tmp_path):
+    assert [i["id"] for i in iter_inputs([str(pool)])] == ["a.pdf", "b.pdf", "broken.pdf", "nested/c.pdf"]
+
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("id,path\ncand-1,resumes/a.pdf\n")
+    assert list(iter_inputs([str(manifest)])) == [{"id": "cand-1", "path": str(pool / "a.pdf")}]
+
+
+def test_audit_writes_one_row_per_pdf(pool, tmp_path):
+    out = tmp_path / "audit.jsonl"
+    counters = run_audit(list(iter_inputs([str(pool)])), JOB, str(out),
+                         skills=["Python", "AWS", "Kubernetes"], workers=2)
+    assert counters["ok"] == 3 and counters["errors"] == 1
+
+    rows = {r["id"]: r for r in _rows(out)}
+    ok = rows["a.pdf"]
+    assert ok["status"] == "ok"
+    assert 0 <= ok["ats_score"] <= 100
+    assert ok["matched_skills"] == ["Python", "AWS"]
+    assert ok["missing_skills"] == ["Kubernetes"]
+    assert "education" in ok["sections_found"]
+    assert rows["broken.pdf"]["status"] == "error"
+
+
+def test_interrupted_run_resumes(pool, tmp_path):
+    out = tmp_path / "audit.jsonl"
+    inputs = list(iter_inputs([str(pool)]))
+    run_audit(inputs[:2], JOB, str(out), workers=1)
+    with open(out, "a") as f:
+        f.write('{"id": "half-writ')     # killed mid-write
+
+    counters = run_audit(inputs, JOB, str(out), workers=1)
+    assert counters["skipped"] == 2 and counters["total"] == 2
+    assert sorted(r["id"] for r in _rows(out)) == sorted(i["id"] for i in inputs)
+
+    with pytest.raises(ValueError, match="different job description"):
+        run_audit(inputs, "Another job", str(out))
+
+
+def test_partial_line_longer_than_one_block_is_dropped(pool, tmp_path):
+    out = tmp_path / "audit.jsonl"
+    inputs = list(iter_inputs([str(pool)]))
+    run_audit(inputs[:2], JOB, str(out), workers=1)
+    with open(out, "a") as f:
+        f.write('{"id": "' + "x" * 200_000)   # killed mid-write of a huge row
+
+    counters = run_audit(inputs[:2], JOB, str(out), workers=1)
+    assert counters["skipped"] == 2 and counters["total"] == 0
+    assert len(_rows(out)) == 2
+
+
+def test_error_rows_are_retried_on_resume(pool, tmp_path):
+    out = tmp_path / "audit.csv"
+    inputs = list(iter_inputs([str(pool)]))
+    run_audit(inputs, JOB, str(out), workers=1)
+    (pool / "broken.pdf").write_bytes((pool / "a.pdf").read_bytes())   # fixed since
+
+    kept = run_audit(inputs, JOB, str(out), workers=1, retry_errors=False)
+    assert kept["total"] == 0 and kept["skipped"] == 4
+
+    counters = run_audit(inputs, JOB, str(out), workers=1)
+    assert counters["retried"] == 1 and counters["total"] == 1 and counters["ok"] == 1
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4 and {r["status"] for r in rows} == {"ok"}
+
+
+def test_cli_csv_output(pool, tmp_path, capsys):
+    out = tmp_path / "audit.csv"
+    main([str(pool), "--job-desc", JOB, "--skills", "python, kubernetes",
+          "--out", str(out), "--workers", "1", "--quiet"])
+    assert json.loads(capsys.readouterr().out)["ok"] == 3
+
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert {r["missing_skills"] for r in rows if r["status"] == "ok"} == {"kubernetes"}
+
+
+def test_parquet_output(pool, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = tmp_path / "audit.parquet"
+    run_audit(list(iter_inputs([str(pool)])), JOB, str(out), skills=["python"], workers=1)
+
+    table = pq.read_table(out).to_pylist()
+    assert len(table) == 4
+    assert not (tmp_path / "audit.parquet.partial.jsonl").exists()
+
+
+def test_csv_resume_cuts_on_record_boundaries(pool, tmp_path):
+    out = tmp_path / "audit.csv"
+    inputs = list(iter_inputs([str(pool)]))
+    run_audit(inputs[:2], JOB, str(out), workers=1)
+    with open(out, "a", newline="") as f:
+        f.write('half-written,"line one\nline two\n')   # killed inside a quoted multi-line field
+
+    counters = run_audit(inputs, JOB, str(out), workers=1)
+    assert counters["skipped"] == 2 and counters["total"] == 2
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(r["id"] for r in rows) == sorted(i["id"] for i in inputs)
@@ -0,0 +1,88 @@
+# backend/tests/test_ats_checker.py
+import random
+import re
+
+import pytest
+
+from app.services.ats_checker import (
+    BAD_PATTERNS, CONTACT_PATTERNS, QUANTITY_PATTERNS, STANDARD_HEADERS, check_ats,
+)
+
+
+def _reference(text: str) -> dict:
+    """Rule evaluation as check_ats originally did it: one re.search per rule."""
+    lower = text.lower()
+    hits = sum(1 for p in QUANTITY_PATTERNS if re.search(p, lower))
+    return {
+        "contact_detected": {k: bool(re.search(p, text, re.IGNORECASE))
+                             for k, p in CONTACT_PATTERNS.items()},
+        "sections_found": [h for h in STANDARD_HEADERS
+                           if re.search(rf'\b{re.escape(h)}\b', lower)],
+        "format_issues": [msg for p, msg in BAD_PATTERNS if re.search(p, text)],
+        "quantifiable_achievements": round(min(15, hits * 3)),
+    }
+
+
+def _observed(text: str) -> dict:
+    result = check_ats(text, "", [], [], 50.0)
+    return {
+        "contact_detected": result["contact_detected"],
+        "sections_found": result["sections_found"],
+        # drop the word-count issue, which is not a pattern rule
+        "format_issues": [i for i in result["format_issues"] if not i.startswith("Resume is very short")],
+        "quantifiable_achievements": result["breakdown"]["quantifiable_achievements"],
+    }
+
+
+RESUME = """Jane Doe
+(602) 460-8373 | jane.doe@example.com | linkedin.com/in/janedoe
+
+EDUCATION
+B.S. Computer Science, Arizona State University
+
+TECHNICAL SKILLS
+Python, Flask, React
+
+WORK EXPERIENCE
+Acme — Software Intern
+Led migration of 12 services to AWS Lambda, reducing cost by 35%
+Built dashboards for 500+ users, saving $30k per year
+
+PROJECTS
+LumaScan: resume analyzer || table-free layout
+"""
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    RESUME,
+    RESUME.upper(),
+    "experiences, skillset, work-experience, subtable, tables",
+    "workexperience technical skillsets projects.",
+    "Managed a team of 6 engineers; grew revenue 40 % and saved $ 2M",
+    "Contact: 602.460.8373, JANE@EXAMPLE.IO, LinkedIn.com/IN/jane",
+])
+def test_matches_per_rule_search(text):
+    assert _observed(text) == _reference(text)
+
+
+def test_matches_per_rule_search_fuzzed():
+    words = sorted(STANDARD_HEADERS) + [
+        "led", "skilled", "team", "users", "table", "|", "||", "%", "$", "40", "602-460-8373",
+        "a@b.co", "linkedin.com/in/x", "—", "work", "technical", "-", "\n",
+    ]
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choice(words) + rng.choice(["", " ", "\n", ",", "s"])
+                       for _ in range(rng.randint(0, 30)))
+        assert _observed(text) == _reference(text), repr(text)
+
+
+def test_scores_and_recommendations():
+    result = check_ats(RESUME * 4, "", ["python"], ["docker"], 80.0)
+    assert result["contact_detected"] == {"email": True, "phone": True, "linkedin": True}
+    assert {"education", "experience", "work experience", "skills", "technical skills",
+            "projects"} <= set(result["sections_found"])
+    assert result["breakdown"]["section_headers"] == 15
+    assert result["breakdown"]["keyword_match"] == 32
+    assert "Add these missing keywords from the job description: docker." in result["recommendations"]
@@ -0,0 +1,141 @@
+# backend/tests/test_chunked_analysis.py
+import asyncio
+import json
+import re
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.match import acompare_resume_and_job, compare_resume_and_job, merge_analyses
+from app.services.prompt_budget import chunk_text, count_tokens
+from app.services.resume_parser import merge_structures, parse_resume_to_structure
+
+# Requirements past the old 2000-character cap of the analysis prompt
+JOB = ("Responsibilities\n"
+       + "".join(f"- Own service number {i} end to end, from design through on-call rotation\n" for i in range(40))
+       + "Requirements\n- Python and Flask\n- Kubernetes and Terraform\n")
+RESUME = ("Jane Doe\nTECHNICAL SKILLS\nPython, Flask, AWS\nWORK EXPERIENCE\n"
+          + "".join(f"Company {i} - Engineer\nShipped feature {i} used by {i * 100} customers daily\n"
+                    for i in range(60)))
+
+
+@pytest.fixture(autouse=True)
+def chunked_analysis():
+    with patch("app.config.CHUNKED_ANALYSIS", True):
+        yield
+
+
+def _analysis_for(prompt, **kwargs):
+    matched = [{"job_skill": "python", "resume_skill": "python"}] if "Python" in prompt else []
+    missing = ["kubernetes"] if "Kubernetes" in prompt else ["python"]
+    return json.dumps({"exact_matches": matched, "missing_core": missing, "industry_analysis": "ok"})
+
+
+def test_chunks_respect_budget_and_repeat_section_headings():
+    chunks, budget = chunk_text(RESUME, 200, "resume.match", overlap=40)
+    assert len(chunks) > 1 and budget == 200
+    assert all(count_tokens(c) <= budget for c in chunks)
+    assert all(c.startswith("WORK EXPERIENCE") for c in chunks[1:])
+    assert "Shipped feature 59" in chunks[-1]
+
+    capped, grown = chunk_text(RESUME, 200, "resume.match", max_chunks=2)
+    assert len(capped) <= 2 and grown > 200
+    assert chunk_text("short text", 200, "resume.match")[0] == ["short text"]
+
+
+def test_merge_analyses_dedups_and_drops_missing_matched_elsewhere():
+    merged = merge_analyses([
+        {"exact_matches": [{"job_skill": "Python", "resume_skill": "python"}],
+         "missing_core": ["AWS", "Kubernetes"], "industry_analysis": "a"},
+        {"exact_matches": [{"job_skill": "python", "resume_skill": "Python 3"},
+                           {"job_skill": "Amazon Web Services", "resume_skill": "aws"}],
+         "missing_core": ["kubernetes"], "industry_analysis": "a"},
+    ])
+    assert merged["exact_matches"] == [{"job_skill": "Python", "resume_skill": "python"},
+                                       {"job_skill": "Amazon Web Services", "resume_skill": "aws"}]
+    assert merged["missing_core"] == ["Kubernetes"]
+    assert merged["industry_analysis"] == "a"
+
+
+def test_long_inputs_are_analysed_in_parallel_chunks():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow_llm(prompt, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return _analysis_for(prompt)
+
+    with patch("app.services.match.generate_content", side_effect=slow_llm) as llm:
+        result = compare_resume_and_job(RESUME, JOB, resume_skills=["python"], job_skills=["python"])
+    assert "error" not in result
+    assert result["analysis_chunks"] == llm.call_count > 1
+    assert peak[0] > 1
+    assert result["missing_core_skills"] == ["kubernetes"]   # seen past the old cutoff
+    assert result["matched_skills"] == ["python → python"]   # "missing" in other chunks, matched here
+
+    async def afake(prompt, **kwargs):
+        return _analysis_for(prompt)
+
+    with patch("app.services.match.agenerate_content", side_effect=afake):
+        async_result = asyncio.run(acompare_resume_and_job(
+            RESUME, JOB, resume_skills=["python"], job_skills=["python"]))
+    assert async_result["missing_core_skills"] == result["missing_core_skills"]
+    assert async_result["analysis_chunks"] == result["analysis_chunks"]
+
+
+def test_short_inputs_use_one_prompt():
+    with patch("app.services.match.generate_content", side_effect=_analysis_for) as llm:
+        result = compare_resume_and_job("Python, Flask", "Python and Kubernetes",
+                                        resume_skills=["python"], job_skills=["python"])
+    assert llm.call_count == 1 and result["analysis_chunks"] == 1
+
+
+def test_merge_structures_joins_entries_split_across_chunks():
+    merged = merge_structures([
+        {"personal": {"name": "Jane Doe", "email": ""},
+         "skills": {"languages": ["Python", "Go"]},
+         "experience": [{"company": "Acme", "position": "Intern", "duration": "2024", "bullets": ["A"]}]},
+        {"personal": {"email": "jane@example.com"},
+         "skills": {"languages": ["python", "SQL"], "tools": ["Docker"]},
+         "experience": [{"company": "", "position": "", "bullets": ["B"]},
+                        {"company": "Acme", "position": "", "bullets": ["A", "C"]},
+                        {"company": "Beta", "position": "Engineer", "bullets": []}]},
+    ])
+    assert merged["personal"] == {"name": "Jane Doe", "email": "jane@example.com", "phone": "", "linkedin": ""}
+    assert merged["skills"]["languages"] == ["Python", "Go", "SQL"]
+    assert merged["skills"]["tools"] == ["Docker"]
+    assert [(e["company"], e["bullets"]) for e in merged["experience"]] == [
+        ("Acme", ["A", "B", "C"]), ("Beta", [])]
+    assert merged["projects"] == []
+
+
+def test_long_resume_structure_is_parsed_in_chunks():
+    def fake(prompt, **kwargs):
+        companies = sorted({int(n) for n in re.findall(r"Company (\d+)", prompt)})
+        return json.dumps({"personal": {"name": "Jane Doe"} if "Jane Doe" in prompt else {},
+                           "experience": [{"company": f"Company {i}", "position": "Engineer",
+                                           "bullets": []} for i in companies]})
+
+    with patch("app.services.resume_parser.generate_content", side_effect=fake) as llm, \
+         patch("app.config.PROMPT_TOKENS_STRUCTURE", 300):
+        data = parse_resume_to_structure(RESUME)
+    assert llm.call_count > 1
+    assert data["personal"]["name"] == "Jane Doe"
+    assert [e["company"] for e in data["experience"]] == [f"Company {i}" for i in range(60)]
+
+
+def test_chunking_is_off_by_default_and_without_budgeting():
+    from app import config
+    assert config.ANALYSIS_MAX_CHUNKS <= 2
+    with patch("app.config.CHUNKED_ANALYSIS", False), \
+         patch("app.services.match.generate_content", side_effect=_analysis_for) as llm:
+        compare_resume_and_job(RESUME, JOB, resume_skills=["python"], job_skills=["python"])
+    assert llm.call_count == 1
+    with patch("app.config.PROMPT_BUDGETING", False):
+        assert chunk_text(RESUME, 200, "resume.match") == ([RESUME], 200)
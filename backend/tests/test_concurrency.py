@@ -0,0 +1,79 @@
+# backend/tests/test_concurrency.py
+import time
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.concurrency import run_parallel, run_stages
+
+
+def test_run_parallel_overlaps_independent_tasks():
+    start = time.perf_counter()
+    results, timings = run_parallel({
+        "a": lambda: (time.sleep(0.2), "a")[1],
+        "b": lambda: (time.sleep(0.2), "b")[1],
+    })
+    elapsed = time.perf_counter() - start
+    assert results == {"a": "a", "b": "b"}
+    assert set(timings) == {"a", "b"}
+    assert elapsed < 0.35
+
+
+def test_run_stages_passes_dependency_results():
+    order = []
+    lock = threading.Lock()
+
+    def record(name, value):
+        with lock:
+            order.append(name)
+        return value
+
+    results, _ = run_stages({
+        "x": lambda: record("x", 2),
+        "y": lambda: record("y", 3),
+        "product": (lambda x, y: record("product", x * y), ["x", "y"]),
+    })
+    assert results["product"] == 6
+    assert order[-1] == "product"
+
+
+def test_run_stages_propagates_errors():
+    def boom():
+        raise RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        run_stages({"ok": lambda: 1, "bad": boom, "after": (lambda bad: bad, ["bad"])})
+
+
+def test_run_stages_rejects_unknown_dependency():
+    with pytest.raises(ValueError):
+        run_stages({"a": (lambda missing: missing, ["missing"])})
+
+
+def test_pipeline_overlaps_llm_calls(sample_resume_data):
+    from app.services import resume_generator
+
+    def slow_llm(prompt, **kwargs):
+        time.sleep(0.2)
+        if "resume writer" in prompt:
+            return '{"selected_project_titles": ["LumaScan"]}'
+        if "Analyze resume-job match" in prompt:
+            return '{"exact_matches": [], "missing_core": [], "industry_analysis": ""}'
+        return "python, flask"
+
+    with patch("app.services.gemini.generate_content", side_effect=slow_llm), \
+         patch("app.services.match.generate_content", side_effect=slow_llm), \
+         patch("app.services.resume_generator.generate_content", side_effect=slow_llm):
+        start = time.perf_counter()
+        result = resume_generator.run_pipeline(
+            "Python developer resume", "Looking for a Python engineer",
+            user_data=sample_resume_data,
+        )
+        elapsed = time.perf_counter() - start
+
+    # Four 200 ms LLM calls, run concurrently instead of back to back
+    assert elapsed < 0.6
+    assert result["pdf_bytes"].startswith(b"%PDF")
+    assert result["selected_projects"][0] == "LumaScan"
+    assert {"match", "tailor", "pdf", "ats", "total"} <= set(result["timings_ms"])
@@ -0,0 +1,62 @@
+# backend/tests/test_embeddings.py
+from unittest.mock import patch
+
+import numpy as np
+
+from app.services.embeddings import (
+    EmbeddingService, HashingEmbedder, cosine_top_k, dequantize_int8, quantize_int8,
+)
+from app.services.similarity import similarity_checker
+
+JOBS = [
+    "Python backend engineer with Flask and PostgreSQL",
+    "Frontend developer React TypeScript CSS",
+    "Machine learning engineer PyTorch and scikit-learn",
+]
+
+
+def test_embeddings_are_unit_float32_and_deterministic():
+    service = EmbeddingService(HashingEmbedder(dim=64))
+    vectors = service.embed_many(JOBS)
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (3, 64)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+    fresh = EmbeddingService(HashingEmbedder(dim=64)).embed_many(JOBS)
+    np.testing.assert_allclose(vectors, fresh, rtol=1e-6)
+
+
+def test_top_k_finds_related_posting():
+    service = EmbeddingService(HashingEmbedder(dim=128))
+    matrix = service.embed_many(JOBS)
+    query = service.embed("Flask and Python APIs backed by Postgres")
+    (best, _), *_ = cosine_top_k(query, matrix, k=2)
+    assert best == 0
+
+
+def test_int8_quantization_preserves_ranking():
+    service = EmbeddingService(HashingEmbedder(dim=128))
+    matrix = service.embed_many(JOBS)
+    codes, scales = quantize_int8(matrix)
+    assert codes.dtype == np.int8
+    np.testing.assert_allclose(dequantize_int8(codes, scales), matrix, atol=0.02)
+
+    query = service.embed("React and TypeScript UI work")
+    exact = [i for i, _ in cosine_top_k(query, matrix, k=3)]
+    approx = [i for i, _ in cosine_top_k(query, codes, k=3, scales=scales)]
+    assert exact[0] == approx[0]
+
+
+def test_svd_projection_fits_on_corpus():
+    embedder = HashingEmbedder(dim=8).fit(JOBS * 4)
+    assert embedder.encode(["python flask"]).shape == (1, 8)
+
+
+def test_embedding_method_skips_llm_skill_extraction():
+    with patch("app.services.similarity.extract_skills") as extract:
+        result = similarity_checker.calculate_similarity(
+            "Python Flask developer", JOBS[0], method="embedding",
+        )
+    extract.assert_not_called()
+    assert result["method"] == "embedding"
+    assert 0 < result["skill_similarity"] <= 1
@@ -0,0 +1,122 @@
+# backend/tests/test_job_index.py
+import threading
+
+import numpy as np
+
+from app.services.embeddings import EmbeddingService, HashingEmbedder
+from app.services.job_index import JobIndex
+
+JOBS = [
+    {"id": "py", "title": "Backend", "job_desc": "Python backend engineer with Flask and PostgreSQL"},
+    {"id": "fe", "title": "Frontend", "job_desc": "Frontend developer React TypeScript CSS"},
+    {"id": "ml", "title": "ML", "job_desc": "Machine learning engineer PyTorch scikit-learn"},
+    {"id": "ops", "title": "DevOps", "job_desc": "DevOps engineer Kubernetes Docker Terraform AWS"},
+]
+
+
+def _index(path):
+    return JobIndex(str(path), dim=64, embedding_service=EmbeddingService(HashingEmbedder(dim=64)))
+
+
+def test_exact_search_ranks_related_posting_first(tmp_path):
+    index = _index(tmp_path)
+    assert index.add(JOBS) == 4
+    hits = index.search("Flask REST APIs in Python on Postgres", k=2)
+    assert hits[0]["id"] == "py"
+    assert len(hits) == 2
+
+
+def test_delete_upsert_and_compact(tmp_path):
+    index = _index(tmp_path)
+    index.add(JOBS)
+    assert index.delete(["py", "missing"]) == 1
+    assert "py" not in [h["id"] for h in index.search("Python Flask", k=10)]
+
+    index.add([{"id": "fe", "job_desc": "Python Flask engineer"}])   # replaces in place
+    assert len(index) == 3
+    index.compact()
+    assert index.stats()["rows"] == 3
+    assert index.search("Python Flask", k=1)[0]["id"] == "fe"
+
+
+def test_index_persists_and_grows(tmp_path):
+    index = _index(tmp_path)
+    index.GROWTH_ROWS = 2
+    index.add(JOBS)
+    index.add([{"id": f"extra{i}", "job_desc": f"Generic posting number {i}"} for i in range(2000)])
+
+    reopened = _index(tmp_path)
+    assert len(reopened) == len(JOBS) + 2000
+    assert reopened.search("React TypeScript CSS frontend", k=1)[0]["id"] == "fe"
+
+
+def test_ivf_search_agrees_with_exact_on_easy_queries(tmp_path):
+    index = _index(tmp_path)
+    rng = np.random.default_rng(0)
+    words = ["python", "java", "react", "sql", "aws", "docker", "go", "rust", "css", "ml"]
+    index.add([{"id": f"j{i}", "job_desc": " ".join(rng.choice(words, 6))} for i in range(300)])
+    index.add(JOBS)
+    assert index.build_ivf(n_lists=8) == 8
+
+    exact = index.search(JOBS[2]["job_desc"], k=1, mode="exact")
+    approx = index.search(JOBS[2]["job_desc"], k=1, mode="ivf", nprobe=2)
+    assert exact[0]["id"] == approx[0]["id"] == "ml"
+
+
+def test_search_is_consistent_while_adding_and_compacting(tmp_path):
+    index = _index(tmp_path)
+    index.add(JOBS)
+    query = index._embed(["Python backend engineer with Flask and PostgreSQL"])[0]
+    stop, errors = threading.Event(), []
+
+    def churn():
+        i = 0
+        while not stop.is_set():
+            index.add([{"id": f"tmp{i}", "job_desc": f"Filler posting number {i}"}])
+            index.delete([f"tmp{i}"])
+            if i % 20 == 0:
+                index.compact()
+            i += 1
+
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        for _ in range(300):
+            hits = index.search(query, k=1)
+            if not hits or hits[0]["id"] != "py":
+                errors.append(hits)
+    finally:
+        stop.set()
+        writer.join()
+    assert errors == []
+
+
+def test_search_route_rejects_non_integer_params(api_client):
+    for field, value in (("k", "ten"), ("analyze_top", [1]), ("nprobe", None)):
+        response = api_client.post('/api/jobs/search', json={"resume_text": "Python", field: value})
+        assert response.status_code == 400
+        assert field in response.get_json()["error"]
+
+
+def test_processes_sharing_an_index_allocate_distinct_rows(tmp_path):
+    worker_a, worker_b = _index(tmp_path), _index(tmp_path)   # two connections, two mappings
+    worker_a.add(JOBS[:2])
+    worker_b.add(JOBS[2:])
+    assert len(worker_a) == len(worker_b) == 4
+    assert worker_a.search(JOBS[3]["job_desc"], k=1)[0]["id"] == "ops"
+    assert worker_b.search(JOBS[0]["job_desc"], k=1)[0]["id"] == "py"
+
+    worker_a.delete(["py"])
+    assert "py" not in [h["id"] for h in worker_b.search("Python Flask", k=10)]
+
+    worker_b.GROWTH_ROWS = 2
+    worker_b.add([{"id": f"extra{i}", "job_desc": f"Generic posting number {i}"} for i in range(1500)])
+    assert len(worker_a) == 3 + 1500
+    assert worker_a.search("Generic posting number 1499", k=1)[0]["id"] == "extra1499"
+
+
+def test_build_route_validates_n_lists(api_client):
+    for value in ("eight", -1, 0, 10 ** 9):
+        response = api_client.post('/api/jobs/index/build', json={"n_lists": value})
+        assert response.status_code == 400
+        assert "n_lists" in response.get_json()["error"]
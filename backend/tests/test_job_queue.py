@@ -0,0 +1,165 @@
+# backend/tests/test_job_queue.py
+import socket
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.job_queue import JobQueue, check_callback_url, register_handler
+
+
+def _resolves_to(address):
+    return lambda host, port, **kwargs: [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    register_handler("test.echo", lambda payload: ({"echo": payload["value"]}, b"artifact"))
+    register_handler("test.fail", lambda payload: (_ for _ in ()).throw(RuntimeError("boom")))
+    return JobQueue(str(tmp_path / "queue.sqlite3"), poll_interval=0.01)
+
+
+def test_submit_run_and_fetch(queue):
+    job_id = queue.submit("test.echo", {"value": 42})
+    assert queue.get(job_id)["status"] == "queued"
+    assert queue.get(job_id)["queue_position"] == 0
+
+    assert queue.run_one() is True
+    job = queue.get(job_id, with_artifact=True)
+    assert job["status"] == "done"
+    assert job["result"] == {"echo": 42}
+    assert job["artifact"] == b"artifact"
+    assert queue.run_one() is False
+
+
+def test_failures_are_recorded(queue):
+    job_id = queue.submit("test.fail", {})
+    queue.run_one()
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert "boom" in job["error"]
+    assert queue.metrics()["failed"] == 1
+
+
+def test_unknown_kind_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.submit("test.nope", {})
+
+
+def test_queue_survives_reopen_and_requeues_stale(queue, tmp_path):
+    job_id = queue.submit("test.echo", {"value": 1})
+    assert queue.claim("crashed-worker")[0] == job_id
+
+    reopened = JobQueue(str(tmp_path / "queue.sqlite3"), stale_after=-1)
+    reopened.requeue_stale()
+    assert reopened.get(job_id)["status"] == "queued"
+    reopened.run_one()
+    assert reopened.get(job_id)["status"] == "done"
+
+
+def test_job_that_keeps_killing_its_worker_fails_after_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"), stale_after=-1, max_attempts=2)
+    job_id = queue.submit("test.echo", {"value": 1})
+    for _ in range(2):
+        assert queue.claim("doomed-worker")[0] == job_id
+        queue.requeue_stale()
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and "2 times" in job["error"]
+    assert queue.claim("next-worker") is None
+
+
+def test_worker_survives_a_failing_iteration(queue):
+    real_claim, calls = queue.claim, []
+
+    def flaky_claim(worker):
+        calls.append(worker)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return real_claim(worker)
+
+    with patch.object(queue, "claim", side_effect=flaky_claim):
+        queue.start(1)
+        try:
+            job_id = queue.submit("test.echo", {"value": "x"})
+            deadline = time.time() + 5
+            while queue.get(job_id)["status"] != "done" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+    assert queue.get(job_id)["status"] == "done"
+
+
+def test_background_workers_and_callback(queue):
+    with patch("app.services.job_queue.requests.post") as post, \
+         patch("app.services.job_queue.socket.getaddrinfo", _resolves_to("93.184.216.34")):
+        queue.start(1)
+        try:
+            job_id = queue.submit("test.echo", {"value": "x"}, callback_url="https://client.example/cb")
+            deadline = time.time() + 5
+            while queue.get(job_id)["status"] != "done" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+    assert queue.get(job_id)["status"] == "done"
+    assert post.call_args.kwargs["json"]["status"] == "done"
+    metrics = queue.metrics()
+    assert metrics["done"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_generate_async_route(api_client, sample_resume_data):
+    from app.services.job_queue import get_job_queue
+
+    fake = {"pdf_bytes": b"%PDF-1.4 fake", "ats_result": {}, "match_result": {},
+            "selected_projects": [], "tailored_data": {}, "timings_ms": {}}
+    response = api_client.post('/api/resume/generate', json={
+        "resume_text": "resume", "job_desc": "job", "user_data": sample_resume_data, "async": True,
+    })
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    with patch("app.routes.resume.run_pipeline", return_value=dict(fake)):
+        while get_job_queue().run_one():
+            pass
+
+    status = api_client.get(f'/api/resume/jobs/{job_id}').get_json()
+    assert status["status"] == "done"
+    pdf = api_client.get(status["pdf_url"])
+    assert pdf.data == b"%PDF-1.4 fake"
+    assert api_client.get('/api/resume/jobs/metrics').get_json()["done"] >= 1
+
+
+@pytest.mark.parametrize("url,address", [
+    ("http://client.example/cb", "93.184.216.34"),
+    ("https://metadata.internal/latest", "169.254.169.254"),
+    ("https://localhost:8080/admin", "127.0.0.1"),
+    ("https://db.example/", "10.0.0.5"),
+    ("https://[::1]/cb", "::1"),
+])
+def test_callback_url_must_be_public_https(queue, url, address):
+    with patch("app.services.job_queue.socket.getaddrinfo", _resolves_to(address)):
+        with pytest.raises(ValueError):
+            check_callback_url(url)
+        with pytest.raises(ValueError):
+            queue.submit("test.echo", {"value": 1}, callback_url=url)
+        with patch("app.config.JOB_QUEUE_CALLBACK_HOSTS", {"client.example"}):
+            assert check_callback_url("https://client.example/cb")
+
+
+def test_callback_rechecked_at_send_time(queue):
+    with patch("app.services.job_queue.socket.getaddrinfo", _resolves_to("93.184.216.34")):
+        job_id = queue.submit("test.echo", {"value": 1}, callback_url="https://client.example/cb")
+    with patch("app.services.job_queue.requests.post") as post, \
+         patch("app.services.job_queue.socket.getaddrinfo", _resolves_to("127.0.0.1")):
+        queue.run_one()
+    assert queue.get(job_id)["status"] == "done"
+    post.assert_not_called()
+
+
+def test_generate_async_route_rejects_internal_callback(api_client):
+    response = api_client.post('/api/resume/generate', json={
+        "resume_text": "resume", "job_desc": "job", "async": True,
+        "callback_url": "http://127.0.0.1:5000/api/internal",
+    })
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+# backend/tests/test_jwt.py
+import time
+
+import pytest
+
+from app.utils.jwt import JWTError, sign, verify
+
+SECRET = "test-jwt-secret"
+
+
+def _claims(**overrides):
+    return {"sub": "user-1", "aud": "authenticated", "exp": time.time() + 60, **overrides}
+
+
+def test_valid_token_returns_claims():
+    claims = verify(sign(_claims(), SECRET), SECRET, audience="authenticated")
+    assert claims["sub"] == "user-1"
+
+
+@pytest.mark.parametrize("token", [
+    sign(_claims(), "other-secret"),
+    sign(_claims(exp=time.time() - 3600), SECRET),
+    sign(_claims(aud="anon"), SECRET),
+    sign(_claims(sub=""), SECRET),
+    sign({"sub": "user-1", "aud": "authenticated"}, SECRET),   # no exp
+    "not-a-token",
+    "a.b.c",
+])
+def test_invalid_tokens_are_rejected(token):
+    with pytest.raises(JWTError):
+        verify(token, SECRET, audience="authenticated")
+
+
+def test_tampered_payload_and_alg_none_are_rejected():
+    header, _, signature = sign(_claims(), SECRET).split(".")
+    other_payload = sign(_claims(sub="admin"), SECRET).split(".")[1]
+    with pytest.raises(JWTError):
+        verify(f"{header}.{other_payload}.{signature}", SECRET)
+    unsigned = "eyJhbGciOiJub25lIn0." + other_payload + "."
+    with pytest.raises(JWTError):
+        verify(unsigned, SECRET)
+    with pytest.raises(JWTError):
+        verify(sign(_claims(), SECRET), "")
@@ -0,0 +1,82 @@
+# backend/tests/test_llm_cache.py
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services.llm_cache import LLMCache, cache_key
+
+
+def _fake_completion(text):
+    message = SimpleNamespace(content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_cache_key_depends_on_model_and_prompt():
+    assert cache_key("m1", "hello") == cache_key("m1", "hello")
+    assert cache_key("m1", "hello") != cache_key("m2", "hello")
+    assert cache_key("m1", "hello") != cache_key("m1", "hello!")
+
+
+def test_memory_lru_eviction():
+    cache = LLMCache(max_memory_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"      # a is now most recent
+    cache.set("c", "3")               # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_ttl_expiry():
+    cache = LLMCache(ttl=0.01)
+    cache.set("k", "v")
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMCache(path=path).set("k", "persisted")
+
+    fresh = LLMCache(path=path)
+    assert fresh.get("k") == "persisted"
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get("k") == "persisted"
+    assert fresh.stats()["memory_hits"] == 1
+
+
+def test_disk_trim_keeps_most_recent(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "c.sqlite3"), max_memory_entries=1,
+                     max_disk_entries=5)
+    cache.TRIM_EVERY = 1
+    for i in range(10):
+        cache.set(f"k{i}", str(i))
+    (count,) = cache._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+    assert count == 5
+    assert cache.get("k9") == "9"
+
+
+def test_disabled_cache_is_bypassed():
+    cache = LLMCache(enabled=False)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+def test_generate_content_uses_cache():
+    from app.services import gemini
+
+    cache = LLMCache()
+    with patch.object(gemini, "response_cache", cache), \
+         patch.object(gemini.client.chat.completions, "create",
+                      return_value=_fake_completion("python, flask")) as create:
+        assert gemini.generate_content("prompt") == "python, flask"
+        assert gemini.generate_content("prompt") == "python, flask"
+        assert create.call_count == 1
+
+        gemini.generate_content("prompt", use_cache=False)
+        assert create.call_count == 2
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -0,0 +1,129 @@
+# backend/tests/test_llm_client.py
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import groq
+import httpx
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import (
+    LLMError, LLMRateLimitError, LLMTimeoutError, LLMUnavailableError, chat,
+)
+from app.utils.concurrency import run_parallel
+from app.utils.resilience import CircuitBreaker, TokenBucket, deadline, remaining
+
+REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _status_error(status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    return groq.APIStatusError(f"status {status}", response=response, body=None)
+
+
+@pytest.fixture
+def fake_groq():
+    """Patched create(), a fresh breaker, no client-side rate limit, no real sleeping."""
+    with patch.object(llm_client.get_client().chat.completions, "create") as create, \
+         patch.object(llm_client, "breaker", CircuitBreaker(3, 0.05)), \
+         patch.object(llm_client, "_request_bucket", None), \
+         patch.object(llm_client, "_token_bucket", None), \
+         patch("app.services.llm_client.time.sleep") as sleep:
+        yield create, sleep
+
+
+def test_retries_transient_errors_then_succeeds(fake_groq):
+    create, sleep = fake_groq
+    create.side_effect = [_status_error(503), groq.APITimeoutError(request=REQUEST), _completion("ok")]
+    assert chat("prompt", "model") == "ok"
+    assert create.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_client_errors_are_not_retried(fake_groq):
+    create, _ = fake_groq
+    create.side_effect = _status_error(400)
+    with pytest.raises(LLMError) as info:
+        chat("prompt", "model")
+    assert create.call_count == 1
+    assert info.value.status_code == 502
+
+
+def test_rate_limit_honours_retry_after(fake_groq):
+    create, sleep = fake_groq
+    create.side_effect = [_status_error(429, {"retry-after": "2"})] * 3
+    with pytest.raises(LLMRateLimitError) as info:
+        chat("prompt", "model")
+    assert create.call_count == 3
+    assert all(call.args[0] >= 2 for call in sleep.call_args_list)
+    assert info.value.headers == {"Retry-After": "2"}
+
+
+def test_deadline_caps_attempt_timeout_and_stops_retries(fake_groq):
+    create, _ = fake_groq
+    create.side_effect = [_status_error(503, {"retry-after": "5"}), _completion("late")]
+    with deadline(1.0):
+        with pytest.raises(LLMUnavailableError):
+            chat("prompt", "model", site="structure")
+    assert create.call_count == 1                      # a 5 s wait would overrun the budget
+    assert create.call_args.kwargs["timeout"] <= 1.0   # not the 45 s structure policy
+    with deadline(0.1):
+        with pytest.raises(LLMTimeoutError):
+            chat("prompt", "model")
+    assert create.call_count == 1
+
+
+def test_circuit_opens_then_recovers_after_probe(fake_groq):
+    create, _ = fake_groq
+    create.side_effect = _status_error(500)
+    with patch.dict(llm_client.POLICIES, {"default": llm_client.policy_for("default")._replace(max_retries=0)}):
+        for _ in range(3):
+            with pytest.raises(LLMUnavailableError):
+                chat("prompt", "model")
+        with pytest.raises(LLMUnavailableError, match="circuit open"):
+            chat("prompt", "model")
+        assert create.call_count == 3
+
+        threading.Event().wait(0.06)   # time.sleep is patched
+        create.side_effect = None
+        create.return_value = _completion("back")
+        assert chat("prompt", "model") == "back"
+        assert llm_client.breaker.state == "closed"
+
+
+def test_token_bucket_fails_fast_when_wait_exceeds_budget():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.acquire(2, timeout=0)
+    assert not bucket.acquire(1, timeout=0.1)   # needs ~1 s
+    start = time.perf_counter()
+    assert bucket.acquire(0.05, timeout=0.2)    # short wait is fine
+    assert time.perf_counter() - start < 0.2
+
+
+def test_deadline_reaches_pipeline_threads():
+    with deadline(5.0):
+        results, _ = run_parallel({"a": remaining, "b": remaining})
+    assert 0 < results["a"] <= 5.0 and 0 < results["b"] <= 5.0
+    assert remaining() is None
+
+
+def test_chat_against_local_fake_groq():
+    from benchmarks.fake_groq import ANALYSIS, FakeGroq
+
+    fake = FakeGroq(latency_ms=0).start()
+    try:
+        with patch.object(llm_client.config, "GROQ_BASE_URL", fake.base_url), \
+             patch.object(llm_client, "_client", None), \
+             patch.object(llm_client, "breaker", CircuitBreaker(3, 1.0)):
+            content = chat("Analyze resume-job match for ...", "model", site="analysis")
+    finally:
+        fake.stop()
+    assert json.loads(content) == ANALYSIS
+    assert fake.counts["requests"] == 1
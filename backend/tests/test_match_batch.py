@@ -0,0 +1,96 @@
+# backend/tests/test_match_batch.py
+import json
+from unittest.mock import patch
+
+from app.services.similarity import similarity_checker
+
+
+def _fake_llm(prompt, **kwargs):
+    if "Analyze resume-job match" in prompt:
+        if "Rust" in prompt.split("Job Description:")[1]:
+            return '{"exact_matches": [], "missing_core": ["rust"], "industry_analysis": ""}'
+        return ('{"exact_matches": [{"job_skill": "python", "resume_skill": "python"}],'
+                ' "missing_core": [], "industry_analysis": "good"}')
+    return "python, flask"
+
+
+def test_batch_tfidf_matches_pairwise_ordering():
+    resume = "python flask rest api developer"
+    jobs = ["python flask developer", "rust systems engineer", ""]
+    scores = similarity_checker.batch_tfidf_similarity(resume, jobs)
+    assert len(scores) == 3
+    assert scores[0] > scores[1]
+    assert scores[2] == 0.0
+
+
+def test_match_batch_streams_ranked_ndjson(api_client):
+    jobs = [
+        {"id": "rust", "job_desc": "Rust systems engineer"},
+        {"id": "py", "job_desc": "Python Flask developer"},
+    ]
+    with patch("app.services.gemini.generate_content", side_effect=_fake_llm), \
+         patch("app.services.match.generate_content", side_effect=_fake_llm):
+        response = api_client.post('/api/match/batch', json={
+            "resume_text": "Python and Flask developer", "jobs": jobs,
+        })
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert lines[0] == {"type": "start", "count": 2}
+    assert sorted(l["id"] for l in lines if l["type"] == "result") == ["py", "rust"]
+    summary = lines[-1]
+    assert summary["type"] == "summary"
+    assert [r["id"] for r in summary["ranking"]] == ["py", "rust"]
+
+
+def test_match_batch_rejects_oversized_batches(api_client):
+    with patch("app.config.BATCH_MAX_JOBS", 1):
+        response = api_client.post('/api/match/batch', json={
+            "resume_text": "resume", "jobs": ["a", "b"],
+        })
+    assert response.status_code == 400
+
+
+def test_match_routes_reject_malformed_skill_lists(api_client):
+    for bad in ("python, flask", [1, 2], {"python": 1}, ["python", None]):
+        single = api_client.post('/api/match', json={
+            "resume_text": "resume", "job_desc": "job", "resume_skills": ["python"], "job_skills": bad,
+        })
+        assert single.status_code == 400 and "job_skills" in single.get_json()["error"]
+        batch = api_client.post('/api/match/batch', json={
+            "resume_text": "resume", "jobs": ["a"], "resume_skills": bad,
+        })
+        assert batch.status_code == 400 and "resume_skills" in batch.get_json()["error"]
+
+
+def test_match_routes_reject_unknown_similarity_method(api_client):
+    for method in ("cosine", "", 1):
+        single = api_client.post('/api/match', json={
+            "resume_text": "resume", "job_desc": "job", "similarity_method": method,
+        })
+        assert single.status_code == 400 and "similarity_method" in single.get_json()["error"]
+        batch = api_client.post('/api/match/batch', json={
+            "resume_text": "resume", "jobs": ["a"], "similarity_method": method,
+        })
+        assert batch.status_code == 400
+
+
+def test_llm_rate_limit_reaches_the_client(api_client):
+    from app.services.llm_client import LLMRateLimitError
+
+    limited = LLMRateLimitError("Groq rate limit", retry_after=7)
+    with patch("app.services.match.generate_content", side_effect=limited):
+        response = api_client.post('/api/match', json={
+            "resume_text": "Python developer", "job_desc": "Python engineer",
+            "resume_skills": ["python"], "job_skills": ["python"],
+        })
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+
+        batch = api_client.post('/api/match/batch', json={
+            "resume_text": "Python developer", "jobs": ["Python engineer"], "resume_skills": ["python"],
+        })
+        events = [json.loads(line) for line in batch.data.decode().splitlines()]   # streamed
+    error = next(e for e in events if e["type"] == "error")
+    assert error["status"] == 429 and error["retry_after"] == "7"
@@ -0,0 +1,86 @@
+# backend/tests/test_pdf_parser.py
+from io import BytesIO
+
+import fitz
+import pytest
+
+from app import config
+from app.services.parser import PDFLimitError, iter_pdf_pages, parse_pdf_text
+
+
+def _pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 50), f"Page {i} text\nSkills: Python")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _sequential(data: bytes) -> str:
+    text = ""
+    for page in fitz.open(stream=data, filetype="pdf"):
+        text += page.get_text()
+    return text.strip()
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    monkeypatch.setattr(config, "PDF_SPOOL_BYTES", 1024)
+    monkeypatch.setattr(config, "PDF_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(config, "PDF_PARSE_WORKERS", 2)
+
+
+@pytest.mark.parametrize("pages", [1, 3, 12])
+def test_matches_sequential_extraction(small_limits, pages):
+    data = _pdf(pages)
+    expected = _sequential(data)
+    assert parse_pdf_text(BytesIO(data)) == expected              # spooled, page-parallel
+    assert parse_pdf_text(BytesIO(data), parallel=False) == expected
+    assert parse_pdf_text(data) == expected
+
+
+def test_accepts_paths(tmp_path, small_limits):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(_pdf(6))
+    assert parse_pdf_text(str(path)) == _sequential(path.read_bytes())
+
+
+def test_pages_are_yielded_in_order(small_limits):
+    pages = iter_pdf_pages(BytesIO(_pdf(10)))
+    assert next(pages).startswith("Page 0")
+    assert [p.split()[1] for p in pages] == [str(i) for i in range(1, 10)]
+
+
+def test_limits():
+    data = _pdf(5)
+    with pytest.raises(PDFLimitError, match="pages"):
+        list(iter_pdf_pages(BytesIO(data), max_pages=4))
+    with pytest.raises(PDFLimitError, match="larger"):
+        list(iter_pdf_pages(BytesIO(data), max_bytes=len(data) - 1))
+
+
+def test_page_pool_never_forks(monkeypatch):
+    from app.services import parser
+    assert parser._start_method() in ("forkserver", "spawn")
+    monkeypatch.setattr(config, "PDF_PARSE_START_METHOD", "fork")
+    assert parser._start_method() != "fork"
+    monkeypatch.setattr(config, "PDF_PARSE_START_METHOD", "spawn")
+    assert parser._start_method() == "spawn"
+
+
+def test_small_pdf_with_many_pages_uses_the_page_pool(small_limits, monkeypatch):
+    from app.services import parser
+    monkeypatch.setattr(config, "PDF_SPOOL_BYTES", 10 * 1024 * 1024)   # stays in memory
+    submitted = []
+    real_pool = parser._get_pool()
+
+    class Pool:
+        def submit(self, fn, path, start, stop):
+            submitted.append((start, stop))
+            return real_pool.submit(fn, path, start, stop)
+
+    monkeypatch.setattr(parser, "_get_pool", Pool)
+    data = _pdf(12)
+    assert parse_pdf_text(BytesIO(data)) == _sequential(data)
+    assert submitted and submitted[-1][1] == 12
@@ -0,0 +1,65 @@
+# backend/tests/test_pdf_transport.py
+import base64
+import gzip
+from unittest.mock import patch
+
+from app.utils.blob_cache import BlobCache
+
+
+def test_render_formats_return_same_pdf(api_client, sample_resume_data):
+    legacy = api_client.post('/api/resume/render', json={"data": sample_resume_data})
+    pdf_bytes = base64.b64decode(legacy.get_json()["pdf_b64"])
+    assert pdf_bytes.startswith(b"%PDF")
+
+    raw = api_client.post('/api/resume/render?format=pdf', json={"data": sample_resume_data})
+    assert raw.mimetype == "application/pdf"
+    assert raw.data[:5] == b"%PDF-"
+
+    via_accept = api_client.post('/api/resume/render', json={"data": sample_resume_data},
+                                 headers={"Accept": "application/pdf"})
+    assert via_accept.mimetype == "application/pdf"
+
+
+def test_artifact_url_supports_conditional_get(api_client, sample_resume_data):
+    body = api_client.post('/api/resume/render', json={"data": sample_resume_data, "format": "url"}).get_json()
+    assert "pdf_b64" not in body
+
+    first = api_client.get(body["pdf_url"])
+    assert first.status_code == 200
+    assert first.data.startswith(b"%PDF")
+    assert first.headers["ETag"].strip('"') == body["pdf_etag"]
+
+    again = api_client.get(body["pdf_url"], headers={"If-None-Match": f'"{body["pdf_etag"]}"'})
+    assert again.status_code == 304
+    assert api_client.get('/api/resume/artifacts/unknown').status_code == 404
+
+
+def test_artifact_keys_must_be_sha256_hex(api_client, tmp_path):
+    from app.services import artifacts
+    secret = tmp_path / "outside.pdf"
+    secret.write_bytes(b"%PDF- not an artifact")
+    with patch.object(artifacts, "artifact_store", BlobCache(directory=str(tmp_path / "store"))):
+        for key in ("..", "..%2Foutside.pdf", "A" * 64, "a" * 63, "a" * 64 + ".pdf"):
+            assert api_client.get(f'/api/resume/artifacts/{key}').status_code == 404
+        key = artifacts.store_artifact(b"%PDF-1.4 real")
+        assert api_client.get(f'/api/resume/artifacts/{key}').data == b"%PDF-1.4 real"
+
+
+def test_json_responses_are_gzipped(api_client, sample_resume_data):
+    response = api_client.post('/api/resume/render', json={"data": sample_resume_data},
+                               headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert b"pdf_b64" in gzip.decompress(response.data)
+
+    small = api_client.get('/', headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+
+def test_blob_cache_spills_to_disk(tmp_path):
+    cache = BlobCache(directory=str(tmp_path), max_memory_bytes=10)
+    cache.put("aa11", b"x" * 8)
+    cache.put("bb22", b"y" * 8)          # pushes aa11 out of memory onto disk
+    assert cache.stats()["spills"] == 1
+    assert cache.get("aa11") == b"x" * 8
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("missing") is None
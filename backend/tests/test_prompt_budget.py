@@ -0,0 +1,99 @@
+# backend/tests/test_prompt_budget.py
+from unittest.mock import patch
+
+from app.services import prompt_budget
+from app.services.match import generate_analysis_prompt
+from app.services.prompt_budget import chunk_text, count_tokens, fit, split_sections
+
+JOB = """Senior Backend Engineer
+Acme Corp · 1200 Market Street, San Francisco, CA
+
+About Us
+Acme builds tools that help millions of people find work, with offices in three countries.
+
+What You'll Do
+- Design and build Python services on AWS
+- Mentor junior engineers
+
+Requirements:
+- 5+ years of backend experience with Python and Flask
+- Experience with Docker and Kubernetes
+- 5+ years of backend experience with Python and Flask
+
+Benefits
+- Medical, dental and vision insurance
+- 401(k) matching
+
+Acme is an equal opportunity employer and considers applicants without regard to race or religion.
+"""
+
+RESUME = """ADDITIONAL SKILLS: terraform, kafka
+
+Jane Doe
+jane@example.com | 555-123-4567
+EDUCATION
+B.S. Computer Science, Arizona State University
+TECHNICAL SKILLS
+Python, Go, SQL, Flask, Docker, AWS
+WORK EXPERIENCE
+Acme - Software Engineer Intern
+Reduced p95 latency by 40% with a Redis read-through cache
+PROJECTS
+LumaScan - resume analyzer built with Flask and scikit-learn
+"""
+
+
+def test_count_tokens_is_close_to_four_chars_per_token():
+    text = "Reduced p95 latency by 40% with request batching and a Redis cache."
+    assert abs(count_tokens(text) - len(text) / 4) <= 5
+    assert count_tokens("") == 0
+
+
+def test_split_sections_recognises_headings():
+    names = [s.name for s in split_sections(JOB, "job")]
+    assert names == ["header", "company", "responsibilities", "requirements", "benefits"]
+    names = [s.name for s in split_sections(RESUME, "resume")]
+    assert names == ["skills", "header", "education", "skills", "experience", "projects"]
+
+
+def test_boilerplate_and_repeats_are_dropped():
+    packed = fit(JOB, 500, "job")
+    assert "Docker and Kubernetes" in packed and "Mentor junior engineers" in packed
+    assert "dental" not in packed and "401(k)" not in packed and "equal opportunity" not in packed
+    assert "1200 Market Street" not in packed and "San Francisco, CA" in packed
+    assert packed.count("5+ years of backend experience") == 1
+
+
+def test_tight_budget_keeps_highest_value_sections():
+    packed = fit(JOB, 40, "job")
+    assert count_tokens(packed) <= 40
+    assert "Docker and Kubernetes" in packed
+    assert "offices in three countries" not in packed
+
+    packed = fit(RESUME, 30, "resume.match")
+    assert packed.startswith("ADDITIONAL SKILLS: terraform, kafka")
+    assert "Python, Go, SQL" in packed and "jane@example.com" not in packed
+    assert "jane@example.com" in fit(RESUME, 40, "resume.structure")
+
+
+def test_disabled_budgeting_is_the_old_head_truncation():
+    with patch.object(prompt_budget.config, "PROMPT_BUDGETING", False):
+        assert fit(JOB, 100, "job") == JOB[:400]
+
+
+def test_analysis_prompt_sees_requirements_past_the_old_cutoff():
+    job = "Intro line about the company culture.\n" * 80 + "Requirements\n- Rust and gRPC\n"
+    assert "Rust and gRPC" not in job[:2000]
+    assert "Rust and gRPC" in generate_analysis_prompt(RESUME, job)
+
+
+def test_single_long_line_is_split_not_dropped():
+    line = " ".join(f"tool{i} framework{i}" for i in range(600))   # no punctuation, no line breaks
+    packed = fit(line, 500, "job")
+    assert packed.startswith("tool0 framework0") and 400 < count_tokens(packed) <= 500
+    assert fit(line, 30, "resume.structure").startswith("tool0")
+    assert fit("x" * 5000, 20, "job")
+
+    chunks, budget = chunk_text(line, 500, "job")
+    assert len(chunks) > 1 and "framework599" in chunks[-1]
+    assert all(fit(chunk, budget, "job") == chunk for chunk in chunks)
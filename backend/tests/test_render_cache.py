@@ -0,0 +1,60 @@
+# backend/tests/test_render_cache.py
+import json
+from unittest.mock import patch
+
+from app.services import render_cache
+from app.services.render_cache import render_key, render_pdf_cached
+from app.services.resume_store import ResumeStore
+from app.utils.blob_cache import BlobCache
+
+
+def test_render_key_is_canonical(sample_resume_data):
+    reordered = json.loads(json.dumps(sample_resume_data, sort_keys=True))
+    reordered = dict(reversed(list(reordered.items())))
+    assert render_key(sample_resume_data) == render_key(reordered)
+
+    edited = json.loads(json.dumps(sample_resume_data))
+    edited["projects"][0]["bullets"][0] += "!"
+    assert render_key(edited) != render_key(sample_resume_data)
+
+    original = render_key(sample_resume_data)
+    with patch.object(render_cache, "TEMPLATE_VERSION", "999"):
+        assert render_key(sample_resume_data) != original
+
+
+def test_second_render_is_served_from_cache(sample_resume_data):
+    with patch.object(render_cache, "render_cache", BlobCache()), \
+         patch.object(render_cache, "generate_resume_pdf", wraps=render_cache.generate_resume_pdf) as gen:
+        key1, pdf1 = render_pdf_cached(sample_resume_data)
+        key2, pdf2 = render_pdf_cached(json.loads(json.dumps(sample_resume_data)))
+    assert gen.call_count == 1
+    assert key1 == key2 and pdf1 == pdf2
+
+
+def test_render_route_etag_roundtrip(api_client, sample_resume_data):
+    first = api_client.post('/api/resume/render', json={"data": sample_resume_data})
+    etag = first.headers["ETag"]
+    assert etag.strip('"') == render_key(sample_resume_data) + "-b64"
+    assert "Accept" in first.headers["Vary"]
+
+    again = api_client.post('/api/resume/render', json={"data": sample_resume_data},
+                            headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    # Same data, other transport: a different body, so the b64 ETag must not match
+    raw = api_client.post('/api/resume/render', json={"data": sample_resume_data},
+                          headers={"If-None-Match": etag, "Accept": "application/pdf"})
+    assert raw.status_code == 200 and raw.mimetype == "application/pdf"
+    assert raw.headers["ETag"] != etag
+
+
+def test_download_route_conditional_get(api_client, sample_resume_data, tmp_path):
+    store = ResumeStore(str(tmp_path / "resumes.sqlite3"))
+    store.save("default", sample_resume_data)
+    with patch("app.routes.resume.resume_store", store):
+        first = api_client.get('/api/resume/download')
+        assert first.status_code == 200
+        assert first.data.startswith(b"%PDF")
+        again = api_client.get('/api/resume/download', headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
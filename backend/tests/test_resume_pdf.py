@@ -0,0 +1,57 @@
+# backend/tests/test_resume_pdf.py
+import copy
+
+import pytest
+from reportlab import rl_config
+
+from app.services import resume_pdf
+from app.services.resume_pdf import clear_render_memo, generate_resume_pdf
+
+
+@pytest.fixture
+def invariant():
+    previous = rl_config.invariant
+    rl_config.invariant = 1
+    yield
+    rl_config.invariant = previous
+
+
+def _fresh(data):
+    clear_render_memo()
+    return generate_resume_pdf(data).getvalue()
+
+
+def test_memoized_render_matches_fresh_render(invariant, sample_resume_data):
+    first = _fresh(sample_resume_data)
+    assert generate_resume_pdf(sample_resume_data).getvalue() == first
+
+
+def test_single_bullet_edit_matches_full_rebuild(invariant, sample_resume_data):
+    generate_resume_pdf(sample_resume_data)   # warm every block
+
+    edited = copy.deepcopy(sample_resume_data)
+    edited["projects"][0]["bullets"][0] += " Cut p95 latency by 40%."
+    incremental = generate_resume_pdf(edited).getvalue()
+
+    assert incremental == _fresh(edited)
+    assert incremental != _fresh(sample_resume_data)
+
+
+def test_long_story_splits_across_pages(invariant, sample_resume_data):
+    data = copy.deepcopy(sample_resume_data)
+    data["experience"] = data["experience"] * 12
+    first = _fresh(data)
+    # Second pass reuses split paragraphs' prototypes — output must not drift
+    assert generate_resume_pdf(data).getvalue() == first
+    assert generate_resume_pdf(data).getvalue() == first
+
+
+def test_unchanged_blocks_are_reused(sample_resume_data):
+    clear_render_memo()
+    generate_resume_pdf(sample_resume_data)
+    cached = len(resume_pdf._block_cache)
+
+    edited = copy.deepcopy(sample_resume_data)
+    edited["projects"][0]["bullets"][0] += "!"
+    generate_resume_pdf(edited)
+    assert len(resume_pdf._block_cache) == cached + 1
@@ -0,0 +1,153 @@
+# backend/tests/test_resume_store.py
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services import resume_generator
+from app.services.resume_store import ResumeStore, VersionConflict
+from app.utils import jwt
+
+SECRET = "test-jwt-secret"
+
+
+def _bearer(user_id):
+    token = jwt.sign({"sub": user_id, "aud": "authenticated", "exp": time.time() + 60}, SECRET)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResumeStore(str(tmp_path / "resumes.sqlite3"), history_limit=3)
+
+
+@pytest.fixture
+def api_client(api_app, store):
+    with patch("app.routes.resume.resume_store", store), \
+         patch("app.config.SUPABASE_JWT_SECRET", SECRET):
+        yield api_app.test_client()
+
+
+def test_users_are_isolated_and_versions_increase(store, sample_resume_data):
+    first = store.save("alice", sample_resume_data)
+    assert first.version == 1
+    assert store.get("bob") is None
+
+    edited = dict(sample_resume_data, personal={"name": "Alice"})
+    second = store.save("alice", edited, if_match=first.etag)
+    assert second.version == 2 and second.etag != first.etag
+    assert store.get("alice").data["personal"] == {"name": "Alice"}
+
+
+def test_stale_if_match_is_rejected_without_writing(store, sample_resume_data):
+    first = store.save("alice", sample_resume_data)
+    store.save("alice", dict(sample_resume_data, activities=[]), if_match=first.etag)
+    with pytest.raises(VersionConflict) as conflict:
+        store.save("alice", dict(sample_resume_data, projects=[]), if_match=first.etag)
+    assert conflict.value.current_etag == store.get("alice").etag
+    assert store.get("alice").data["projects"] == sample_resume_data["projects"]
+    with pytest.raises(VersionConflict):
+        store.save("nobody", sample_resume_data, if_match="*")
+
+
+def test_identical_save_keeps_version(store, sample_resume_data):
+    first = store.save("alice", sample_resume_data)
+    again = store.save("alice", json.loads(json.dumps(sample_resume_data)), if_match=first.etag)
+    assert (again.version, again.etag) == (first.version, first.etag)
+
+
+def test_history_is_bounded(store, sample_resume_data):
+    for i in range(5):
+        store.save("alice", dict(sample_resume_data, summary=str(i)))
+    versions = [h["version"] for h in store.history("alice")]
+    assert versions == [5, 4, 3]
+    assert store.get_version("alice", 4).data["summary"] == "3"
+    assert store.get_version("alice", 1) is None
+
+
+def test_reads_are_cached_copies(store, sample_resume_data):
+    store.save("alice", sample_resume_data)
+    store.get("alice")
+    statements = []
+    store._db.set_trace_callback(statements.append)
+    got = store.get("alice")
+    store._db.set_trace_callback(None)
+    assert not any("FROM resumes" in sql for sql in statements)
+    got.data["projects"].clear()
+    assert store.get("alice").data["projects"]
+
+
+def test_write_from_another_process_invalidates_cache(tmp_path, sample_resume_data):
+    path = str(tmp_path / "resumes.sqlite3")
+    worker_a, worker_b = ResumeStore(path), ResumeStore(path)
+    worker_a.save("alice", sample_resume_data)
+    assert worker_a.get("alice").version == 1
+    worker_b.save("alice", dict(sample_resume_data, activities=[]))
+    assert worker_a.get("alice").version == 2
+
+
+def test_legacy_file_seeds_default_user(tmp_path, sample_resume_data):
+    legacy = tmp_path / "resume_data.json"
+    legacy.write_text(json.dumps(sample_resume_data))
+    store = ResumeStore(str(tmp_path / "resumes.sqlite3"), legacy_file=str(legacy))
+    assert store.get("someone") is None
+    stored = store.get("default")
+    assert stored.version == 1 and stored.data == sample_resume_data
+    with patch("app.services.resume_generator.resume_store", store):
+        assert resume_generator._load_data()["personal"] == sample_resume_data["personal"]
+
+
+def test_data_routes_etag_and_if_match(api_client, sample_resume_data):
+    alice = _bearer("alice")
+    assert api_client.get('/api/resume/data', headers=alice).status_code == 404
+
+    saved = api_client.put('/api/resume/data', json=sample_resume_data, headers=alice)
+    assert saved.status_code == 200
+    etag = saved.headers["ETag"]
+
+    fetched = api_client.get('/api/resume/data', headers=alice)
+    assert fetched.get_json() == sample_resume_data and fetched.headers["ETag"] == etag
+    assert api_client.get('/api/resume/data', headers={**alice, "If-None-Match": etag}).status_code == 304
+    assert api_client.get('/api/resume/data').status_code == 404   # other users see nothing
+
+    edit = dict(sample_resume_data, activities=[])
+    ok = api_client.put('/api/resume/data', json=edit, headers={**alice, "If-Match": etag})
+    assert ok.status_code == 200 and ok.get_json()["version"] == 2
+    stale = api_client.put('/api/resume/data', json=sample_resume_data, headers={**alice, "If-Match": etag})
+    assert stale.status_code == 412
+    assert stale.get_json()["current_etag"] == ok.get_json()["etag"]
+
+    history = api_client.get('/api/resume/data/history', headers=alice).get_json()["versions"]
+    assert [h["version"] for h in history] == [2, 1]
+    old = api_client.get('/api/resume/data/history/1', headers=alice)
+    assert old.get_json() == sample_resume_data
+
+
+def test_user_comes_from_a_verified_token(api_client, sample_resume_data):
+    api_client.put('/api/resume/data', json=sample_resume_data, headers=_bearer("alice"))
+    assert api_client.get('/api/resume/data', headers={"X-User-Id": "alice"}).status_code == 404
+
+    forged = jwt.sign({"sub": "alice", "aud": "authenticated", "exp": time.time() + 60}, "guess")
+    response = api_client.get('/api/resume/data', headers={"Authorization": f"Bearer {forged}"})
+    assert response.status_code == 401 and "WWW-Authenticate" in response.headers
+    with patch("app.config.SUPABASE_JWT_SECRET", ""):
+        assert api_client.get('/api/resume/data', headers=_bearer("alice")).status_code == 401
+
+
+def test_gzipped_responses_get_their_own_etag(api_client, sample_resume_data):
+    alice = _bearer("alice")
+    big = dict(sample_resume_data, summary="Backend engineer. " * 100)   # past the gzip threshold
+    etag = api_client.put('/api/resume/data', json=big, headers=alice).headers["ETag"]
+
+    gzipped = api_client.get('/api/resume/data', headers={**alice, "Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] == etag[:-1] + '-gzip"'
+    assert "Accept-Encoding" in gzipped.headers["Vary"]
+
+    gz_etag = gzipped.headers["ETag"]
+    unchanged = api_client.get('/api/resume/data',
+                               headers={**alice, "Accept-Encoding": "gzip", "If-None-Match": gz_etag})
+    assert unchanged.status_code == 304 and unchanged.headers["ETag"] == gz_etag
+    saved = api_client.put('/api/resume/data', json=sample_resume_data, headers={**alice, "If-Match": gz_etag})
+    assert saved.status_code == 200
@@ -0,0 +1,45 @@
+# backend/tests/test_sanitize.py
+import random
+
+import pytest
+
+from app.utils.sanitize import REPLACEMENTS, sanitize
+
+
+def _sequential(text: str) -> str:
+    """The original resume_pdf._safe: one str.replace per entry, then latin-1."""
+    for old, new in REPLACEMENTS.items():
+        text = text.replace(old, new)
+    return text.encode("latin-1", errors="replace").decode("latin-1")
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Python, Flask & React",
+    "Jan 2024 – Present",
+    "Jan 2024 —— Present",
+    "a--b---c----d",
+    "–-—",
+    "Saved \\$2M, top 5\\%, \\#1 rank",
+    "\\\\$ \\\\\\# \\",
+    "<b>not markup</b> & &amp;",
+    "“quoted” ‘single’ • bullet\u00a0nbsp",
+    "naïve café — 東京 🚀",
+])
+def test_matches_sequential_replace(text):
+    assert sanitize(text) == _sequential(text)
+
+
+def test_matches_sequential_replace_fuzzed():
+    alphabet = list("-\\$#%&<>ab ;") + [k for k in REPLACEMENTS if len(k) == 1] + ["é", "東", "🚀"]
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert sanitize(text) == _sequential(text), repr(text)
+
+
+def test_repeated_strings_are_memoized():
+    sanitize.cache_clear()
+    sanitize("Summer 2024 – Present")
+    sanitize("Summer 2024 – Present")
+    assert sanitize.cache_info().hits == 1
@@ -0,0 +1,52 @@
+# backend/tests/test_skill_store.py
+from unittest.mock import patch
+
+from app.services.skill_store import SkillStore, fingerprint
+from app.services.similarity import similarity_checker
+
+
+def test_fingerprint_ignores_whitespace_layout():
+    assert fingerprint("Python  developer\n\nFlask") == fingerprint("Python developer Flask")
+    assert fingerprint("Python developer") != fingerprint("Java developer")
+
+
+def test_store_roundtrip_persists(tmp_path):
+    path = str(tmp_path / "skills.sqlite3")
+    SkillStore(path).put("abc", ["python", "flask"])
+    assert SkillStore(path).get("abc") == ["python", "flask"]
+    assert SkillStore(path).get("missing") is None
+
+
+def test_precomputed_skills_skip_extraction():
+    with patch("app.services.similarity.extract_skills", return_value=["python"]) as extract:
+        result = similarity_checker.calculate_similarity(
+            "I write Python and Flask", "Python engineer wanted",
+            resume_skills=["python", "flask"], job_skills=["python"],
+        )
+    extract.assert_not_called()
+    assert result["resume_skills"] == ["flask", "python"]
+    assert result["skill_similarity"] > 0
+
+
+def test_resume_extraction_reused_across_jobs():
+    store = SkillStore()
+    with patch("app.services.similarity.skill_store", store), \
+         patch("app.services.similarity.extract_skills", return_value=["python"]) as extract:
+        for job in ("Python engineer", "Backend Python role", "Data engineer"):
+            similarity_checker.calculate_similarity("Resume: Python, Flask", job)
+    # one resume extraction + one per distinct job
+    assert extract.call_count == 4
+
+
+def test_extractor_mode_is_part_of_the_store_key():
+    store = SkillStore()
+    text = "Resume: Python, Flask, Docker"
+    with patch("app.services.similarity.skill_store", store), \
+         patch("app.services.similarity.extract_skills", return_value=["Python 3"]) as extract:
+        with patch("app.config.SKILL_EXTRACTOR", "llm"):
+            assert similarity_checker.skills_for(text) == ["Python 3"]
+        with patch("app.config.SKILL_EXTRACTOR", "local"):
+            assert "python" in similarity_checker.skills_for(text)   # not the cached LLM list
+            assert similarity_checker.skills_for(text) == store.get(similarity_checker.store_key(text))
+    assert extract.call_count == 1
+    assert similarity_checker.store_key(text, "llm") == fingerprint(text)
@@ -0,0 +1,68 @@
+# backend/tests/test_skill_taxonomy.py
+import json
+from unittest.mock import patch
+
+from app import config
+
+from app.services.match import SKILL_SYNONYMS
+from app.services.similarity import similarity_checker
+from app.services.skill_taxonomy import get_skill_matcher, merge_skills, recall_looks_low
+
+RESUME = (
+    "Built REST APIs in Python (Flask, Django) and Go. React + TypeScript frontends with Next.js. "
+    "Deployed on AWS (EC2, S3) with Docker, Kubernetes and GitHub Actions; PostgreSQL and Redis. "
+    "Also C++, C# and Node.js. Spring Boot services."
+)
+
+
+def test_scan_finds_aliases_and_multiword_skills():
+    skills, unknown = get_skill_matcher().scan(RESUME)
+    for expected in ("python", "flask", "go", "amazon web services", "ec2", "kubernetes",
+                     "github actions", "c++", "c#", "node.js", "spring boot", "rest api"):
+        assert expected in skills
+    assert "spring" not in skills   # longest match wins
+    assert unknown == []
+
+
+def test_ambiguous_words_need_exact_spelling():
+    skills, _ = get_skill_matcher().scan("I will go to the office and rest.")
+    assert skills == []
+    assert get_skill_matcher().canonical("Go") == "go"
+    assert get_skill_matcher().canonical("go") is None
+
+
+def test_terms_do_not_span_punctuation():
+    assert get_skill_matcher().scan("AWS (EC2, S3)")[0] == ["amazon web services", "ec2", "s3"]
+
+
+def test_synonym_terms_are_in_taxonomy():
+    with open(config.SKILL_TAXONOMY_PATH) as f:
+        ambiguous = set(json.load(f)["ambiguous"])
+    matcher = get_skill_matcher()
+    for term in {*SKILL_SYNONYMS, *SKILL_SYNONYMS.values()} - ambiguous:
+        assert matcher.canonical(term) is not None, term
+
+
+def test_recall_heuristic_and_merge():
+    assert recall_looks_low(["python"], [])
+    assert recall_looks_low(["a", "b", "c", "d", "e"], ["foojs", "barjs"])
+    assert not recall_looks_low(["a", "b", "c", "d", "e"], [])
+    merged = merge_skills(["python"], ["Python", "K8s", "Obscure Tool"], get_skill_matcher())
+    assert merged == ["python", "kubernetes", "obscure tool"]
+
+
+def test_tiered_skips_llm_when_local_recall_is_good():
+    with patch("app.services.similarity.extract_skills", return_value=["x"]) as extract:
+        skills = similarity_checker.extract(RESUME, "tiered")
+    extract.assert_not_called()
+    assert "python" in skills
+
+
+def test_tiered_adds_llm_skills_when_recall_is_low():
+    with patch("app.services.similarity.extract_skills", return_value=["Kafka Streams"]) as extract:
+        skills = similarity_checker.extract("Python developer using FooBarJS", "tiered")
+    extract.assert_called_once()
+    assert skills == ["python", "kafka streams"]
+    with patch("app.services.similarity.extract_skills") as extract:
+        assert similarity_checker.extract("Python developer", "local") == ["python"]
+    extract.assert_not_called()
@@ -0,0 +1,73 @@
+# backend/tests/test_tfidf_model.py
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services.tfidf_model import TfidfModel, fit_vectorizer, iter_corpus, main
+from app.services.similarity import similarity_checker
+
+CORPUS = [
+    "Python developer with Flask and REST API experience",
+    "Senior Java engineer building Spring microservices",
+    "Frontend engineer React TypeScript and CSS",
+    "Data engineer Python Spark and SQL pipelines",
+    "DevOps engineer AWS Docker Kubernetes",
+]
+
+
+def test_fitted_model_scores_are_stable_and_cached():
+    model = TfidfModel(fit_vectorizer(CORPUS))
+    with patch.object(model.vectorizer, "transform", wraps=model.vectorizer.transform) as transform:
+        first = model.similarity("python flask api", "python developer flask")
+        second = model.similarity("python flask api", "python developer flask")
+    assert first == second
+    assert first > 0
+    assert transform.call_count == 1   # second call served from the vector cache
+
+
+def test_out_of_vocabulary_returns_none():
+    model = TfidfModel(fit_vectorizer(CORPUS))
+    assert model.similarity("zzzz qqqq", "python developer") is None
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "tfidf.joblib")
+    TfidfModel(fit_vectorizer(CORPUS)).save(path)
+    loaded = TfidfModel.load(path)
+    assert loaded.fitted
+    assert not TfidfModel.load(str(tmp_path / "missing.joblib")).fitted
+
+
+def test_cli_fits_from_jsonl(tmp_path):
+    corpus = tmp_path / "jobs.jsonl"
+    corpus.write_text("\n".join(json.dumps({"job_desc": t}) for t in CORPUS))
+    out = tmp_path / "model.joblib"
+    main(["fit", str(corpus), "--out", str(out), "--min-df", "1"])
+    assert TfidfModel.load(str(out)).fitted
+    assert len(list(iter_corpus([str(corpus)]))) == len(CORPUS)
+
+
+def test_similarity_checker_uses_fitted_model():
+    model = TfidfModel(fit_vectorizer(CORPUS))
+    with patch("app.services.similarity.tfidf_model", model):
+        pair = similarity_checker._tfidf_similarity("python flask", "python developer flask")
+        batch = similarity_checker.batch_tfidf_similarity("python flask", ["python developer flask"])
+    assert abs(pair - batch[0]) < 1e-6
+
+
+def test_batch_falls_back_like_pairwise_for_out_of_vocabulary_texts():
+    model = TfidfModel(fit_vectorizer(CORPUS))
+    resume = "python flask developer"
+    jobs = ["python developer flask", "golang gRPC protobuf", "Python gRPC golang services", ""]
+    with patch("app.services.similarity.tfidf_model", model):
+        batch = similarity_checker.batch_tfidf_similarity(resume, jobs)
+        pairwise = [similarity_checker._tfidf_similarity(resume, job) for job in jobs]
+        assert batch == pytest.approx(pairwise, abs=1e-6)
+
+        # Query with no in-vocabulary terms: every row falls back
+        query = "golang gRPC protobuf"
+        batch = similarity_checker.batch_tfidf_similarity(query, jobs)
+        pairwise = [similarity_checker._tfidf_similarity(query, job) for job in jobs]
+    assert batch == pytest.approx(pairwise, abs=1e-6)
+    assert batch[1] > 0.9
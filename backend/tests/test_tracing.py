@@ -0,0 +1,90 @@
+# backend/tests/test_tracing.py
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask import Flask, jsonify
+
+from app.services import llm_client
+from app.utils.concurrency import run_parallel
+from app.utils.resilience import CircuitBreaker
+from app.utils.tracing import (
+    LLM_CALLS, LLM_TOKENS, SPAN_SECONDS, Histogram, current_spans, init_tracing, render_metrics, span,
+)
+
+
+def _traced_app(server_timing=True):
+    app = Flask(__name__)
+    init_tracing(app, server_timing=server_timing)
+
+    @span("test.child")
+    def child():
+        time.sleep(0.01)
+        return 1
+
+    @app.route("/work")
+    def work():
+        with span("test.parent"):
+            run_parallel({"a": child, "b": child})
+        return jsonify(current_spans())
+
+    return app
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("demo_seconds", "demo", ["op"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2.0):
+        hist.observe(value, "x")
+    text = "\n".join(hist.render())
+    assert 'demo_seconds_bucket{op="x",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{op="x",le="1"} 2' in text
+    assert 'demo_seconds_bucket{op="x",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{op="x"} 3' in text
+
+
+def test_spans_from_worker_threads_reach_the_request():
+    before = SPAN_SECONDS.count("test.child")
+    response = _traced_app().test_client().get("/work")
+    spans = response.get_json()
+    assert spans["test.child"][1] == 2          # both stages, recorded from pool threads
+    assert spans["test.parent"][0] >= spans["test.child"][0] / 2
+    assert SPAN_SECONDS.count("test.child") == before + 2
+
+    header = response.headers["Server-Timing"]
+    assert 'test.child;dur=' in header and 'desc="x2"' in header
+    assert "total;dur=" in header
+
+
+def test_server_timing_is_optional_and_metrics_are_exposed():
+    client = _traced_app(server_timing=False).test_client()
+    assert "Server-Timing" not in client.get("/work").headers
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.mimetype == "text/plain"
+    assert 'lumascan_http_request_seconds_count{method="GET",endpoint="/work",status="200"}' in metrics.get_data(as_text=True)
+
+
+def test_async_spans():
+    @span("test.async")
+    async def work():
+        await asyncio.sleep(0)
+        return "done"
+
+    before = SPAN_SECONDS.count("test.async")
+    assert asyncio.run(work()) == "done"
+    assert SPAN_SECONDS.count("test.async") == before + 1
+
+
+def test_llm_calls_record_latency_outcome_and_tokens():
+    usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+    completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))], usage=usage)
+    calls, prompt_tokens = LLM_CALLS.value("tracing-test", "ok"), LLM_TOKENS.value("tracing-test", "prompt")
+    with patch.object(llm_client.get_client().chat.completions, "create", return_value=completion), \
+         patch.object(llm_client, "breaker", CircuitBreaker(3, 1.0)), \
+         patch.object(llm_client, "_request_bucket", None), \
+         patch.object(llm_client, "_token_bucket", None):
+        assert llm_client.chat("prompt", "model", site="tracing-test") == "ok"
+    assert LLM_CALLS.value("tracing-test", "ok") == calls + 1
+    assert LLM_TOKENS.value("tracing-test", "prompt") == prompt_tokens + 120
+    assert 'lumascan_llm_tokens_total{site="tracing-test",kind="completion"}' in render_metrics()
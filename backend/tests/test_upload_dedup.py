@@ -0,0 +1,126 @@
+# backend/tests/test_upload_dedup.py
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from app.services import upload_store as store_module
+from app.services.upload_store import UploadStore
+
+
+@pytest.fixture
+def api_client(api_app, tmp_path):
+    with patch("app.routes.upload.upload_store", UploadStore(str(tmp_path / "uploads.sqlite3"))):
+        yield api_app.test_client()
+
+
+def _pdf(text: str, path) -> str:
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 50), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _upload(client, path):
+    with open(path, "rb") as f:
+        return client.post('/api/upload', data={'resume': (f, 'resume.pdf')},
+                           content_type='multipart/form-data')
+
+
+@pytest.fixture
+def llm():
+    with patch("app.routes.upload.extract_skills", return_value=["python", "flask"]) as skills, \
+         patch("app.routes.upload.parse_resume_to_structure",
+               return_value={"personal": {"name": "John Doe"}}) as structure:
+        yield skills, structure
+
+
+def test_reupload_skips_parse_and_llm(api_client, llm, tmp_path):
+    path = _pdf("John Doe\nSkills: Python, Flask", tmp_path / "a.pdf")
+    first = _upload(api_client, path).get_json()
+    assert first["cached"] is False
+
+    with patch("app.routes.upload.parse_pdf_text") as parse:
+        second = _upload(api_client, path).get_json()
+    parse.assert_not_called()
+    assert second["cached"] is True
+    assert {k: second[k] for k in ("resume_id", "resume_text", "skills", "structured_data")} == \
+           {k: first[k] for k in ("resume_id", "resume_text", "skills", "structured_data")}
+    assert llm[0].call_count == 1 and llm[1].call_count == 1
+
+
+def test_same_text_in_a_different_pdf_is_reused(api_client, llm, tmp_path):
+    a = _pdf("John Doe\nSkills: Python, Flask", tmp_path / "a.pdf")
+    b = tmp_path / "b.pdf"
+    doc = fitz.open(a)
+    doc.set_metadata({"title": "re-exported"})
+    doc.save(str(b))
+    doc.close()
+
+    _upload(api_client, a)
+    assert _upload(api_client, str(b)).get_json()["cached"] is True
+    assert llm[0].call_count == 1
+
+
+def test_prompt_or_model_change_invalidates(api_client, llm, tmp_path):
+    path = _pdf("John Doe\nSkills: Python, Flask", tmp_path / "a.pdf")
+    _upload(api_client, path)
+    with patch.object(store_module, "_version", "changed-prompts"):
+        assert _upload(api_client, path).get_json()["cached"] is False
+    assert llm[0].call_count == 2
+
+
+def test_extraction_version_tracks_model():
+    original = store_module.extraction_version()
+    with patch.object(store_module, "_version", None), \
+         patch.object(store_module.gemini, "MODEL", "another-model"):
+        assert store_module.extraction_version() != original
+    for name, value in (("CHUNKED_ANALYSIS", not store_module.config.CHUNKED_ANALYSIS),
+                        ("STRUCTURE_MAX_CHUNKS", 99), ("PROMPT_TOKENS_STRUCTURE", 1)):
+        with patch.object(store_module, "_version", None), \
+             patch.object(store_module.config, name, value):
+            assert store_module.extraction_version() != original
+
+
+def test_parallel_mode_runs_both_calls_concurrently(api_client, tmp_path):
+    import threading
+    barrier = threading.Barrier(2, timeout=5)   # deadlocks unless both run at once
+
+    def skills(text):
+        barrier.wait()
+        return ["python"]
+
+    def structure(text):
+        barrier.wait()
+        return {"skills": {"languages": ["Python"]}}
+
+    path = _pdf("John Doe\nSkills: Python", tmp_path / "a.pdf")
+    with patch("app.routes.upload.extract_skills", side_effect=skills), \
+         patch("app.routes.upload.parse_resume_to_structure", side_effect=structure):
+        body = _upload(api_client, path).get_json()
+    assert body["mode"] == "parallel"
+    assert body["skills"] == ["python"]
+    assert {"parse_pdf", "skills", "structure", "total"} <= set(body["timings_ms"])
+
+
+def test_combined_mode_derives_skills_from_structure(api_client, tmp_path):
+    structured = {"skills": {"languages": ["Python", "SQL"], "frameworks": ["Flask"],
+                             "tools": ["python"], "databases": []}}
+    path = _pdf("John Doe\nSkills: Python", tmp_path / "a.pdf")
+    with patch("app.routes.upload.extract_skills") as skills, \
+         patch("app.routes.upload.parse_resume_to_structure", return_value=structured):
+        with open(path, "rb") as f:
+            body = api_client.post('/api/upload?mode=combined', data={'resume': (f, 'r.pdf')},
+                                   content_type='multipart/form-data').get_json()
+    skills.assert_not_called()
+    assert body["mode"] == "combined"
+    assert body["skills"] == ["python", "sql", "flask"]
+
+
+def test_unknown_mode_is_rejected(api_client, tmp_path):
+    path = _pdf("John Doe", tmp_path / "a.pdf")
+    with open(path, "rb") as f:
+        response = api_client.post('/api/upload?mode=fast', data={'resume': (f, 'r.pdf')},
+                                   content_type='multipart/form-data')
+    assert response.status_code == 400